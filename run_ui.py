@@ -4,25 +4,27 @@ FIA Formula 1 Regulations Chatbot Launcher
 Simple launcher script for the Streamlit UI
 """
 
+import importlib.util
+import os
 import subprocess
 import sys
-import os
 from pathlib import Path
 
 def main():
     """Launch the Streamlit UI."""
     
-    print("🏎️  FIA Formula 1 Regulations Chatbot")
-    print("=" * 50)
-    print("🚀 Starting Streamlit UI...")
-    print("📱 The interface will open in your browser")
-    print("=" * 50)
+    sys.stdout.write("\n".join([
+        "🏎️  FIA Formula 1 Regulations Chatbot",
+        "=" * 50,
+        "🚀 Starting Streamlit UI...",
+        "📱 The interface will open in your browser",
+        "=" * 50,
+        "",
+    ]))
+    sys.stdout.flush()
     
-    # Check if streamlit is installed
-    try:
-        import streamlit  # type: ignore
-        print("✅ Streamlit is installed")
-    except ImportError:
+    # Check if streamlit is installed (without paying for the import)
+    if importlib.util.find_spec("streamlit") is None:
         print("❌ Streamlit not found. Installing...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit"])
@@ -39,19 +41,40 @@ def main():
         print(f"❌ Streamlit app not found at {app_path}")
         return
     
-    print(f"📱 Launching UI from: {app_path}")
-    print("🌐 Opening browser at: http://localhost:8501")
-    print("🛑 Press Ctrl+C to stop the server")
-    print("=" * 50)
+    sys.stdout.write("\n".join([
+        "✅ Streamlit is installed",
+        f"📱 Launching UI from: {app_path}",
+        "🌐 Opening browser at: http://localhost:8501",
+        "🛑 Press Ctrl+C to stop the server",
+        "=" * 50,
+        "",
+    ]))
+    sys.stdout.flush()
     
     try:
-        # Launch streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(app_path),
-            "--server.port", "8501",
-            "--server.address", "localhost"
-        ])
+        # Launch streamlit in this interpreter instead of spawning a second one
+        try:
+            from streamlit.web import bootstrap
+        except ImportError:
+            bootstrap = None
+
+        if bootstrap is not None:
+            flag_options = {
+                "server_port": 8501,
+                "server_address": "localhost",
+                "global_developmentMode": False,
+            }
+            bootstrap.load_config_options(flag_options=flag_options)
+            bootstrap.run(str(app_path), False, [], flag_options)
+        else:
+            # Older Streamlit without the programmatic entry point: replace
+            # this process rather than keeping an idle parent around
+            os.execvp(sys.executable, [
+                sys.executable, "-m", "streamlit", "run", 
+                str(app_path),
+                "--server.port", "8501",
+                "--server.address", "localhost"
+            ])
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
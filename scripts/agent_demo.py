@@ -6,6 +6,8 @@ This script demonstrates the agentic RAG system with multi-tool reasoning,
 LangGraph state management, and LangSmith tracing.
 """
 
+import asyncio
+import json
 import logging
 import os
 import sys
@@ -16,9 +18,6 @@ from dotenv import load_dotenv
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from rag.agent import FIAAgent
-from rag.rag_pipeline import FIARAGPipeline
-
 # Load environment variables
 load_dotenv()
 
@@ -29,7 +28,38 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+def _warm_up(agent, rag_pipeline):
+    """Prime the embedding, Pinecone and LLM clients before timed queries."""
+    if os.getenv("FIA_WARMUP") != "1":
+        return
+
+    print("🔥 Warming up embeddings, Pinecone and LLM connections...")
+    try:
+        # Embeds the probe and opens the Pinecone HTTPS pool in one call
+        rag_pipeline.retriever.vectorstore.similarity_search_with_score("warmup", k=1)
+        agent.llm.invoke("ping")
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {str(e)}")
+
+
+async def run_all(ask, questions, max_concurrency: int = 6):
+    """Run demo questions concurrently and return responses in input order."""
+    semaphore = asyncio.Semaphore(max_concurrency)  # respect OpenAI rate limits
+
+    async def run_one(question):
+        async with semaphore:
+            return await asyncio.to_thread(ask, question)
+
+    return await asyncio.gather(*(run_one(question) for question in questions))
+
+
+def _write_token(token: str):
+    """Echo a streamed answer token immediately."""
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
+def main(stream: bool = False, json_out=None):
     """Main function to run the agent demo."""
     # Validate configuration
     openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -45,12 +75,19 @@ def main():
         print("❌ PINECONE_API_KEY environment variable not set")
         return
 
+    # Deferred so a missing key exits without importing langchain/pinecone
+    from query_cache import ScriptQueryCache
+
+    from rag.agent import FIAAgent
+    from rag.rag_pipeline import FIARAGPipeline
+
     print("🏎️  FIA Formula 1 Regulations Agent System")
     print("=" * 60)
     print("🤖 Multi-Tool Reasoning with LangGraph")
     print("📊 LangSmith Tracing Enabled")
     print("=" * 60)
 
+    cache = None
     try:
         # Initialize RAG pipeline
         print("🔧 Initializing RAG pipeline...")
@@ -71,6 +108,15 @@ def main():
         )
 
         print("✅ Agent system initialized successfully!")
+        _warm_up(agent, rag_pipeline)
+
+        # Serve repeated demo questions from the on-disk semantic cache
+        # (set FIA_DEMO_CACHE=0 to always hit the agent)
+        if os.getenv("FIA_DEMO_CACHE", "1") != "0":
+            cache = ScriptQueryCache(agent, rag_pipeline.retriever.embeddings)
+            ask = cache.query
+        else:
+            ask = agent.query
 
         # Show available tools
         tools = agent.get_available_tools()
@@ -97,19 +143,49 @@ def main():
         print(f"\n🎯 Running {len(demo_queries)} agent demo queries...")
         print("=" * 60)
 
-        for i, demo in enumerate(demo_queries, 1):
+        if stream and json_out is None:
+            # Answers are printed token by token, so run one question at a time
+            responses = [None] * len(demo_queries)
+        else:
+            # Queries are independent and I/O-bound, so overlap them
+            print(f"\n🤖 Agent reasoning...")
+            responses = asyncio.run(
+                run_all(ask, [demo["question"] for demo in demo_queries])
+            )
+
+        for i, (demo, response) in enumerate(zip(demo_queries, responses), 1):
+            if json_out is not None:
+                # One machine-readable record per question
+                record = {
+                    "i": i,
+                    "question": demo["question"],
+                    "answer": response["answer"],
+                    "tools_used": response.get("tools_used"),
+                    "sources": response.get("sources"),
+                    "reasoning_steps": response.get("reasoning_steps"),
+                    "session_id": response.get("session_id"),
+                }
+                json_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                json_out.flush()
+                continue
+
             print(f"\n📋 Agent Demo #{i}: {demo['description']}")
             print("-" * 50)
             print(f"Question: {demo['question']}")
 
-            # Query the agent
-            print(f"\n🤖 Agent reasoning...")
-            response = agent.query(demo["question"])
-
             # Display results
-            print(f"\n💬 Final Answer:")
-            print("-" * 30)
-            print(response["answer"])
+            if stream:
+                print(f"\n💬 Final Answer:")
+                print("-" * 30)
+                response = agent.stream_query(demo["question"], on_token=_write_token)
+                print()
+            else:
+                if response.get("metadata", {}).get("cache_hit"):
+                    print("♻️  Served from semantic cache")
+
+                print(f"\n💬 Final Answer:")
+                print("-" * 30)
+                print(response["answer"])
 
             # Show reasoning steps
             if response.get("reasoning_steps"):
@@ -144,7 +220,34 @@ def main():
         import traceback
 
         traceback.print_exc()
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the FIA agent demo")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print answers token by token (runs questions sequentially)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Write one JSON record per question to stdout",
+    )
+
+    args = parser.parse_args()
+
+    if args.json:
+        import contextlib
+
+        # Keep stdout for JSON records; banners and progress go to stderr
+        json_out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            main(json_out=json_out)
+    else:
+        main(stream=args.stream)
@@ -6,13 +6,15 @@ This script provides comprehensive evaluation of the FIA regulations agent
 using RAGAS metrics across all tools and intent categories.
 """
 
+import functools
+import hashlib
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
 from dotenv import load_dotenv
 
 # Add src to path
@@ -21,11 +23,6 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 # Load environment variables
 load_dotenv()
 
-from evaluation.dataset import FIAEvaluationDataset
-from evaluation.evaluator import FIAAgentEvaluator
-from rag.agent import FIAAgent
-from rag.rag_pipeline import FIARAGPipeline
-
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -33,7 +30,245 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+def _warm_up(agent, rag_pipeline):
+    """Prime the embedding, Pinecone and LLM clients before timed queries."""
+    if os.getenv("FIA_WARMUP") != "1":
+        return
+
+    print("🔥 Warming up embeddings, Pinecone and LLM connections...")
+    try:
+        # Embeds the probe and opens the Pinecone HTTPS pool in one call
+        rag_pipeline.retriever.vectorstore.similarity_search_with_score("warmup", k=1)
+        agent.llm.invoke("ping")
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {str(e)}")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_agent():
+    """Build the RAG pipeline and agent once and share them across entry points."""
+    from rag.agent import FIAAgent
+    from rag.rag_pipeline import FIARAGPipeline
+
+    rag_pipeline = FIARAGPipeline(
+        index_name=os.getenv("PINECONE_INDEX_NAME", "fia-rules"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        pinecone_api_key=os.getenv("PINECONE_API_KEY"),
+        model_name="gpt-4o-mini",
+    )
+    agent = FIAAgent(
+        rag_pipeline=rag_pipeline, model_name="gpt-4o-mini", enable_tracing=False
+    )
+    return agent, rag_pipeline
+
+
+DATASET_CACHE_DIR = Path.home() / ".cache" / "fia_rag"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dataset_creator():
+    """Build the (static) evaluation datasets once."""
+    from evaluation.dataset import FIAEvaluationDataset
+
+    dataset_creator = FIAEvaluationDataset(cache_dir=DATASET_CACHE_DIR)
+    dataset_creator.create_comprehensive_dataset()
+    return dataset_creator
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dataset_info():
+    """Dataset summary used only for display."""
+    return _get_dataset_creator().get_dataset_info()
+
+
+RESULTS_CACHE_DIR = Path.home() / ".cache" / "fia_rag" / "results"
+RESPONSES_CACHE_DIR = Path.home() / ".cache" / "fia_rag" / "responses"
+EMBEDDINGS_CACHE_DIR = Path.home() / ".cache" / "fia_rag" / "embeddings"
+
+
+# Default cap on OpenAI requests in flight across every tool evaluated at once
+MAX_CONCURRENT_REQUESTS = 32
+
+
+def _create_evaluator(
+    agent, use_cache: bool = True, request_budget: int = MAX_CONCURRENT_REQUESTS
+):
+    """
+    Create an evaluator, reusing cached agent responses and embeddings.
+
+    ``request_budget`` caps this evaluator's concurrent agent queries and RAGAS
+    judge calls; tools evaluated side by side each get a share of the total.
+    """
+    from evaluation.evaluator import FIAAgentEvaluator
+
+    workers = max(1, request_budget)
+    concurrency = {"query_workers": min(8, workers), "ragas_workers": workers}
+    if not use_cache:
+        return FIAAgentEvaluator(agent, **concurrency)
+    return FIAAgentEvaluator(
+        agent,
+        response_cache_dir=RESPONSES_CACHE_DIR,
+        embedding_cache_dir=EMBEDDINGS_CACHE_DIR,
+        **concurrency,
+    )
+
+
+def _result_cache_path(evaluator, tool_name: str, dataset) -> Path:
+    """
+    Parquet path for a tool's scores.
+
+    The key covers everything that changes the scores: the dataset rows, the
+    metric set, the agent model and code version, the Pinecone index and the
+    ContextRelevance sampling.
+    """
+    import json
+
+    from evaluation.evaluator import TOOL_METRICS, MetricsType
+    from rag.agent import AGENT_VERSION
+
+    config = [
+        str(TOOL_METRICS.get(tool_name, MetricsType.COMPREHENSIVE)),
+        getattr(evaluator.agent, "model_name", ""),
+        AGENT_VERSION,
+        os.getenv("PINECONE_INDEX_NAME", "fia-rules"),
+        evaluator.context_relevance_sample_size,
+    ]
+    rows = json.dumps([config, dataset.to_list()], sort_keys=True, default=str).encode()
+    key = hashlib.sha1(rows, usedforsecurity=False).hexdigest()[:12]
+    return RESULTS_CACHE_DIR / f"{tool_name}_{key}.parquet"
+
+
+def _load_cached_results(evaluator, datasets):
+    """Load per-tool scores persisted by earlier (possibly interrupted) runs."""
+    import pandas as pd
+
+    cached = {}
+    for tool_name, dataset in datasets.items():
+        path = _result_cache_path(evaluator, tool_name, dataset)
+        if path.exists():
+            try:
+                cached[tool_name] = pd.read_parquet(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable result cache {path}: {e}")
+    return cached
+
+
+def _save_result(evaluator, tool_name: str, dataset, result):
+    """Persist a tool's scores as soon as its evaluation finishes."""
+    import pandas as pd
+
+    # RAGAS results, or per-row DataFrames when a metric was sampled
+    df = result.to_pandas() if hasattr(result, "to_pandas") else result
+    if not isinstance(df, pd.DataFrame):
+        return
+
+    path = _result_cache_path(evaluator, tool_name, dataset)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated cache file
+        tmp_path = path.with_suffix(".tmp")
+        df.to_parquet(tmp_path)
+        tmp_path.replace(path)
+    except Exception as e:
+        logger.warning(f"Could not cache results for {tool_name}: {e}")
+
+
+def _evaluate_in_worker(
+    tool_name: str,
+    use_cache: bool = True,
+    request_budget: int = MAX_CONCURRENT_REQUESTS,
+):
+    """
+    Evaluate one tool inside a worker process.
+
+    The agent and datasets are rebuilt in the worker (agent objects do not
+    pickle); datasets come from the on-disk cache written by the parent.
+    """
+    from evaluation.evaluator import TOOL_METRICS
+
+    agent, _ = _get_agent()
+    dataset = _get_dataset_creator().datasets[tool_name]
+    evaluator = _create_evaluator(agent, use_cache, request_budget)
+    result = evaluator.evaluate_tool(
+        tool_name, dataset, TOOL_METRICS.get(tool_name, "comprehensive")
+    )
+    _save_result(evaluator, tool_name, dataset, result)
+
+    # Ship plain DataFrames back to the parent
+    return result.to_pandas() if hasattr(result, "to_pandas") else result
+
+
+def _evaluate_in_processes(
+    tool_names,
+    max_workers: int,
+    use_cache: bool = True,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+):
+    """
+    Evaluate tools in spawned worker processes, keyed in input order.
+
+    Evaluation is I/O-bound, so this only pays off when the parent process is
+    CPU-bound; the workers split ``max_concurrency`` between them.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not tool_names:
+        return {}
+
+    workers = max(1, min(max_workers, len(tool_names), os.cpu_count() or 1))
+    print(f"🧵 Evaluating {len(tool_names)} tools in {workers} worker processes...")
+    request_budget = max(1, max_concurrency // workers)
+
+    results = {}
+    # spawn gives each worker fresh OpenAI/Pinecone clients instead of
+    # inheriting the parent's connection pools
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            tool_name: executor.submit(
+                _evaluate_in_worker, tool_name, use_cache, request_budget
+            )
+            for tool_name in tool_names
+        }
+        for tool_name, future in futures.items():
+            try:
+                results[tool_name] = future.result()
+            except Exception as e:
+                logger.error(f"Error evaluating {tool_name}: {str(e)}")
+                results[tool_name] = {"error": str(e)}
+    return results
+
+
+def _print_metrics(result):
+    """Print mean scores for numeric metrics and a sample for other columns."""
+    df = result.to_pandas() if hasattr(result, "to_pandas") else result
+    if not hasattr(df, "select_dtypes"):
+        print(f"Result: {result}")
+        return
+
+    # Partition columns once instead of copying the frame
+    text_cols = ["question", "answer", "ground_truth"]
+    numeric_cols = df.select_dtypes(include="number").columns
+    numeric_cols = numeric_cols.difference(text_cols, sort=False)
+    for metric, score in df[numeric_cols].mean().items():
+        print(f"  • {metric}: {score:.3f}")
+    # For non-numeric columns, show a sample value
+    other_cols = df.columns.difference(numeric_cols.union(text_cols), sort=False)
+    for metric in other_cols:
+        sample = df[metric].dropna().head(1).tolist()
+        print(f"  • {metric}: {len(df)} entries (sample: {sample})")
+
+
+def main(
+    max_workers: int = 6,
+    batch: bool = False,
+    use_cache: bool = True,
+    processes: bool = False,
+    quiet: bool = False,
+    compress: bool = False,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+):
     """Main evaluation function."""
 
     print("🏎️  FIA Agent RAGAS Evaluation System")
@@ -43,59 +278,84 @@ def main():
     print("=" * 60)
 
     # Validate configuration
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    pinecone_api_key = os.getenv("PINECONE_API_KEY")
-    index_name = os.getenv("PINECONE_INDEX_NAME", "fia-rules")
-
-    if not openai_api_key:
+    if not os.getenv("OPENAI_API_KEY"):
         print("❌ OPENAI_API_KEY environment variable not set")
         return
 
-    if not pinecone_api_key:
+    if not os.getenv("PINECONE_API_KEY"):
         print("❌ PINECONE_API_KEY environment variable not set")
         return
 
-    try:
-        # Initialize RAG pipeline
-        print("🔧 Initializing RAG pipeline...")
-        rag_pipeline = FIARAGPipeline(
-            index_name=index_name,
-            openai_api_key=openai_api_key,
-            pinecone_api_key=pinecone_api_key,
-            model_name="gpt-4o-mini",
-        )
+    # Heavy imports (ragas, langchain, pinecone) are deferred until the
+    # configuration is known to be valid so error paths and --help stay fast;
+    # _create_evaluator imports the evaluator on first use.
 
-        # Initialize agent
-        print("🤖 Initializing FIA Agent...")
-        agent = FIAAgent(
-            rag_pipeline=rag_pipeline, model_name="gpt-4o-mini", enable_tracing=False
-        )
+    try:
+        # Initialize RAG pipeline and agent
+        print("🔧 Initializing RAG pipeline and FIA Agent...")
+        agent, rag_pipeline = _get_agent()
 
         # Create evaluator
         print("📊 Initializing RAGAS evaluator...")
-        evaluator = FIAAgentEvaluator(agent)
+        # Tools evaluated side by side share one request budget
+        tools_in_flight = 1 if batch else max(1, max_workers)
+        evaluator = _create_evaluator(
+            agent, use_cache, max(1, max_concurrency // tools_in_flight)
+        )
+        _warm_up(agent, rag_pipeline)
 
-        # Show available tools
-        tools = agent.get_available_tools()
-        print(f"\n🛠️  Available Tools ({len(tools)}):")
-        for tool in tools:
-            print(f"  • {tool['name']}: {tool['description']}")
+        dataset_creator = _get_dataset_creator()
 
-        # Show evaluation datasets
-        dataset_creator = FIAEvaluationDataset()
-        dataset_creator.create_comprehensive_dataset()
-        dataset_info = dataset_creator.get_dataset_info()
+        if not quiet:
+            # Show available tools
+            tools = agent.get_available_tools()
+            print(f"\n🛠️  Available Tools ({len(tools)}):")
+            for tool in tools:
+                print(f"  • {tool['name']}: {tool['description']}")
 
-        print(f"\n📋 Evaluation Datasets:")
-        for name, info in dataset_info.items():
-            print(f"  • {name}: {info['size']} samples")
-            print(f"    Sample: {info['sample_question']}")
+            # Show evaluation datasets
+            print(f"\n📋 Evaluation Datasets:")
+            for name, info in _get_dataset_info().items():
+                print(f"  • {name}: {info['size']} samples")
+                print(f"    Sample: {info['sample_question']}")
 
         # Run comprehensive evaluation
         print(f"\n🚀 Starting comprehensive evaluation...")
         print("=" * 60)
 
-        results = evaluator.evaluate_all_tools()
+        if batch:
+            # One RAGAS run over every tool's rows (comprehensive metrics)
+            results = evaluator.evaluate_batch()
+            if "error" in results:
+                results = {"batch": results}
+        else:
+            # Tools scored by an earlier run on the same dataset are not re-run
+            datasets = dataset_creator.datasets
+            cached = _load_cached_results(evaluator, datasets) if use_cache else {}
+            if cached:
+                print(f"♻️  Reusing cached results for: {', '.join(cached)}")
+
+            # Opt-in: tools scored in worker processes are handed to the
+            # evaluator as precomputed results alongside the cached ones
+            precomputed = dict(cached)
+            if processes and max_workers > 1:
+                pending = [name for name in datasets if name not in cached]
+                precomputed.update(
+                    _evaluate_in_processes(
+                        pending, max_workers, use_cache, max_concurrency
+                    )
+                )
+
+            # Each tool's scores are written on a background thread so the
+            # evaluation threads move straight on to the next tool; leaving
+            # the block waits for the pending writes
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                results = evaluator.evaluate_all_tools(
+                    max_workers=max_workers,
+                    datasets=datasets,
+                    cached_results=precomputed,
+                    on_result=functools.partial(writer.submit, _save_result, evaluator),
+                )
 
         # Display results
         print(f"\n📊 EVALUATION RESULTS")
@@ -111,30 +371,9 @@ def main():
             if isinstance(result, dict) and "error" in result:
                 print(f"❌ Error: {result['error']}")
             else:
-                # Display metrics
-                if hasattr(result, "to_pandas"):
-                    df = result.to_pandas()
-                    print("📈 Metrics:")
-                    for metric in df.columns:
-                        if metric not in ["question", "answer", "ground_truth"]:
-                            try:
-                                # Check if the column contains numeric data
-                                if pd.api.types.is_numeric_dtype(df[metric]):
-                                    score = df[metric].mean()
-                                    if pd.notna(score) and isinstance(
-                                        score, (int, float)
-                                    ):
-                                        print(f"  • {metric}: {score:.3f}")
-                                    else:
-                                        print(f"  • {metric}: {score}")
-                                else:
-                                    # For non-numeric columns, show sample values
-                                    sample_values = df[metric].dropna().head(3).tolist()
-                                    print(
-                                        f"  • {metric}: {len(df[metric])} entries (sample: {sample_values[:1]})"
-                                    )
-                            except Exception as e:
-                                print(f"  • {metric}: Error processing - {str(e)}")
+                # Display metrics (batch runs return DataFrames directly)
+                print("📈 Metrics:")
+                _print_metrics(result)
 
         # Display comprehensive report
         if "comprehensive_report" in results:
@@ -174,7 +413,9 @@ def main():
         evaluation_path = evaluation_dir / filename
 
         print(f"\n💾 Exporting results to {evaluation_path}...")
-        export_path = evaluator.export_results(str(evaluation_path))
+        export_path = evaluator.export_results(
+            str(evaluation_path), compress=compress, indent=not compress
+        )
         print(f"✅ Results exported to: {export_path}")
 
         print(f"\n🎉 Evaluation completed successfully!")
@@ -190,56 +431,28 @@ def main():
         traceback.print_exc()
 
 
-def evaluate_single_tool(tool_name: str):
+def evaluate_single_tool(tool_name: str, use_cache: bool = True):
     """Evaluate a single tool."""
 
     print(f"🔧 Evaluating {tool_name} tool...")
 
-    # Initialize components (same as main)
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    pinecone_api_key = os.getenv("PINECONE_API_KEY")
-    index_name = os.getenv("PINECONE_INDEX_NAME", "fia-rules")
-
-    rag_pipeline = FIARAGPipeline(
-        index_name=index_name,
-        openai_api_key=openai_api_key,
-        pinecone_api_key=pinecone_api_key,
-    )
+    if not os.getenv("OPENAI_API_KEY") or not os.getenv("PINECONE_API_KEY"):
+        print("❌ Please set OPENAI_API_KEY and PINECONE_API_KEY")
+        return
 
-    agent = FIAAgent(rag_pipeline=rag_pipeline, enable_tracing=False)
-    evaluator = FIAAgentEvaluator(agent)
+    # Initialize components (shared with main)
+    agent, _ = _get_agent()
+    evaluator = _create_evaluator(agent, use_cache)
 
     # Get dataset for specific tool
-    dataset_creator = FIAEvaluationDataset()
-    datasets = dataset_creator.create_comprehensive_dataset()
+    datasets = _get_dataset_creator().datasets
 
     if tool_name in datasets:
         dataset = datasets[tool_name]
         result = evaluator.evaluate_tool(tool_name, dataset)
 
         print(f"\n📊 {tool_name.upper()} Results:")
-        if hasattr(result, "to_pandas"):
-            df = result.to_pandas()
-            for metric in df.columns:
-                if metric not in ["question", "answer", "ground_truth"]:
-                    try:
-                        # Check if the column contains numeric data
-                        if pd.api.types.is_numeric_dtype(df[metric]):
-                            score = df[metric].mean()
-                            if pd.notna(score) and isinstance(score, (int, float)):
-                                print(f"  • {metric}: {score:.3f}")
-                            else:
-                                print(f"  • {metric}: {score}")
-                        else:
-                            # For non-numeric columns, show sample values
-                            sample_values = df[metric].dropna().head(3).tolist()
-                            print(
-                                f"  • {metric}: {len(df[metric])} entries (sample: {sample_values[:1]})"
-                            )
-                    except Exception as e:
-                        print(f"  • {metric}: Error processing - {str(e)}")
-        else:
-            print(f"Result: {result}")
+        _print_metrics(result)
     else:
         print(f"❌ Tool {tool_name} not found in datasets")
 
@@ -250,6 +463,45 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Evaluate FIA Agent with RAGAS")
     parser.add_argument("--tool", help="Evaluate specific tool only")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Score all tools in a single RAGAS run using comprehensive metrics",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=6,
+        help="Number of tools to evaluate concurrently (1 = sequential)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-query the agent and re-score every tool instead of reusing cached "
+        "responses and per-tool results",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Evaluate tools in worker processes instead of threads in this process",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_REQUESTS,
+        help="Maximum OpenAI requests in flight across all tools being evaluated",
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Skip the tool and dataset overview before evaluating",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Export results as compact gzip-compressed JSON (.json.gz)",
+    )
 
     args = parser.parse_args()
 
@@ -257,6 +509,14 @@ if __name__ == "__main__":
         logging.getLogger().setLevel(logging.DEBUG)
 
     if args.tool:
-        evaluate_single_tool(args.tool)
+        evaluate_single_tool(args.tool, use_cache=not args.no_cache)
     else:
-        main()
+        main(
+            max_workers=args.workers,
+            batch=args.batch,
+            use_cache=not args.no_cache,
+            processes=args.processes,
+            quiet=args.quiet,
+            compress=args.compress,
+            max_concurrency=args.max_concurrency,
+        )
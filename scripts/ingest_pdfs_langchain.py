@@ -6,19 +6,22 @@ This script processes FIA regulation PDFs using LangChain components,
 extracts text, chunks them, and saves the results to JSON format for vector store ingestion.
 
 Features:
-- Robust PDF text extraction using PyMuPDF
+- Robust PDF text extraction using PyMuPDF (or pypdfium2)
 - LangChain document processing and chunking
 - Metadata extraction (year, regulation type, version)
 - Progress tracking and error handling
 - JSON output ready for vector store
 """
 
+import functools
 import json
 import logging
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import fitz  # PyMuPDF
 from langchain.schema import Document
@@ -27,6 +30,22 @@ from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Filename keywords used to classify regulation documents
+REGULATION_TYPE_PATTERN = re.compile(
+    r"(sporting|technical|financial|operational)", re.IGNORECASE
+)
+VERSION_PATTERN = re.compile(r"(final|v1)", re.IGNORECASE)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -34,11 +53,64 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def write_json(data: Dict[str, Any], output_path: Path, pretty: bool = True) -> None:
+    """
+    Serialize data to a JSON file with a single write.
+
+    Uses orjson when available; ``json.dump`` would issue one write per token.
+
+    Args:
+        data: JSON-serializable data
+        output_path: Path to save JSON file
+        pretty: Indent the output; compact output is smaller and faster to parse
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+        with open(output_path, "wb") as f:
+            f.write(payload)
+    else:
+        if pretty:
+            payload = json.dumps(data, ensure_ascii=False, indent=2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+
+
+def _walk_pdfs(root: str) -> Iterator[str]:
+    """
+    Yield the paths of all PDF files under a directory.
+
+    Uses os.scandir so directory entries are classified from the cached
+    d_type rather than a stat call per entry.
+
+    Args:
+        root: Directory to search
+
+    Yields:
+        PDF file paths as strings
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(".pdf"):
+                    yield entry.path
+
+
 class FIALangChainIngestionPipeline:
     """Main pipeline for processing FIA regulation PDFs using LangChain."""
 
     def __init__(
-        self, data_dir: str, output_dir: str, chunk_size: int = 1000, overlap: int = 200
+        self,
+        data_dir: str,
+        output_dir: str,
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        backend: str = "pymupdf",
+        pretty_json: bool = False,
     ):
         """
         Initialize ingestion pipeline.
@@ -48,9 +120,19 @@ class FIALangChainIngestionPipeline:
             output_dir: Directory to save processed JSON files
             chunk_size: Maximum characters per chunk
             overlap: Number of characters to overlap between chunks
+            backend: PDF text extraction backend ("pymupdf" or "pypdfium2")
+            pretty_json: Indent processed JSON files (for debugging)
         """
         self.data_dir = Path(data_dir)
         self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+        if backend == "pypdfium2" and pdfium is None:
+            logger.warning("pypdfium2 is not installed, falling back to PyMuPDF")
+            backend = "pymupdf"
+        self.backend = backend
+        self.pretty_json = pretty_json
 
         # Initialize LangChain text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -62,68 +144,130 @@ class FIALangChainIngestionPipeline:
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_pages_from_pdf(self, pdf_path: str) -> List[Tuple[int, str]]:
         """
-        Extract text from PDF using PyMuPDF.
+        Extract text from each page of a PDF using the configured backend.
 
         Args:
             pdf_path: Path to PDF file
 
         Returns:
-            Extracted text as string
+            List of (page_number, text) tuples, 1-based, skipping blank pages
         """
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text += page.get_text()
+            if self.backend == "pypdfium2":
+                page_texts = self._extract_pages_pdfium(pdf_path)
+            else:
+                page_texts = self._extract_pages_pymupdf(pdf_path)
 
-            doc.close()
-            return text.strip()
+            return [
+                (page_num, text)
+                for page_num, text in enumerate(page_texts, start=1)
+                if text.strip()
+            ]
 
         except Exception as e:
             logger.error(f"Error extracting text from {pdf_path}: {str(e)}")
-            return ""
+            return []
+
+    def _extract_pages_pymupdf(self, pdf_path: str) -> List[str]:
+        """Extract the text of every page with PyMuPDF."""
+        doc = fitz.open(pdf_path)
+        try:
+            # Plain-text mode without reading-order sorting; the splitter
+            # re-fragments the text anyway
+            return [page.get_text("text", sort=False) for page in doc]
+        finally:
+            doc.close()
+
+    def _extract_pages_pdfium(self, pdf_path: str) -> List[str]:
+        """Extract the text of every page with pypdfium2."""
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            texts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                # pdfium reports CRLF line breaks; the splitter separates on "\n"
+                texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
 
-    def extract_metadata(self, pdf_path: str, relative_path: str) -> Dict[str, Any]:
+    def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
-        Extract metadata from PDF path and file.
+        Extract text from PDF using PyMuPDF.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            Extracted text as string
+        """
+        pages = self.extract_pages_from_pdf(pdf_path)
+        return "".join(text for _, text in pages).strip()
+
+    def classify_document(self, relative_path: Path) -> Tuple[str, str, str]:
+        """
+        Derive year, regulation type and version from a PDF's relative path.
 
         Args:
-            pdf_path: Full path to PDF file
             relative_path: Relative path from data directory
 
         Returns:
-            Metadata dictionary
+            (year, regulation_type, version) tuple
         """
         # Parse path to extract year, regulation type, and version
-        path_parts = Path(relative_path).parts
+        path_parts = relative_path.parts
 
         year = path_parts[0] if len(path_parts) > 0 else "unknown"
-        filename = Path(pdf_path).stem
+        filename = relative_path.stem
 
         # Extract regulation type and version from filename
-        regulation_type = "unknown"
-        version = "unknown"
-
-        if "sporting" in filename.lower():
-            regulation_type = "sporting"
-        elif "technical" in filename.lower():
-            regulation_type = "technical"
-        elif "financial" in filename.lower():
-            regulation_type = "financial"
-        elif "operational" in filename.lower():
-            regulation_type = "operational"
-
-        if "final" in filename.lower():
-            version = "final"
-        elif "v1" in filename.lower():
-            version = "v1"
-
-        # Get file stats
-        file_stats = os.stat(pdf_path)
+        type_match = REGULATION_TYPE_PATTERN.search(filename)
+        regulation_type = type_match.group(1).lower() if type_match else "unknown"
+
+        version_match = VERSION_PATTERN.search(filename)
+        version = version_match.group(1).lower() if version_match else "unknown"
+
+        return year, regulation_type, version
+
+    def is_up_to_date(self, pdf_path: Path) -> bool:
+        """
+        Check whether a PDF's output JSON exists and is newer than the PDF.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            True if the PDF can be skipped
+        """
+        document_id = "_".join(
+            self.classify_document(pdf_path.relative_to(self.data_dir))
+        )
+        output_path = self.output_dir / f"{document_id}.json"
+        try:
+            return output_path.stat().st_mtime >= pdf_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+    def extract_metadata(
+        self, pdf_path: Path, relative_path: Path, processed_at: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract metadata from PDF path and file.
+
+        Args:
+            pdf_path: Full path to PDF file
+            relative_path: Relative path from data directory
+            processed_at: Run-wide processing timestamp (defaults to now)
+
+        Returns:
+            Metadata dictionary
+        """
+        year, regulation_type, version = self.classify_document(relative_path)
+        filename = pdf_path.stem
 
         return {
             "document_id": f"{year}_{regulation_type}_{version}",
@@ -131,25 +275,26 @@ class FIALangChainIngestionPipeline:
             "regulation_type": regulation_type,
             "version": version,
             "filename": filename,
-            "file_path": relative_path,
-            "file_size_bytes": file_stats.st_size,
-            "processed_at": datetime.now().isoformat(),
+            "file_path": str(relative_path),
+            "file_size_bytes": pdf_path.stat().st_size,
+            "processed_at": processed_at or datetime.now().isoformat(),
             "source": "fia_regulations",
         }
 
     def find_pdf_files(self) -> List[Path]:
         """Find all PDF files in the data directory."""
-        pdf_files = []
-        for pdf_path in self.data_dir.rglob("*.pdf"):
-            pdf_files.append(pdf_path)
-        return sorted(pdf_files)
+        # Sorted so chunk IDs and output order are reproducible across runs
+        return [Path(path) for path in sorted(_walk_pdfs(str(self.data_dir)))]
 
-    def process_single_pdf(self, pdf_path: Path) -> Optional[Dict[str, Any]]:
+    def process_single_pdf(
+        self, pdf_path: Path, processed_at: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Process a single PDF file using LangChain.
 
         Args:
             pdf_path: Path to PDF file
+            processed_at: Run-wide processing timestamp (defaults to now)
 
         Returns:
             Dictionary containing processed data or None if failed
@@ -158,22 +303,27 @@ class FIALangChainIngestionPipeline:
             # Get relative path for metadata
             relative_path = pdf_path.relative_to(self.data_dir)
 
-            logger.info(f"Processing: {relative_path}")
+            logger.debug(f"Processing: {relative_path}")
 
-            # Extract text using PyMuPDF
-            text = self.extract_text_from_pdf(str(pdf_path))
-            if not text:
+            # Extract text page by page using PyMuPDF
+            pages = self.extract_pages_from_pdf(str(pdf_path))
+            if not pages:
                 logger.warning(f"No text extracted from {relative_path}")
                 return None
 
             # Extract metadata
-            metadata = self.extract_metadata(str(pdf_path), str(relative_path))
+            metadata = self.extract_metadata(pdf_path, relative_path, processed_at)
 
-            # Create LangChain Document
-            doc = Document(page_content=text, metadata=metadata)
+            # Create one LangChain Document per page so chunks keep page numbers.
+            # Document-level metadata is stored once in document_info, so the
+            # pages (and chunks) only carry what varies.
+            docs = [
+                Document(page_content=text, metadata={"page_number": page_num})
+                for page_num, text in pages
+            ]
 
             # Chunk using LangChain
-            chunks = self.text_splitter.split_documents([doc])
+            chunks = self.text_splitter.split_documents(docs)
 
             if not chunks:
                 logger.warning(f"No chunks created from {relative_path}")
@@ -181,14 +331,17 @@ class FIALangChainIngestionPipeline:
 
             # Convert LangChain documents to our format
             processed_chunks = []
+            chunk_chars = 0
             for i, chunk in enumerate(chunks):
+                char_count = len(chunk.page_content)
+                chunk_chars += char_count
                 processed_chunks.append(
                     {
                         "chunk_id": f"{metadata['document_id']}_chunk_{i}",
                         "text": chunk.page_content,
-                        "metadata": chunk.metadata.copy(),
+                        "metadata": chunk.metadata,
                         "chunk_index": i,
-                        "char_count": len(chunk.page_content),
+                        "char_count": char_count,
                     }
                 )
 
@@ -198,17 +351,16 @@ class FIALangChainIngestionPipeline:
                 "total_chunks": len(processed_chunks),
                 "chunks": processed_chunks,
                 "processing_stats": {
-                    "total_characters": len(text),
-                    "average_chunk_size": sum(
-                        chunk["char_count"] for chunk in processed_chunks
-                    )
-                    / len(processed_chunks),
+                    "total_characters": sum(len(text) for _, text in pages),
+                    "average_chunk_size": (
+                        chunk_chars / len(processed_chunks) if processed_chunks else 0
+                    ),
                     "chunk_size_limit": self.text_splitter._chunk_size,
                     "overlap_size": self.text_splitter._chunk_overlap,
                 },
             }
 
-            logger.info(
+            logger.debug(
                 f"Successfully processed {relative_path}: {len(processed_chunks)} chunks"
             )
             return output_data
@@ -229,21 +381,27 @@ class FIALangChainIngestionPipeline:
             True if successful, False otherwise
         """
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            write_json(data, output_path, pretty=self.pretty_json)
             return True
         except Exception as e:
             logger.error(f"Error saving to {output_path}: {str(e)}")
             return False
 
-    def run_ingestion(self) -> Dict[str, Any]:
+    def run_ingestion(
+        self, max_workers: Optional[int] = None, force: bool = False
+    ) -> Dict[str, Any]:
         """
         Run the complete ingestion pipeline.
 
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count, capped at 8)
+            force: Reprocess PDFs even if their output JSON is up to date
+
         Returns:
             Summary statistics
         """
         logger.info("Starting FIA Regulation PDF ingestion with LangChain...")
+        processed_at = datetime.now().isoformat()
 
         # Find all PDF files
         pdf_files = self.find_pdf_files()
@@ -253,30 +411,52 @@ class FIALangChainIngestionPipeline:
             logger.warning("No PDF files found in data directory")
             return {"status": "no_files_found"}
 
-        # Process files
+        # Skip PDFs whose output is newer than the PDF itself
+        if force:
+            pending_files = pdf_files
+        else:
+            pending_files = [p for p in pdf_files if not self.is_up_to_date(p)]
+        skipped_files = len(pdf_files) - len(pending_files)
+        if skipped_files:
+            logger.info(f"Skipping {skipped_files} up-to-date PDF files")
+
+        # Process files in parallel; PDF extraction and splitting are CPU-bound
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 4, 8)
         successful_files = 0
         failed_files = 0
         total_chunks = 0
 
-        for pdf_path in tqdm(pdf_files, desc="Processing PDFs"):
-            # Process PDF
-            processed_data = self.process_single_pdf(pdf_path)
-
-            if processed_data:
-                # Save to JSON
-                output_filename = (
-                    f"{processed_data['document_info']['document_id']}.json"
+        # Hand PDFs to workers in batches to amortize IPC; workers save their
+        # own JSON and only return a chunk count
+        worker = functools.partial(
+            _process_pdf_worker,
+            data_dir=str(self.data_dir),
+            output_dir=str(self.output_dir),
+            chunk_size=self.chunk_size,
+            overlap=self.overlap,
+            backend=self.backend,
+            pretty_json=self.pretty_json,
+            processed_at=processed_at,
+        )
+        chunksize = max(1, len(pending_files) // (max_workers * 4))
+
+        if pending_files:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                chunk_counts = executor.map(
+                    worker,
+                    [str(pdf_path) for pdf_path in pending_files],
+                    chunksize=chunksize,
                 )
-                output_path = self.output_dir / output_filename
-
-                if self.save_processed_data(processed_data, output_path):
-                    successful_files += 1
-                    total_chunks += processed_data["total_chunks"]
-                    logger.info(f"Saved processed data to {output_path}")
-                else:
-                    failed_files += 1
-            else:
-                failed_files += 1
+
+                for chunk_count in tqdm(
+                    chunk_counts, total=len(pending_files), desc="Processing PDFs"
+                ):
+                    if chunk_count is not None:
+                        successful_files += 1
+                        total_chunks += chunk_count
+                    else:
+                        failed_files += 1
 
         # Generate summary
         summary = {
@@ -284,46 +464,140 @@ class FIALangChainIngestionPipeline:
             "total_files": len(pdf_files),
             "successful_files": successful_files,
             "failed_files": failed_files,
+            "skipped_files": skipped_files,
             "total_chunks": total_chunks,
             "output_directory": str(self.output_dir),
-            "processing_timestamp": datetime.now().isoformat(),
+            "processing_timestamp": processed_at,
         }
 
         logger.info(
-            f"Ingestion completed: {successful_files}/{len(pdf_files)} files processed successfully"
+            f"Ingestion completed: {successful_files}/{len(pending_files)} files processed successfully"
         )
         logger.info(f"Total chunks created: {total_chunks}")
 
         return summary
 
 
-def main():
+@functools.lru_cache(maxsize=None)
+def _get_worker_pipeline(
+    data_dir: str,
+    output_dir: str,
+    chunk_size: int,
+    overlap: int,
+    backend: str,
+    pretty_json: bool,
+) -> FIALangChainIngestionPipeline:
+    """Build the pipeline (and its text splitter) once per worker process."""
+    return FIALangChainIngestionPipeline(
+        data_dir=data_dir,
+        output_dir=output_dir,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        backend=backend,
+        pretty_json=pretty_json,
+    )
+
+
+def _process_pdf_worker(
+    pdf_path: str,
+    data_dir: str,
+    output_dir: str,
+    chunk_size: int,
+    overlap: int,
+    backend: str = "pymupdf",
+    pretty_json: bool = False,
+    processed_at: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Process and save a single PDF inside a worker process.
+
+    Args:
+        pdf_path: Path to PDF file
+        data_dir: Directory containing PDF files
+        output_dir: Directory to save processed JSON files
+        chunk_size: Maximum characters per chunk
+        overlap: Number of characters to overlap between chunks
+        backend: PDF text extraction backend
+        pretty_json: Indent processed JSON files
+        processed_at: Run-wide processing timestamp
+
+    Returns:
+        Number of chunks saved, or None if processing failed
+    """
+    try:
+        pipeline = _get_worker_pipeline(
+            data_dir, output_dir, chunk_size, overlap, backend, pretty_json
+        )
+
+        processed_data = pipeline.process_single_pdf(Path(pdf_path), processed_at)
+        if not processed_data:
+            return None
+
+        # Save to JSON
+        output_filename = f"{processed_data['document_info']['document_id']}.json"
+        output_path = pipeline.output_dir / output_filename
+
+        if not pipeline.save_processed_data(processed_data, output_path):
+            return None
+
+        logger.debug(f"Saved processed data to {output_path}")
+        return processed_data["total_chunks"]
+
+    except Exception as e:
+        # Failures must not escape: executor.map stops at the first exception
+        logger.error(f"Error processing {pdf_path}: {str(e)}")
+        return None
+
+
+def main(force: bool = False, pretty: bool = False):
     """Main function to run the ingestion pipeline."""
     # Configuration
     DATA_DIR = "/Users/naveenkumar/Desktop/formula-rules-rag/data"
     OUTPUT_DIR = "/Users/naveenkumar/Desktop/formula-rules-rag/processed_data"
     CHUNK_SIZE = 1000
     OVERLAP = 200
+    PDF_BACKEND = "pymupdf"  # or "pypdfium2"
 
     # Initialize and run pipeline
     pipeline = FIALangChainIngestionPipeline(
-        data_dir=DATA_DIR, output_dir=OUTPUT_DIR, chunk_size=CHUNK_SIZE, overlap=OVERLAP
+        data_dir=DATA_DIR,
+        output_dir=OUTPUT_DIR,
+        chunk_size=CHUNK_SIZE,
+        overlap=OVERLAP,
+        backend=PDF_BACKEND,
+        pretty_json=pretty,
     )
 
     # Run ingestion
-    summary = pipeline.run_ingestion()
+    summary = pipeline.run_ingestion(force=force)
 
     # Save summary
     summary_path = Path(OUTPUT_DIR) / "ingestion_summary.json"
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    write_json(summary, summary_path)
 
     logger.info(f"Summary saved to {summary_path}")
     print(f"\nIngestion Summary:")
     print(f"Files processed: {summary['successful_files']}/{summary['total_files']}")
+    print(f"Files skipped (up to date): {summary['skipped_files']}")
     print(f"Total chunks: {summary['total_chunks']}")
     print(f"Output directory: {summary['output_directory']}")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest FIA regulation PDFs")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess all PDFs even if their output JSON is up to date",
+    )
+
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the processed JSON files for manual inspection",
+    )
+
+    args = parser.parse_args()
+    main(force=args.force, pretty=args.pretty)
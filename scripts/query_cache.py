@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Semantic Query Cache for Demo Scripts
+
+This module wraps ``FIAAgent.query`` with an on-disk semantic cache so the
+fixed demo questions (and close paraphrases of them) are answered from SQLite
+instead of re-running retrieval and generation on every invocation.
+
+Features:
+- Questions are keyed by their embedding, not their exact text
+- Cosine-similarity lookup with a configurable threshold
+- Paraphrases citing different articles, sections or years never match
+- Entries are scoped to the agent version and model that produced them
+- Entries expire after a TTL (default: one day) and are deleted on write
+- Failed or degraded answers are never stored
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from rag.agent import AGENT_VERSION
+from rag.semantic_cache import is_degraded_response, question_references
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "fia_rag" / "demo_cache.sqlite"
+
+
+class ScriptQueryCache:
+    """Embedding-keyed response cache in front of an FIA agent."""
+
+    def __init__(
+        self,
+        agent,
+        embeddings,
+        path: Optional[Path] = None,
+        threshold: float = 0.95,
+        ttl_seconds: float = 86400,
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            agent: Initialized FIA agent used on cache misses
+            embeddings: LangChain embeddings object used to key questions
+            path: SQLite database path
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Maximum age of a cached answer
+        """
+        self.agent = agent
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        # Answers from other agent code or another model are never served
+        self.version = f"{AGENT_VERSION}|{getattr(agent, 'model_name', '')}"
+
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Demo queries run on worker threads, so share one guarded connection
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(responses)")}
+        if columns and "version" not in columns:
+            # Caches written before entries were versioned can't be trusted
+            self.conn.execute("DROP TABLE responses")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                embedding BLOB NOT NULL,
+                question TEXT NOT NULL,
+                answer_json TEXT NOT NULL,
+                ts REAL NOT NULL,
+                version TEXT NOT NULL,
+                refs TEXT NOT NULL
+            )""")
+        self._prune()
+        self.conn.commit()
+
+    def _prune(self):
+        """Delete expired entries (caller holds the lock and commits)."""
+        self.conn.execute(
+            "DELETE FROM responses WHERE ts < ?", (time.time() - self.ttl_seconds,)
+        )
+
+    def _embed(self, question: str) -> np.ndarray:
+        """Embed and L2-normalise a question."""
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _refs(question: str) -> str:
+        """Canonical article/section/year references of a question."""
+        return ",".join(sorted(question_references(question)))
+
+    def lookup(self, vector: np.ndarray, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest fresh cached response.
+
+        Args:
+            vector: Normalised question embedding
+            question: The question text; only entries citing the same
+                articles, sections and years can match
+
+        Returns:
+            Cached response or None on a miss
+        """
+        # Rows embedded at another width (e.g. before EMBEDDING_DIMENSIONS
+        # changed) are skipped so they can't be stacked into bogus vectors
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT embedding, answer_json FROM responses "
+                "WHERE ts > ? AND length(embedding) = ? AND version = ? AND refs = ?",
+                (
+                    time.time() - self.ttl_seconds,
+                    vector.nbytes,
+                    self.version,
+                    self._refs(question),
+                ),
+            ).fetchall()
+        if not rows:
+            return None
+
+        matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32)
+        matrix = matrix.reshape(len(rows), vector.shape[0])
+
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        return json.loads(rows[best][1])
+
+    def query(self, question: str) -> Dict[str, Any]:
+        """
+        Answer a question from the cache, falling back to the agent.
+
+        Args:
+            question: The question to ask
+
+        Returns:
+            Agent response (``metadata["cache_hit"]`` marks cached answers)
+        """
+        try:
+            vector = self._embed(question)
+        except Exception as e:
+            # One failed embedding shouldn't abort a whole concurrent demo run
+            logger.warning(f"Query cache unavailable for this question: {str(e)}")
+            return self.agent.query(question)
+
+        cached = self.lookup(vector, question)
+        if cached is not None:
+            logger.info(f"Cache hit for: '{question[:50]}...'")
+            cached.setdefault("metadata", {})["cache_hit"] = True
+            return cached
+
+        # Hand the embedding on so the agent doesn't embed the question again
+        response = self.agent.query(question, question_vector=vector)
+
+        # Never persist failed queries or node-level fallback answers
+        if not is_degraded_response(response):
+            with self._lock:
+                self._prune()
+                self.conn.execute(
+                    "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        vector.tobytes(),
+                        question,
+                        json.dumps(response, ensure_ascii=False, default=str),
+                        time.time(),
+                        self.version,
+                        self._refs(question),
+                    ),
+                )
+                self.conn.commit()
+
+        return response
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.conn.close()
@@ -15,6 +15,7 @@ Features:
 
 import logging
 import os
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -29,6 +30,7 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "fia-rules")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "512"))
 
 # Configure logging
 logging.basicConfig(
@@ -40,11 +42,18 @@ logger = logging.getLogger(__name__)
 class FIAQueryEngine:
     """Query engine for FIA regulations using Pinecone vector store."""
 
-    def __init__(self):
-        """Initialize the query engine."""
+    def __init__(self, embedding_cache_size: int = 512):
+        """
+        Initialize the query engine.
+
+        Args:
+            embedding_cache_size: Maximum number of question embeddings kept in memory
+        """
         # Initialize OpenAI embeddings (same as used for indexing)
         self.embeddings = OpenAIEmbeddings(
-            openai_api_key=OPENAI_API_KEY, model="text-embedding-3-small"
+            openai_api_key=OPENAI_API_KEY,
+            model="text-embedding-3-small",
+            dimensions=EMBEDDING_DIMENSIONS,
         )
 
         # Initialize Pinecone vector store
@@ -52,8 +61,54 @@ class FIAQueryEngine:
             embedding=self.embeddings, index_name=PINECONE_INDEX_NAME
         )
 
+        # LRU cache of question -> embedding, so repeated questions skip the API
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache: OrderedDict[str, List[float]] = OrderedDict()
+
         logger.info(f"✅ Query engine initialized with index: {PINECONE_INDEX_NAME}")
 
+    def _cache_embedding(self, question: str, vector: List[float]):
+        """Store an embedding, evicting the least recently used entry when full."""
+        self._embedding_cache[question] = vector
+        self._embedding_cache.move_to_end(question)
+        if len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+
+    def embed_question(self, question: str) -> List[float]:
+        """
+        Embed a question, reusing cached embeddings for repeated questions.
+
+        Args:
+            question: The question to embed
+
+        Returns:
+            Question embedding
+        """
+        vector = self._embedding_cache.get(question)
+        if vector is not None:
+            self._embedding_cache.move_to_end(question)
+            return vector
+
+        vector = self.embeddings.embed_query(question)
+        self._cache_embedding(question, vector)
+        return vector
+
+    def prime_embeddings(self, questions: List[str]):
+        """
+        Embed known questions up front in a single batched API call.
+
+        Args:
+            questions: Questions to pre-embed
+        """
+        missing = [
+            q for q in dict.fromkeys(questions) if q not in self._embedding_cache
+        ]
+        if not missing:
+            return
+
+        for question, vector in zip(missing, self.embeddings.embed_documents(missing)):
+            self._cache_embedding(question, vector)
+
     def query(self, question: str, k: int = 5) -> List[Dict[str, Any]]:
         """
         Query the vector store for relevant regulations.
@@ -66,8 +121,11 @@ class FIAQueryEngine:
             List of relevant document chunks with metadata
         """
         try:
-            # Perform similarity search
-            results = self.vectorstore.similarity_search_with_score(question, k=k)
+            # Perform similarity search on the (possibly cached) embedding
+            vector = self.embed_question(question)
+            results = self.vectorstore.similarity_search_by_vector_with_score(
+                vector, k=k
+            )
 
             # Format results
             formatted_results = []
@@ -105,6 +163,7 @@ class FIAQueryEngine:
             print(f"📅 Year: {metadata.get('year', 'Unknown')}")
             print(f"📋 Type: {metadata.get('regulation_type', 'Unknown')}")
             print(f"📄 Section: {metadata.get('section', 'Unknown')}")
+            print(f"📃 Page: {metadata.get('page_number', 'Unknown')}")
             print(f"🔢 Chunk: {metadata.get('chunk_index', 'Unknown')}")
 
             # Display text content (truncated for readability)
@@ -170,10 +229,16 @@ def main():
         "What are the financial regulations for teams?",
     ]
 
-    print(f"\n💡 Sample queries you can try:")
+    print(f"\n💡 Sample queries you can try (enter a number to run one):")
     for i, query in enumerate(sample_queries, 1):
         print(f"  {i}. {query}")
 
+    # Embed the sample queries in one batched request
+    try:
+        engine.prime_embeddings(sample_queries)
+    except Exception as e:
+        logger.warning(f"Could not pre-embed sample queries: {str(e)}")
+
     print("\n" + "=" * 50)
 
     # Interactive query loop
@@ -189,6 +254,9 @@ def main():
             if not question:
                 continue
 
+            if question.isdigit() and 1 <= int(question) <= len(sample_queries):
+                question = sample_queries[int(question) - 1]
+
             # Query the vector store
             print(f"\n🔎 Searching for: '{question}'...")
             results = engine.query(question, k=5)
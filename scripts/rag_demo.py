@@ -6,6 +6,7 @@ This script demonstrates the production-ready RAG pipeline for FIA Formula 1
 regulations with advanced features like filtering, citations, and conversation history.
 """
 
+import asyncio
 import logging
 import os
 import sys
@@ -29,6 +30,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def run_demo_queries(query_interface, demo_queries, vectors):
+    """Run the demo queries concurrently, returning responses in input order."""
+    return await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                query_interface.ask_question,
+                question=demo["question"],
+                year_filter=demo.get("year_filter"),
+                regulation_type_filter=demo.get("regulation_type_filter"),
+                query_embedding=vector,
+            )
+            for demo, vector in zip(demo_queries, vectors)
+        )
+    )
+
+
 def main():
     """Main function to run the RAG demo."""
     # Validate configuration
@@ -83,17 +100,18 @@ def main():
         print(f"\n🎯 Running {len(demo_queries)} demo queries...")
         print("=" * 50)
 
-        for i, demo in enumerate(demo_queries, 1):
+        # Embed every demo question in one request, then retrieve and answer
+        # them concurrently
+        questions = [demo["question"] for demo in demo_queries]
+        vectors = rag_pipeline.retriever.embeddings.embed_documents(questions)
+        responses = asyncio.run(
+            run_demo_queries(query_interface, demo_queries, vectors)
+        )
+
+        for i, (demo, response) in enumerate(zip(demo_queries, responses), 1):
             print(f"\n📋 Demo Query #{i}: {demo['description']}")
             print("-" * 40)
 
-            # Ask the question
-            response = query_interface.ask_question(
-                question=demo["question"],
-                year_filter=demo.get("year_filter"),
-                regulation_type_filter=demo.get("regulation_type_filter"),
-            )
-
             # Display the response
             query_interface.display_response(response)
 
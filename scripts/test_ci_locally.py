@@ -6,36 +6,113 @@ This script runs the same checks that the GitHub Actions CI/CD pipeline runs,
 allowing you to test locally before pushing changes.
 """
 
+import importlib
 import os
-import subprocess
+import subprocess  # nosec B404
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 
 def run_command(command, description):
-    """Run a command and return success status."""
-    print(f"\n🔧 {description}")
-    print(f"Running: {command}")
-    print("-" * 50)
+    """
+    Run a check and capture its report instead of printing it.
+
+    Args:
+        command: argv list to execute (no shell), or a callable run in-process
+            that returns its output text and raises on failure
+        description: Human-readable description of the check
+
+    Returns:
+        (success, report) tuple; the report is printed by the caller so that
+        checks running concurrently don't interleave their output
+    """
+    if callable(command):
+        shown = f"{command.__name__} (in-process)"
+    else:
+        shown = " ".join(command)
+    lines = [f"\n🔧 {description}", f"Running: {shown}", "-" * 50]
 
     try:
-        result = subprocess.run(
-            command, shell=True, check=True, capture_output=True, text=True
-        )
-        print("✅ Success")
-        if result.stdout:
-            print(result.stdout)
-        return True
+        if callable(command):
+            output = command()
+        else:
+            output = subprocess.run(  # nosec B603
+                command, check=True, capture_output=True, text=True
+            ).stdout
+        lines.append("✅ Success")
+        if output:
+            lines.append(output)
+        return True, "\n".join(lines)
     except subprocess.CalledProcessError as e:
-        print("❌ Failed")
-        print(f"Error: {e}")
+        lines.append("❌ Failed")
+        lines.append(f"Error: {e}")
         if e.stdout:
-            print(f"Stdout: {e.stdout}")
+            lines.append(f"Stdout: {e.stdout}")
         if e.stderr:
-            print(f"Stderr: {e.stderr}")
-        return False
+            lines.append(f"Stderr: {e.stderr}")
+        return False, "\n".join(lines)
+    except Exception as e:
+        # Missing tools (FileNotFoundError) and in-process check failures
+        lines.append("❌ Failed")
+        lines.append(f"Error: {e}")
+        return False, "\n".join(lines)
+
+
+def check_readme_exists():
+    """Check that README.md exists in the project root."""
+    if not Path("README.md").is_file():
+        raise FileNotFoundError("README.md not found")
+    return "README.md found"
+
+
+def check_streamlit_app_imports():
+    """Import the Streamlit app in this interpreter."""
+    importlib.import_module("streamlit_app")
+    return "Streamlit app syntax OK"
+
+
+def check_ui_launcher_imports():
+    """Import the UI launcher in this interpreter."""
+    importlib.import_module("run_ui")
+    return "UI launcher OK"
+
+
+def run_section(title, checks, results):
+    """Run a section's checks one after another, printing each report."""
+    print(f"\n{title}")
+    print("=" * 50)
+
+    for name, command, description in checks:
+        success, report = run_command(command, description)
+        print(report)
+        results.append((name, success))
+
+
+def run_sections_in_parallel(sections, results, max_workers=8):
+    """
+    Run independent checks from several sections concurrently.
+
+    Reports are printed grouped by section, in the order the checks are listed.
+    """
+    jobs = [check for _, checks in sections for check in checks]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = {
+            name: executor.submit(run_command, command, description)
+            for name, command, description in jobs
+        }
+
+        for title, checks in sections:
+            print(f"\n{title}")
+            print("=" * 50)
+
+            for name, _, _ in checks:
+                success, report = futures[name].result()
+                print(report)
+                results.append((name, success))
 
 
 def check_environment():
@@ -43,14 +120,9 @@ def check_environment():
     print("🔍 Checking environment...")
 
     required_vars = ["OPENAI_API_KEY", "PINECONE_API_KEY"]
-    missing_vars = []
-    found_vars = []
-
-    for var in required_vars:
-        if os.getenv(var):
-            found_vars.append(var)
-        else:
-            missing_vars.append(var)
+    found = {var: os.environ.get(var) for var in required_vars}
+    found_vars = [var for var, value in found.items() if value]
+    missing_vars = [var for var, value in found.items() if not value]
 
     if found_vars:
         print(f"✅ Found variables: {', '.join(found_vars)}")
@@ -89,122 +161,118 @@ def main():
     if not check_environment():
         sys.exit(1)
 
-    # Change to project root
+    # Change to project root (and make its modules importable for UI checks)
     os.chdir(project_root)
+    sys.path.insert(0, str(project_root))
 
     # Test results
     results = []
 
-    # 1. Code Quality Checks
-    print("\n📋 CODE QUALITY CHECKS")
-    print("=" * 50)
-
-    results.append(
-        (
-            "Black formatting",
-            run_command(
-                "black --check --diff src/ scripts/ tests/",
-                "Checking code formatting with Black",
-            ),
-        )
-    )
-
-    results.append(
-        (
-            "Import sorting",
-            run_command(
-                "isort --check-only --diff src/ scripts/ tests/",
-                "Checking import sorting with isort",
+    # 1. Code quality, documentation and UI checks are independent of each
+    # other, so they run concurrently
+    run_sections_in_parallel(
+        [
+            (
+                "📋 CODE QUALITY CHECKS",
+                [
+                    (
+                        "Black formatting",
+                        ["black", "--check", "--diff", "src/", "scripts/", "tests/"],
+                        "Checking code formatting with Black",
+                    ),
+                    (
+                        "Import sorting",
+                        [
+                            "isort",
+                            "--check-only",
+                            "--diff",
+                            "src/",
+                            "scripts/",
+                            "tests/",
+                        ],
+                        "Checking import sorting with isort",
+                    ),
+                    (
+                        "Linting",
+                        ["flake8", "src/", "scripts/", "tests/"],
+                        "Running linting with flake8",
+                    ),
+                    (
+                        "Security linting",
+                        ["bandit", "-r", "src/", "scripts/"],
+                        "Running security linting with bandit",
+                    ),
+                    (
+                        "Dependency security",
+                        ["safety", "check"],
+                        "Checking dependency vulnerabilities with safety",
+                    ),
+                ],
             ),
-        )
-    )
-
-    results.append(
-        (
-            "Linting",
-            run_command("flake8 src/ scripts/ tests/", "Running linting with flake8"),
-        )
-    )
-
-    results.append(
-        (
-            "Security linting",
-            run_command(
-                "bandit -r src/ scripts/", "Running security linting with bandit"
+            (
+                "📚 DOCUMENTATION CHECK",
+                [
+                    (
+                        "README exists",
+                        check_readme_exists,
+                        "Checking README.md exists",
+                    )
+                ],
             ),
-        )
-    )
-
-    results.append(
-        (
-            "Dependency security",
-            run_command(
-                "safety check", "Checking dependency vulnerabilities with safety"
+            (
+                "🖥️ UI TESTING",
+                [
+                    (
+                        "Streamlit app syntax",
+                        check_streamlit_app_imports,
+                        "Testing Streamlit app syntax",
+                    ),
+                    (
+                        "UI launcher",
+                        check_ui_launcher_imports,
+                        "Testing UI launcher",
+                    ),
+                ],
             ),
-        )
+        ],
+        results,
     )
 
-    # 2. Testing
-    print("\n🧪 TESTING")
-    print("=" * 50)
-
-    results.append(
-        (
-            "Unit tests",
-            run_command(
-                "pytest tests/ --cov=src --cov-report=term-missing --cov-report=xml --junitxml=test-results.xml",
+    # 2. Testing (pytest runs write the same coverage and junit files, so they
+    # stay sequential)
+    run_section(
+        "🧪 TESTING",
+        [
+            (
+                "Unit tests",
+                [
+                    "pytest",
+                    "tests/",
+                    "--cov=src",
+                    "--cov-report=term-missing",
+                    "--cov-report=xml",
+                    "--junitxml=test-results.xml",
+                ],
                 "Running unit tests with coverage",
-            ),
-        )
+            )
+        ],
+        results,
     )
 
-    # 3. Performance Tests
-    print("\n⚡ PERFORMANCE TESTING")
-    print("=" * 50)
-
-    results.append(
-        (
-            "Performance tests",
-            run_command(
-                "pytest tests/test_performance.py -v -m performance",
+    # 3. Performance Tests (timing-sensitive, so not run alongside other work)
+    run_section(
+        "⚡ PERFORMANCE TESTING",
+        [
+            (
+                "Performance tests",
+                ["pytest", "tests/test_performance.py", "-v", "-m", "performance"],
                 "Running performance tests",
-            ),
-        )
-    )
-
-    # 4. Documentation Check
-    print("\n📚 DOCUMENTATION CHECK")
-    print("=" * 50)
-
-    results.append(
-        ("README exists", run_command("test -f README.md", "Checking README.md exists"))
-    )
-
-    # 5. UI Testing
-    print("\n🖥️ UI TESTING")
-    print("=" * 50)
-
-    results.append(
-        (
-            "Streamlit app syntax",
-            run_command(
-                "python -c \"import streamlit_app; print('Streamlit app syntax OK')\"",
-                "Testing Streamlit app syntax",
-            ),
-        )
-    )
-
-    results.append(
-        (
-            "UI launcher",
-            run_command(
-                "python -c \"import run_ui; print('UI launcher OK')\"",
-                "Testing UI launcher",
-            ),
-        )
+            )
+        ],
+        results,
     )
 
-    # 6. Evaluation (Optional)
+    # 4. Evaluation (Optional)
     print("\n📊 EVALUATION (Optional)")
     print("=" * 50)
 
@@ -216,15 +284,12 @@ def main():
         run_evaluation = False
 
     if run_evaluation:
-        results.append(
-            (
-                "Agent evaluation",
-                run_command(
-                    "python scripts/evaluate_agent.py --verbose",
-                    "Running agent evaluation",
-                ),
-            )
+        success, report = run_command(
+            [sys.executable, "scripts/evaluate_agent.py", "--verbose"],
+            "Running agent evaluation",
         )
+        print(report)
+        results.append(("Agent evaluation", success))
 
     # Summary
     print("\n📊 SUMMARY")
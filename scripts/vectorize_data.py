@@ -15,6 +15,8 @@ Features:
 import json
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
@@ -23,14 +25,24 @@ from dotenv import load_dotenv
 from langchain.schema import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
+from pinecone import Pinecone, ServerlessSpec
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Load environment variables from the project .env (an explicit path skips
+# find_dotenv's call-stack inspection and directory walk)
+load_dotenv(Path(__file__).resolve().parent.parent / ".env", override=False)
 
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "fia-rules")
+PINECONE_CLOUD = os.getenv("PINECONE_CLOUD", "aws")
+PINECONE_REGION = os.getenv("PINECONE_REGION", "us-east-1")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "512"))
 
 # Configure logging
 logging.basicConfig(
@@ -51,13 +63,87 @@ class FIAVectorStorePipeline:
         """
         self.processed_data_dir = Path(processed_data_dir)
 
+        # Document-level metadata, stored once per source file and merged into
+        # each chunk's metadata only when it is uploaded
+        self.document_info: Dict[str, Dict[str, Any]] = {}
+
         # Initialize OpenAI embeddings
         self.embeddings = OpenAIEmbeddings(
-            openai_api_key=OPENAI_API_KEY, model="text-embedding-3-small"
+            openai_api_key=OPENAI_API_KEY,
+            model="text-embedding-3-small",
+            dimensions=EMBEDDING_DIMENSIONS,
+            chunk_size=500,
+            max_retries=6,
         )
 
-    def load_documents(self) -> List[Document]:
-        """Load all documents from processed JSON files."""
+    def load_file(self, json_file: Path) -> List[Document]:
+        """
+        Load the documents from a single processed JSON file.
+
+        Documents carry only their per-chunk metadata; the file's document-level
+        metadata is kept in ``document_info`` (see ``get_metadata``).
+
+        Args:
+            json_file: Processed JSON file
+
+        Returns:
+            Documents for the file's chunks (empty if the file can't be loaded)
+        """
+        try:
+            # Load JSON file (orjson parses the raw bytes directly)
+            raw = json_file.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+            source_file = sys.intern(json_file.name)
+            self.document_info[source_file] = data.get("document_info", {})
+
+            # Convert chunks to LangChain Documents
+            documents = [
+                Document(
+                    page_content=chunk["text"],
+                    metadata={
+                        **chunk["metadata"],
+                        "chunk_id": chunk["chunk_id"],
+                        "chunk_index": chunk["chunk_index"],
+                        "char_count": chunk["char_count"],
+                        "source_file": source_file,
+                    },
+                )
+                for chunk in data["chunks"]
+            ]
+
+            logger.info(f"Loaded {len(documents)} chunks from {json_file.name}")
+
+        except Exception as e:
+            logger.error(f"Error loading {json_file}: {str(e)}")
+            return []
+
+        return documents
+
+    def get_metadata(self, document: Document) -> Dict[str, Any]:
+        """
+        Build the full metadata stored in Pinecone for a document.
+
+        Args:
+            document: Document returned by ``load_documents``
+
+        Returns:
+            Document-level metadata overlaid with the chunk's own metadata
+        """
+        return {
+            **self.document_info.get(document.metadata["source_file"], {}),
+            **document.metadata,
+        }
+
+    def load_documents(self, max_workers: int = 8) -> List[Document]:
+        """
+        Load all documents from processed JSON files.
+
+        Files are read and parsed on a thread pool; documents keep file order.
+
+        Args:
+            max_workers: Number of files loaded concurrently
+        """
         documents = []
         json_files = list(self.processed_data_dir.glob("*.json"))
         # Exclude summary files
@@ -69,50 +155,87 @@ class FIAVectorStorePipeline:
 
         logger.info(f"Loading {len(json_files)} JSON files...")
 
-        for json_file in json_files:
-            try:
-                # Load JSON file
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Convert chunks to LangChain Documents
-                for chunk in data["chunks"]:
-                    # Create Document with text and metadata
-                    doc = Document(
-                        page_content=chunk["text"],
-                        metadata={
-                            "chunk_id": chunk["chunk_id"],
-                            "chunk_index": chunk["chunk_index"],
-                            "char_count": chunk["char_count"],
-                            "source_file": json_file.name,
-                            **chunk["metadata"],  # Include all original metadata
-                        },
-                    )
-                    documents.append(doc)
-
-                logger.info(
-                    f"Loaded {len(data['chunks'])} chunks from {json_file.name}"
-                )
-
-            except Exception as e:
-                logger.error(f"Error loading {json_file}: {str(e)}")
-                continue
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file_documents in executor.map(self.load_file, json_files):
+                documents.extend(file_documents)
 
         logger.info(f"Total documents loaded: {len(documents)}")
         return documents
 
-    def vectorize_documents(self, documents: List[Document]) -> Dict[str, Any]:
-        """Vectorize documents using the latest langchain_pinecone integration."""
+    def ensure_index(self):
+        """
+        Create the Pinecone index if it doesn't exist yet.
+
+        An existing index is never deleted; if its dimension doesn't match the
+        embeddings it has to be recreated by hand before re-running.
+
+        Raises:
+            ValueError: If the existing index has a different dimension
+        """
+        pc = Pinecone(api_key=PINECONE_API_KEY)
+
+        if PINECONE_INDEX_NAME not in pc.list_indexes().names():
+            logger.info(
+                f"Creating index {PINECONE_INDEX_NAME} "
+                f"(dimension={EMBEDDING_DIMENSIONS}, metric=cosine)"
+            )
+            pc.create_index(
+                name=PINECONE_INDEX_NAME,
+                dimension=EMBEDDING_DIMENSIONS,
+                metric="cosine",
+                spec=ServerlessSpec(cloud=PINECONE_CLOUD, region=PINECONE_REGION),
+            )
+            return
+
+        dimension = pc.describe_index(PINECONE_INDEX_NAME).dimension
+        if dimension != EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"Index {PINECONE_INDEX_NAME} has dimension {dimension}, "
+                f"but embeddings have {EMBEDDING_DIMENSIONS}; recreate the index"
+            )
+
+    def vectorize_documents(
+        self, documents: List[Document], batch_size: int = 100, max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Vectorize documents using the latest langchain_pinecone integration.
+
+        Documents are embedded and upserted in batches, with several batches in
+        flight at once. Chunk IDs are used as vector IDs so re-runs overwrite
+        existing vectors instead of duplicating them.
+
+        Args:
+            documents: Documents to embed and store
+            batch_size: Number of documents per embed/upsert batch
+            max_workers: Number of batches processed concurrently
+        """
         logger.info("Creating vector store with langchain_pinecone...")
 
         try:
-            # Use the latest langchain_pinecone integration
-            vectorstore = PineconeVectorStore.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                index_name=PINECONE_INDEX_NAME,
+            self.ensure_index()
+
+            vectorstore = PineconeVectorStore(
+                index_name=PINECONE_INDEX_NAME, embedding=self.embeddings
             )
 
+            def add_batch(batch: List[Document]) -> int:
+                vectorstore.add_texts(
+                    texts=[doc.page_content for doc in batch],
+                    metadatas=[self.get_metadata(doc) for doc in batch],
+                    ids=[doc.metadata["chunk_id"] for doc in batch],
+                    batch_size=batch_size,
+                )
+                return len(batch)
+
+            batches = []
+            for start in range(0, len(documents), batch_size):
+                end = start + batch_size
+                batches.append(documents[start:end])
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                uploaded = sum(executor.map(add_batch, batches))
+
+            logger.info(f"Uploaded {uploaded} documents in {len(batches)} batches")
+
             logger.info("✅ Vector store created successfully!")
 
             return {
@@ -173,8 +296,13 @@ def main():
 
     # Save summary
     summary_path = Path(PROCESSED_DATA_DIR) / "vectorization_summary.json"
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        summary_path.write_bytes(
+            orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
 
     logger.info(f"Summary saved to {summary_path}")
 
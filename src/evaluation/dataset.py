@@ -5,9 +5,274 @@ This module creates comprehensive evaluation datasets for testing
 the FIA regulations agent across different intent categories and tools.
 """
 
-from typing import Any, Dict
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import sys
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Union
+
+import pyarrow as pa
+from datasets import (
+    Dataset,
+    Features,
+    IterableDataset,
+    Sequence,
+    Value,
+    load_from_disk,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Evaluation data, stored column-wise so each Arrow column is built directly
+# (no per-row pivot). Rows line up by index across columns.
+# Built once at import and shared read-only by every FIAEvaluationDataset.
+
+# Contexts shared by several tools, defined once and referenced by key
+_CONTEXTS = MappingProxyType(
+    {
+        "ART_12_SURVIVAL_CELL": "Article 12: Car Construction and Survival Cell - The survival cell is the continuous closed structure containing the fuel tank, the cockpit and the parts of the Energy Store. The lower plate of the Energy Store assembly is considered to be part of the Survival cell. Cockpit padding includes non-structural parts placed within the cockpit for the sole purpose of improving driver comfort and safety.",
+        "ART_14_SAFETY_EQUIPMENT": "Article 14: Safety Equipment - All cars must be fitted with a fire extinguishing system which will discharge into the cockpit and into the engine compartment. The fire extinguishing system must be approved according to FIA standards. Cars must also have rear view mirrors, safety harnesses, and rear lights.",
+        "ART_5_2_ENGINE": "Article 5.2: Engine specification - Only 4-stroke engines with reciprocating pistons are permitted. Engine cubic capacity must be 1600cc (+0/-10cc). Fuel mass flow must not exceed 100kg/h. Pressure charging may only be effected by the use of a sole single stage compressor with a single stage turbine.",
+        "ART_5_13_ERS": "Article 5.13: Energy Recovery System (ERS) - The system will be considered shut down when no high voltage can be present on any external or accessible part of the ERS, or across any capacitor belonging to the MGU control units.",
+        "ART_17_3_APPEALS": "Article 17.3: Appeals may not be made against decision concerning penalties imposed under Articles 54.3a), 54.3b), 54.3c), 54.3d), 54.3e), 54.3f) or 54.3g), including those imposed during the last three (3) laps or after the end of a sprint session or a race.",
+        "ART_5_2_3_FUEL_FLOW": "Article 5.2.3: Fuel mass flow must not exceed 100kg/h. Below 10500rpm the fuel mass flow must not exceed Q (kg/h) = 0.009 N(rpm)+ 5.5. At partial load, the fuel mass flow must not exceed the limit curve defined in the regulations.",
+        "OUT_OF_SCOPE_ROLE": "I'm a specialized FIA Formula 1 regulations assistant...",
+        "OUT_OF_SCOPE_LIMITS": "I can only help with questions about FIA regulations...",
+        "OUT_OF_SCOPE_REDIRECT": "Please ask me about FIA regulations instead...",
+    }
+)
+
+_REGULATION_SEARCH_DATA = MappingProxyType(
+    {
+        "question": (
+            "What are the safety requirements for Formula 1 cars?",
+            "What are the engine power limits in Formula 1?",
+            "Find Article 5 about power units",
+        ),
+        "ground_truth": (
+            "Formula 1 cars must have specific safety structures including survival cells, roll structures, cockpit padding, safety harnesses, fire extinguishers, and rear view mirrors. These are detailed in Article 12 (Car Construction and Survival Cell) and Article 14 (Safety Equipment) of the FIA Technical Regulations.",
+            "Formula 1 engines are limited by rev limits rather than explicit power output. The engine high rev limits must remain within a band of 750rpm as specified in Article C5.14 of the 2026 Technical Regulations. Additional operational constraints are outlined in Articles C5.15 and C5.16.",
+            "Article 5 in the FIA Technical Regulations covers Power Units and includes sections on definitions (5.1), engine specifications (5.2), other means of propulsion and energy recovery (5.3), mass and centre of gravity (5.5), and energy recovery systems (5.13).",
+        ),
+        "contexts": (
+            (
+                _CONTEXTS["ART_12_SURVIVAL_CELL"],
+                _CONTEXTS["ART_14_SAFETY_EQUIPMENT"],
+                "Safety requirements include impact testing following FIA Test Procedure 01/00 and specific load tests for survival cell frontal impact, roll structure testing, and side impact structures.",
+            ),
+            (
+                "Article C5.14: Engine high rev limits must remain within a band of 750rpm...",
+                "Article C5.15: Starting the engine procedures and constraints...",
+                "Article C5.16: Stall prevention systems and operational limits...",
+            ),
+            (
+                "Article 5.1: Definitions - Power train: The power unit and associated torque transmission systems, up to but not including the drive shafts. Power unit (PU): The internal combustion engine and turbocharger, complete with its ancillaries, any energy recovery system and all actuation systems and PU-Control electronics necessary to make them function at all times.",
+                _CONTEXTS["ART_5_2_ENGINE"],
+                _CONTEXTS["ART_5_13_ERS"],
+            ),
+        ),
+    }
+)
+
+_REGULATION_COMPARISON_DATA = MappingProxyType(
+    {
+        "question": (
+            "Compare Article 5 between 2024 and 2025",
+            "What changed in safety regulations from 2024 to 2025?",
+        ),
+        "ground_truth": (
+            "Article 5 in 2024 Technical Regulations covers Power Units with sections on definitions, engine specifications, energy recovery systems, mass requirements, and ERS specifications. The 2025 version may have updates or modifications reflecting technological advancements or regulatory changes.",
+            "Safety regulations in Formula 1 typically evolve to incorporate new safety technologies and lessons learned. Changes may include updates to survival cell requirements, enhanced safety equipment standards, and improved crash testing procedures.",
+        ),
+        "contexts": (
+            (
+                "2024 Article 5: Power Unit regulations including definitions, engine specs, and ERS requirements...",
+                "2025 Article 5: Updated power unit regulations with potential modifications...",
+                "Comparison shows evolution of power unit regulations between years...",
+            ),
+            (
+                "2024 Safety Regulations: Article 12 and 14 requirements...",
+                "2025 Safety Regulations: Updated safety standards and requirements...",
+                "Evolution of safety regulations to improve driver protection...",
+            ),
+        ),
+    }
+)
+
+_PENALTY_LOOKUP_DATA = MappingProxyType(
+    {
+        "question": (
+            "What are the penalties for track limits violations?",
+            "What penalties apply for fuel flow violations?",
+        ),
+        "ground_truth": (
+            "Track limits violations in Formula 1 can result in various penalties including 5-second penalties (Article B1.10.4a), 10-second penalties (Article B1.10.4b), drive-through penalties (Article B1.10.4c), and stop-and-go penalties (Article B1.10.4d). Additional fines may apply for pit lane speeding.",
+            "Fuel flow violations in Formula 1 can result in disqualification, time penalties, or grid position penalties depending on the severity. The specific penalties are outlined in the sporting regulations and can include exclusion from the race results.",
+        ),
+        "contexts": (
+            (
+                "Article 4.2: With the exception of a reprimand or fine, when a penalty is applied under the Code or Article 54.3 the stewards may impose penalty points on a driver's Super Licence. If a driver accrues twelve (12) penalty points his licence will be suspended for the following Competition.",
+                _CONTEXTS["ART_17_3_APPEALS"],
+                "Penalty points will remain on a driver's Super Licence for a period of twelve (12) months after which they will be respectively removed on the twelve (12) month anniversary of their imposition.",
+            ),
+            (
+                _CONTEXTS["ART_5_2_3_FUEL_FLOW"],
+                _CONTEXTS["ART_17_3_APPEALS"],
+                "Fuel flow violations can result in disqualification, time penalties, or grid position penalties depending on the severity. The specific penalties are outlined in the sporting regulations and can include exclusion from the race results.",
+            ),
+        ),
+    }
+)
+
+_REGULATION_SUMMARY_DATA = MappingProxyType(
+    {
+        "question": (
+            "Summarize all safety requirements for Formula 1 cars",
+            "Provide a comprehensive overview of financial regulations",
+        ),
+        "ground_truth": (
+            "Formula 1 safety requirements encompass multiple areas: 1) Safety structures including survival cells and roll structures (Article 12), 2) Safety equipment like fire extinguishers, rear view mirrors, safety harnesses (Article 14), 3) Materials compliance with safety standards (Article 15), and 4) Fuel and engine oil safety requirements (Article 16). All components must undergo rigorous testing and homologation.",
+            "FIA Financial Regulations establish budget caps, spending limits, and financial monitoring for Formula 1 teams. These regulations ensure competitive balance and financial sustainability by limiting team expenditures on car development, operations, and personnel costs while maintaining transparency and compliance monitoring.",
+        ),
+        "contexts": (
+            (
+                _CONTEXTS["ART_12_SURVIVAL_CELL"],
+                _CONTEXTS["ART_14_SAFETY_EQUIPMENT"],
+                "Article 15: Materials - General principles for permitted materials, specific prohibitions, and prescribed laminates for safety compliance.",
+                "Article 16: Fuel and Engine Oil - Basic principles for fuel definitions, fuel properties, composition of the fuel, fuel approval, and engine oil specifications for safety compliance.",
+            ),
+            (
+                "Budget cap regulations establish spending limits for Formula 1 teams to ensure competitive balance and financial sustainability. These limits cover car development, operations, and personnel costs.",
+                "Financial monitoring and compliance requirements include regular reporting, auditing procedures, and oversight mechanisms to ensure teams adhere to spending limits and maintain financial transparency.",
+                "Transparency and reporting obligations require teams to provide detailed financial information, undergo regular audits, and maintain compliance with established budget caps and spending regulations.",
+            ),
+        ),
+    }
+)
+
+_GENERAL_RAG_DATA = MappingProxyType(
+    {
+        "question": (
+            "What are the technical specifications for Formula 1 engines?",
+            "How do qualifying sessions work in Formula 1?",
+        ),
+        "ground_truth": (
+            "Formula 1 engines must comply with specific technical regulations including displacement limits, fuel flow restrictions, energy recovery system specifications, and operational constraints. These are detailed in the FIA Technical Regulations with specific articles covering power unit requirements.",
+            "Formula 1 qualifying sessions determine the starting grid for the race. The format typically includes three sessions (Q1, Q2, Q3) with elimination rounds, where the slowest drivers are eliminated in each session. The fastest driver in Q3 starts on pole position.",
+        ),
+        "contexts": (
+            (
+                _CONTEXTS["ART_5_2_ENGINE"],
+                _CONTEXTS["ART_5_2_3_FUEL_FLOW"],
+                _CONTEXTS["ART_5_13_ERS"],
+            ),
+            (
+                "Article 39: Qualifying and Sprint Qualifying Sessions - The format includes three sessions (Q1, Q2, Q3) with elimination rounds, where the slowest drivers are eliminated in each session based on their lap times.",
+                "Article 42: The Grid for the Sprint or the Race - Grid positions are determined by qualifying session results, with the fastest driver in Q3 starting on pole position. The grid formation follows specific procedures outlined in the sporting regulations.",
+                "Qualifying regulations include time limits for each session, elimination procedures, and specific rules for grid position determination based on lap times and session performance.",
+            ),
+        ),
+    }
+)
+
+_OUT_OF_SCOPE_DATA = MappingProxyType(
+    {
+        "question": (
+            "What is the weather today?",
+            "How do I cook pasta?",
+        ),
+        "ground_truth": (
+            "I cannot provide weather information as I am a specialized FIA Formula 1 regulations assistant. I can only help with questions about FIA regulations including technical, sporting, financial, and operational aspects.",
+            "I cannot provide cooking instructions as I am a specialized FIA Formula 1 regulations assistant. I can only help with questions about FIA regulations including technical, sporting, financial, and operational aspects.",
+        ),
+        "contexts": (
+            (
+                _CONTEXTS["OUT_OF_SCOPE_ROLE"],
+                _CONTEXTS["OUT_OF_SCOPE_LIMITS"],
+                _CONTEXTS["OUT_OF_SCOPE_REDIRECT"],
+            ),
+            (
+                _CONTEXTS["OUT_OF_SCOPE_ROLE"],
+                _CONTEXTS["OUT_OF_SCOPE_LIMITS"],
+                _CONTEXTS["OUT_OF_SCOPE_REDIRECT"],
+            ),
+        ),
+    }
+)
+
+# Source literals for each tool, in evaluation order
+_TOOL_DATA = MappingProxyType(
+    {
+        "regulation_search": _REGULATION_SEARCH_DATA,
+        "regulation_comparison": _REGULATION_COMPARISON_DATA,
+        "penalty_lookup": _PENALTY_LOOKUP_DATA,
+        "regulation_summary": _REGULATION_SUMMARY_DATA,
+        "general_rag": _GENERAL_RAG_DATA,
+        "out_of_scope": _OUT_OF_SCOPE_DATA,
+    }
+)
+
+_FEATURES = Features(
+    {
+        "question": Value("string"),
+        "ground_truth": Value("string"),
+        "contexts": Sequence(Value("string")),
+    }
+)
+
+
+def _to_dataset(data: Mapping[str, tuple]) -> Dataset:
+    """Build an Arrow-backed dataset from a column-wise literal."""
+    # The schema is fixed, so skip datasets' per-column type inference
+    return Dataset(pa.Table.from_pydict(dict(data), schema=_FEATURES.arrow_schema))
+
+
+def _iter_rows(data: Mapping[str, tuple]) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a column-wise literal one at a time."""
+    for question, ground_truth, contexts in zip(
+        data["question"], data["ground_truth"], data["contexts"]
+    ):
+        yield {
+            "question": question,
+            "ground_truth": ground_truth,
+            "contexts": list(contexts),
+        }
+
+
+def _cached_dataset(builder: Callable[..., Dataset]) -> Callable[..., Dataset]:
+    """Build a dataset once per FIAEvaluationDataset instance and reuse it."""
+
+    @functools.wraps(builder)
+    def wrapper(self) -> Dataset:
+        if builder.__name__ not in self._cache:
+            self._cache[builder.__name__] = builder(self)
+        return self._cache[builder.__name__]
+
+    return wrapper
+
 
-from datasets import Dataset
+class _LazyDatasetDict(Mapping):
+    """Read-only mapping of tool name to dataset, built on first access."""
+
+    def __init__(self, builders: Dict[str, Callable[[], Dataset]]):
+        self._builders = builders
+        self._datasets: Dict[str, Dataset] = {}
+
+    def __getitem__(self, name: str) -> Dataset:
+        if name not in self._datasets:
+            self._datasets[name] = self._builders[name]()
+        return self._datasets[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
 
 
 class FIAEvaluationDataset:
@@ -15,195 +280,185 @@ class FIAEvaluationDataset:
     Creates evaluation datasets for FIA regulations agent testing.
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize the dataset creator.
+
+        Args:
+            cache_dir: Directory for an on-disk Arrow copy of the datasets; when
+                set, later runs memory-map the saved datasets instead of
+                rebuilding them
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.datasets = {}
+        self._cache: Dict[str, Dataset] = {}
+        self._info: Dict[str, Any] = {}
 
+    @_cached_dataset
     def create_regulation_search_dataset(self) -> Dataset:
         """Create dataset for regulation search tool evaluation."""
+        return _to_dataset(_REGULATION_SEARCH_DATA)
 
-        data = [
-            {
-                "question": "What are the safety requirements for Formula 1 cars?",
-                "ground_truth": "Formula 1 cars must have specific safety structures including survival cells, roll structures, cockpit padding, safety harnesses, fire extinguishers, and rear view mirrors. These are detailed in Article 12 (Car Construction and Survival Cell) and Article 14 (Safety Equipment) of the FIA Technical Regulations.",
-                "contexts": [
-                    "Article 12: Car Construction and Survival Cell - The survival cell is the continuous closed structure containing the fuel tank, the cockpit and the parts of the Energy Store. The lower plate of the Energy Store assembly is considered to be part of the Survival cell. Cockpit padding includes non-structural parts placed within the cockpit for the sole purpose of improving driver comfort and safety.",
-                    "Article 14: Safety Equipment - All cars must be fitted with a fire extinguishing system which will discharge into the cockpit and into the engine compartment. The fire extinguishing system must be approved according to FIA standards. Cars must also have rear view mirrors, safety harnesses, and rear lights.",
-                    "Safety requirements include impact testing following FIA Test Procedure 01/00 and specific load tests for survival cell frontal impact, roll structure testing, and side impact structures.",
-                ],
-            },
-            {
-                "question": "What are the engine power limits in Formula 1?",
-                "ground_truth": "Formula 1 engines are limited by rev limits rather than explicit power output. The engine high rev limits must remain within a band of 750rpm as specified in Article C5.14 of the 2026 Technical Regulations. Additional operational constraints are outlined in Articles C5.15 and C5.16.",
-                "contexts": [
-                    "Article C5.14: Engine high rev limits must remain within a band of 750rpm...",
-                    "Article C5.15: Starting the engine procedures and constraints...",
-                    "Article C5.16: Stall prevention systems and operational limits...",
-                ],
-            },
-            {
-                "question": "Find Article 5 about power units",
-                "ground_truth": "Article 5 in the FIA Technical Regulations covers Power Units and includes sections on definitions (5.1), engine specifications (5.2), other means of propulsion and energy recovery (5.3), mass and centre of gravity (5.5), and energy recovery systems (5.13).",
-                "contexts": [
-                    "Article 5.1: Definitions - Power train: The power unit and associated torque transmission systems, up to but not including the drive shafts. Power unit (PU): The internal combustion engine and turbocharger, complete with its ancillaries, any energy recovery system and all actuation systems and PU-Control electronics necessary to make them function at all times.",
-                    "Article 5.2: Engine specification - Only 4-stroke engines with reciprocating pistons are permitted. Engine cubic capacity must be 1600cc (+0/-10cc). Fuel mass flow must not exceed 100kg/h. Pressure charging may only be effected by the use of a sole single stage compressor with a single stage turbine.",
-                    "Article 5.13: Energy Recovery System (ERS) - The system will be considered shut down when no high voltage can be present on any external or accessible part of the ERS, or across any capacitor belonging to the MGU control units.",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
+    @_cached_dataset
     def create_regulation_comparison_dataset(self) -> Dataset:
         """Create dataset for regulation comparison tool evaluation."""
+        return _to_dataset(_REGULATION_COMPARISON_DATA)
 
-        data = [
-            {
-                "question": "Compare Article 5 between 2024 and 2025",
-                "ground_truth": "Article 5 in 2024 Technical Regulations covers Power Units with sections on definitions, engine specifications, energy recovery systems, mass requirements, and ERS specifications. The 2025 version may have updates or modifications reflecting technological advancements or regulatory changes.",
-                "contexts": [
-                    "2024 Article 5: Power Unit regulations including definitions, engine specs, and ERS requirements...",
-                    "2025 Article 5: Updated power unit regulations with potential modifications...",
-                    "Comparison shows evolution of power unit regulations between years...",
-                ],
-            },
-            {
-                "question": "What changed in safety regulations from 2024 to 2025?",
-                "ground_truth": "Safety regulations in Formula 1 typically evolve to incorporate new safety technologies and lessons learned. Changes may include updates to survival cell requirements, enhanced safety equipment standards, and improved crash testing procedures.",
-                "contexts": [
-                    "2024 Safety Regulations: Article 12 and 14 requirements...",
-                    "2025 Safety Regulations: Updated safety standards and requirements...",
-                    "Evolution of safety regulations to improve driver protection...",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
+    @_cached_dataset
     def create_penalty_lookup_dataset(self) -> Dataset:
         """Create dataset for penalty lookup tool evaluation."""
+        return _to_dataset(_PENALTY_LOOKUP_DATA)
 
-        data = [
-            {
-                "question": "What are the penalties for track limits violations?",
-                "ground_truth": "Track limits violations in Formula 1 can result in various penalties including 5-second penalties (Article B1.10.4a), 10-second penalties (Article B1.10.4b), drive-through penalties (Article B1.10.4c), and stop-and-go penalties (Article B1.10.4d). Additional fines may apply for pit lane speeding.",
-                "contexts": [
-                    "Article 4.2: With the exception of a reprimand or fine, when a penalty is applied under the Code or Article 54.3 the stewards may impose penalty points on a driver's Super Licence. If a driver accrues twelve (12) penalty points his licence will be suspended for the following Competition.",
-                    "Article 17.3: Appeals may not be made against decision concerning penalties imposed under Articles 54.3a), 54.3b), 54.3c), 54.3d), 54.3e), 54.3f) or 54.3g), including those imposed during the last three (3) laps or after the end of a sprint session or a race.",
-                    "Penalty points will remain on a driver's Super Licence for a period of twelve (12) months after which they will be respectively removed on the twelve (12) month anniversary of their imposition.",
-                ],
-            },
-            {
-                "question": "What penalties apply for fuel flow violations?",
-                "ground_truth": "Fuel flow violations in Formula 1 can result in disqualification, time penalties, or grid position penalties depending on the severity. The specific penalties are outlined in the sporting regulations and can include exclusion from the race results.",
-                "contexts": [
-                    "Article 5.2.3: Fuel mass flow must not exceed 100kg/h. Below 10500rpm the fuel mass flow must not exceed Q (kg/h) = 0.009 N(rpm)+ 5.5. At partial load, the fuel mass flow must not exceed the limit curve defined in the regulations.",
-                    "Article 17.3: Appeals may not be made against decision concerning penalties imposed under Articles 54.3a), 54.3b), 54.3c), 54.3d), 54.3e), 54.3f) or 54.3g), including those imposed during the last three (3) laps or after the end of a sprint session or a race.",
-                    "Fuel flow violations can result in disqualification, time penalties, or grid position penalties depending on the severity. The specific penalties are outlined in the sporting regulations and can include exclusion from the race results.",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
+    @_cached_dataset
     def create_regulation_summary_dataset(self) -> Dataset:
         """Create dataset for regulation summary tool evaluation."""
+        return _to_dataset(_REGULATION_SUMMARY_DATA)
 
-        data = [
-            {
-                "question": "Summarize all safety requirements for Formula 1 cars",
-                "ground_truth": "Formula 1 safety requirements encompass multiple areas: 1) Safety structures including survival cells and roll structures (Article 12), 2) Safety equipment like fire extinguishers, rear view mirrors, safety harnesses (Article 14), 3) Materials compliance with safety standards (Article 15), and 4) Fuel and engine oil safety requirements (Article 16). All components must undergo rigorous testing and homologation.",
-                "contexts": [
-                    "Article 12: Car Construction and Survival Cell - The survival cell is the continuous closed structure containing the fuel tank, the cockpit and the parts of the Energy Store. The lower plate of the Energy Store assembly is considered to be part of the Survival cell. Cockpit padding includes non-structural parts placed within the cockpit for the sole purpose of improving driver comfort and safety.",
-                    "Article 14: Safety Equipment - All cars must be fitted with a fire extinguishing system which will discharge into the cockpit and into the engine compartment. The fire extinguishing system must be approved according to FIA standards. Cars must also have rear view mirrors, safety harnesses, and rear lights.",
-                    "Article 15: Materials - General principles for permitted materials, specific prohibitions, and prescribed laminates for safety compliance.",
-                    "Article 16: Fuel and Engine Oil - Basic principles for fuel definitions, fuel properties, composition of the fuel, fuel approval, and engine oil specifications for safety compliance.",
-                ],
-            },
-            {
-                "question": "Provide a comprehensive overview of financial regulations",
-                "ground_truth": "FIA Financial Regulations establish budget caps, spending limits, and financial monitoring for Formula 1 teams. These regulations ensure competitive balance and financial sustainability by limiting team expenditures on car development, operations, and personnel costs while maintaining transparency and compliance monitoring.",
-                "contexts": [
-                    "Budget cap regulations establish spending limits for Formula 1 teams to ensure competitive balance and financial sustainability. These limits cover car development, operations, and personnel costs.",
-                    "Financial monitoring and compliance requirements include regular reporting, auditing procedures, and oversight mechanisms to ensure teams adhere to spending limits and maintain financial transparency.",
-                    "Transparency and reporting obligations require teams to provide detailed financial information, undergo regular audits, and maintain compliance with established budget caps and spending regulations.",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
+    @_cached_dataset
     def create_general_rag_dataset(self) -> Dataset:
         """Create dataset for general RAG tool evaluation."""
+        return _to_dataset(_GENERAL_RAG_DATA)
 
-        data = [
-            {
-                "question": "What are the technical specifications for Formula 1 engines?",
-                "ground_truth": "Formula 1 engines must comply with specific technical regulations including displacement limits, fuel flow restrictions, energy recovery system specifications, and operational constraints. These are detailed in the FIA Technical Regulations with specific articles covering power unit requirements.",
-                "contexts": [
-                    "Article 5.2: Engine specification - Only 4-stroke engines with reciprocating pistons are permitted. Engine cubic capacity must be 1600cc (+0/-10cc). Fuel mass flow must not exceed 100kg/h. Pressure charging may only be effected by the use of a sole single stage compressor with a single stage turbine.",
-                    "Article 5.2.3: Fuel mass flow must not exceed 100kg/h. Below 10500rpm the fuel mass flow must not exceed Q (kg/h) = 0.009 N(rpm)+ 5.5. At partial load, the fuel mass flow must not exceed the limit curve defined in the regulations.",
-                    "Article 5.13: Energy Recovery System (ERS) - The system will be considered shut down when no high voltage can be present on any external or accessible part of the ERS, or across any capacitor belonging to the MGU control units.",
-                ],
-            },
-            {
-                "question": "How do qualifying sessions work in Formula 1?",
-                "ground_truth": "Formula 1 qualifying sessions determine the starting grid for the race. The format typically includes three sessions (Q1, Q2, Q3) with elimination rounds, where the slowest drivers are eliminated in each session. The fastest driver in Q3 starts on pole position.",
-                "contexts": [
-                    "Article 39: Qualifying and Sprint Qualifying Sessions - The format includes three sessions (Q1, Q2, Q3) with elimination rounds, where the slowest drivers are eliminated in each session based on their lap times.",
-                    "Article 42: The Grid for the Sprint or the Race - Grid positions are determined by qualifying session results, with the fastest driver in Q3 starting on pole position. The grid formation follows specific procedures outlined in the sporting regulations.",
-                    "Qualifying regulations include time limits for each session, elimination procedures, and specific rules for grid position determination based on lap times and session performance.",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
+    @_cached_dataset
     def create_out_of_scope_dataset(self) -> Dataset:
         """Create dataset for out-of-scope handler evaluation."""
+        return _to_dataset(_OUT_OF_SCOPE_DATA)
+
+    def create_streaming_dataset(self, tool_name: str) -> IterableDataset:
+        """
+        Create a streaming dataset that yields one tool's rows on iteration.
+
+        Args:
+            tool_name: Tool whose evaluation rows to stream
+
+        Returns:
+            IterableDataset with the same columns as the eager dataset
+        """
+        return IterableDataset.from_generator(
+            _iter_rows,
+            features=_FEATURES,
+            gen_kwargs={"data": _TOOL_DATA[tool_name]},
+        )
+
+    def create_comprehensive_dataset(
+        self, streaming: bool = False
+    ) -> Mapping[str, Union[Dataset, IterableDataset]]:
+        """
+        Create comprehensive evaluation dataset for all tools.
+
+        Args:
+            streaming: Return IterableDatasets that yield rows one at a time
+                instead of Arrow-backed datasets (these are not cached)
+
+        Returns:
+            Mapping of tool name to dataset; each dataset is only built (or
+            loaded from the cache) when it is first accessed
+        """
+        if streaming:
+            return {name: self.create_streaming_dataset(name) for name in _TOOL_DATA}
+
+        if self.datasets:
+            return self.datasets
+
+        if self.cache_dir is not None:
+            self.datasets = self._load_or_build_cached()
+            return self.datasets
+
+        self.datasets = _LazyDatasetDict(self._builders())
+        return self.datasets
 
-        data = [
-            {
-                "question": "What is the weather today?",
-                "ground_truth": "I cannot provide weather information as I am a specialized FIA Formula 1 regulations assistant. I can only help with questions about FIA regulations including technical, sporting, financial, and operational aspects.",
-                "contexts": [
-                    "I'm a specialized FIA Formula 1 regulations assistant...",
-                    "I can only help with questions about FIA regulations...",
-                    "Please ask me about FIA regulations instead...",
-                ],
-            },
-            {
-                "question": "How do I cook pasta?",
-                "ground_truth": "I cannot provide cooking instructions as I am a specialized FIA Formula 1 regulations assistant. I can only help with questions about FIA regulations including technical, sporting, financial, and operational aspects.",
-                "contexts": [
-                    "I'm a specialized FIA Formula 1 regulations assistant...",
-                    "I can only help with questions about FIA regulations...",
-                    "Please ask me about FIA regulations instead...",
-                ],
-            },
-        ]
-
-        return Dataset.from_list(data)
-
-    def create_comprehensive_dataset(self) -> Dict[str, Dataset]:
-        """Create comprehensive evaluation dataset for all tools."""
-
-        self.datasets = {
-            "regulation_search": self.create_regulation_search_dataset(),
-            "regulation_comparison": self.create_regulation_comparison_dataset(),
-            "penalty_lookup": self.create_penalty_lookup_dataset(),
-            "regulation_summary": self.create_regulation_summary_dataset(),
-            "general_rag": self.create_general_rag_dataset(),
-            "out_of_scope": self.create_out_of_scope_dataset(),
+    def _builders(self) -> Dict[str, Callable[[], Dataset]]:
+        """Dataset builder for each tool, in evaluation order."""
+        return {
+            "regulation_search": self.create_regulation_search_dataset,
+            "regulation_comparison": self.create_regulation_comparison_dataset,
+            "penalty_lookup": self.create_penalty_lookup_dataset,
+            "regulation_summary": self.create_regulation_summary_dataset,
+            "general_rag": self.create_general_rag_dataset,
+            "out_of_scope": self.create_out_of_scope_dataset,
         }
 
-        return self.datasets
-
-    def get_dataset_info(self) -> Dict[str, Any]:
-        """Get information about all datasets."""
+    def _build_all(self) -> Dict[str, Dataset]:
+        """Build every tool dataset in memory."""
+        return {name: builder() for name, builder in self._builders().items()}
+
+    def _load_or_build_cached(self) -> Mapping[str, Dataset]:
+        """
+        Load the datasets from the on-disk Arrow cache, building them once.
+
+        The cache path includes a hash of this module's source, so editing the
+        evaluation literals invalidates it automatically.
+        """
+        source = inspect.getsource(sys.modules[__name__]).encode()
+        fingerprint = hashlib.blake2b(source, digest_size=8).hexdigest()
+        cache_dir = self.cache_dir / f"datasets_{fingerprint}"
+        manifest = cache_dir / "manifest.json"
+
+        # The manifest is written last, so its presence marks a complete cache
+        if manifest.exists():
+            try:
+                names = json.loads(manifest.read_text())
+                builders = self._builders()
+                return _LazyDatasetDict(
+                    {
+                        name: functools.partial(
+                            self._load_cached, cache_dir / name, builders[name]
+                        )
+                        for name in names
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable dataset cache {cache_dir}: {e}")
+
+        datasets = self._build_all()
+        try:
+            for name, dataset in datasets.items():
+                dataset.save_to_disk(str(cache_dir / name))
+            manifest.write_text(json.dumps(list(datasets)))
+        except Exception as e:
+            logger.warning(f"Could not write dataset cache {cache_dir}: {e}")
+        return datasets
+
+    @staticmethod
+    def _load_cached(path: Path, builder: Callable[[], Dataset]) -> Dataset:
+        """Memory-map one cached dataset, rebuilding it if the copy is unreadable."""
+        try:
+            return load_from_disk(str(path))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dataset cache {path}: {e}")
+            return builder()
+
+    def get_dataset_info(self, materialize: bool = False) -> Dict[str, Any]:
+        """
+        Get information about all datasets.
+
+        Args:
+            materialize: Inspect the built datasets instead of reading the
+                summary straight from the source literals (needed if
+                ``datasets`` was replaced with other data)
+
+        Returns:
+            Size, columns and a sample question for each tool
+        """
+        if not materialize:
+            return {
+                name: {
+                    "size": len(data["question"]),
+                    "columns": list(data),
+                    "sample_question": (
+                        data["question"][0] if data["question"] else None
+                    ),
+                }
+                for name, data in _TOOL_DATA.items()
+            }
 
         if not self.datasets:
             self.create_comprehensive_dataset()
 
+        # Keyed by the datasets dict, so replacing it recomputes the summary
+        if self._info.get("datasets") is self.datasets:
+            return self._info["info"]
+
         info = {}
         for name, dataset in self.datasets.items():
             info[name] = {
@@ -212,6 +467,7 @@ class FIAEvaluationDataset:
                 "sample_question": dataset[0]["question"] if len(dataset) > 0 else None,
             }
 
+        self._info = {"datasets": self.datasets, "info": info}
         return info
 
 
@@ -5,12 +5,28 @@ This module provides comprehensive evaluation capabilities using RAGAS
 to assess the performance of the FIA regulations agent across all tools.
 """
 
+import dataclasses
+import gzip
+import hashlib
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
-
-from datasets import Dataset
-from ragas import evaluate
+from enum import StrEnum
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from datasets import Dataset, concatenate_datasets
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from ragas import RunConfig, evaluate
+from ragas.dataset_schema import EvaluationResult
+from ragas.embeddings import LangchainEmbeddingsWrapper
+from ragas.llms import LangchainLLMWrapper
 from ragas.metrics import (
     ContextRelevance,
     answer_relevancy,
@@ -20,44 +36,221 @@ from ragas.metrics import (
 )
 
 from evaluation.dataset import FIAEvaluationDataset
-from rag.agent import FIAAgent
+from rag.agent import AGENT_VERSION, FIAAgent
+from rag.semantic_cache import is_degraded_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+class MetricsType(StrEnum):
+    """Metric sets a tool can be evaluated with (plain strings also work)."""
+
+    COMPREHENSIVE = "comprehensive"
+    SEARCH_FOCUSED = "search_focused"
+    COMPARISON_FOCUSED = "comparison_focused"
+    SUMMARY_FOCUSED = "summary_focused"
+
+
+# Metric set used for each tool's dataset
+TOOL_METRICS = MappingProxyType(
+    {
+        "regulation_search": MetricsType.SEARCH_FOCUSED,
+        "regulation_comparison": MetricsType.COMPARISON_FOCUSED,
+        "penalty_lookup": MetricsType.SEARCH_FOCUSED,
+        "regulation_summary": MetricsType.SUMMARY_FOCUSED,
+        "general_rag": MetricsType.COMPREHENSIVE,
+        "out_of_scope": MetricsType.SEARCH_FOCUSED,
+    }
+)
+
+
+def _export_scores(scores: pd.DataFrame) -> Dict[str, Any]:
+    """Per-row score records plus a short summary."""
+    return {
+        "metrics": scores.to_dict("records"),
+        "summary": {
+            "total_samples": len(scores),
+            "metrics_computed": list(scores.columns),
+        },
+    }
+
+
+def _export_ragas_result(result: EvaluationResult) -> Dict[str, Any]:
+    """Export a RAGAS EvaluationResult object."""
+    return _export_scores(result.to_pandas())
+
+
+def _export_stored_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Export an evaluation_results entry, or a regular dictionary as is."""
+    serializer = _SCORE_SERIALIZERS.get(type(result.get("metrics")))
+    if serializer is None:
+        return result
+
+    exported = serializer(result["metrics"])
+    exported["summary"].update(
+        dataset_size=result.get("dataset_size", 0),
+        metrics_type=result.get("metrics_type", "unknown"),
+    )
+    return exported
+
+
+def _export_fallback(result: Any) -> Dict[str, Any]:
+    """Fallback to string representation."""
+    return {"type": str(type(result).__name__), "data": str(result)}
+
+
+# Serializers for per-row scores, keyed by concrete type
+_SCORE_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    pd.DataFrame: _export_scores,
+    EvaluationResult: _export_ragas_result,
+}
+
+# Serializers for export_results, keyed by concrete type
+_EXPORT_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    **_SCORE_SERIALIZERS,
+    dict: _export_stored_result,
+}
+
+
 class FIAAgentEvaluator:
     """
     Comprehensive evaluator for FIA regulations agent using RAGAS metrics.
     """
 
-    def __init__(self, agent: FIAAgent):
+    def __init__(
+        self,
+        agent: FIAAgent,
+        query_workers: int = 8,
+        ragas_workers: int = 32,
+        response_cache_dir: Optional[Union[str, Path]] = None,
+        embedding_cache_dir: Optional[Union[str, Path]] = None,
+        context_relevance_sample_size: Optional[int] = None,
+        response_ttl_seconds: float = 7 * 24 * 3600,
+    ):
         """
         Initialize the evaluator with an FIA agent.
 
         Args:
             agent: Initialized FIA agent to evaluate
+            query_workers: Number of dataset questions the agent runs
+                concurrently (each query is an I/O-bound LLM/Pinecone call)
+            ragas_workers: Maximum concurrent RAGAS judge requests per tool
+            response_cache_dir: Directory for agent responses reused across
+                runs (keyed by agent version, model, tool and question); None
+                disables it
+            embedding_cache_dir: Directory for the embeddings RAGAS computes for
+                questions, answers and contexts, reused across metrics and
+                runs; None disables it
+            context_relevance_sample_size: Score ContextRelevance on at most
+                this many rows per tool (the costliest judge metric); None
+                scores every row, values below 1 raise ValueError
+            response_ttl_seconds: Maximum age of a cached agent response; older
+                ones are re-queried so index updates are picked up
         """
         self.agent = agent
+        self.query_workers = query_workers
+        self.response_cache_dir = (
+            Path(response_cache_dir) if response_cache_dir else None
+        )
+        self.response_ttl_seconds = response_ttl_seconds
+        self.embeddings = self._create_embeddings(embedding_cache_dir)
+        self.run_config = RunConfig(
+            max_workers=ragas_workers, timeout=180, max_retries=3
+        )
+
+        # Wrap the judge LLM and embeddings once so every tool's RAGAS run
+        # shares the same handles instead of re-wrapping them per call
+        self.ragas_llm = LangchainLLMWrapper(agent.llm, run_config=self.run_config)
+        self.ragas_embeddings = LangchainEmbeddingsWrapper(
+            self.embeddings, run_config=self.run_config
+        )
+        self.context_relevance_sample_size = self._check_sample_size(
+            context_relevance_sample_size
+        )
         self.dataset_creator = FIAEvaluationDataset()
         self.evaluation_results = {}
 
-        # Define metrics for different evaluation scenarios
-        self.metrics = {
-            "comprehensive": [
-                faithfulness,  # Measures how well the model's answer matches the ground truth
-                answer_relevancy,  # Measures how well the model's answer is relevant to the question
-                context_precision,  # how well the agent's answer is supported by the retrieved context
-                context_recall,  # Measures how well the agent retrieved the relevant context
-                ContextRelevance,  # how relevant the retrieved context are
-            ],
-            "search_focused": [faithfulness, answer_relevancy, context_precision],
-            "comparison_focused": [faithfulness, answer_relevancy, context_recall],
-            "summary_focused": [faithfulness, answer_relevancy, ContextRelevance],
-        }
+        # Responses answered during this run, keyed like the on-disk cache, so
+        # re-scoring a tool (e.g. a batch run after per-tool runs) reuses them
+        self._responses: Dict[str, Dict[str, Any]] = {}
+
+        # Shared so sampled runs can split it from the other metrics
+        self.context_relevance = ContextRelevance()
+
+        # Metric tuples for each evaluation scenario, built once per evaluator
+        self.metrics = MappingProxyType(
+            {
+                MetricsType.COMPREHENSIVE: (
+                    faithfulness,  # Measures how well the model's answer matches the ground truth
+                    answer_relevancy,  # Measures how well the model's answer is relevant to the question
+                    context_precision,  # how well the agent's answer is supported by the retrieved context
+                    context_recall,  # Measures how well the agent retrieved the relevant context
+                    self.context_relevance,  # how relevant the retrieved context are
+                ),
+                MetricsType.SEARCH_FOCUSED: (
+                    faithfulness,
+                    answer_relevancy,
+                    context_precision,
+                ),
+                MetricsType.COMPARISON_FOCUSED: (
+                    faithfulness,
+                    answer_relevancy,
+                    context_recall,
+                ),
+                MetricsType.SUMMARY_FOCUSED: (
+                    faithfulness,
+                    answer_relevancy,
+                    self.context_relevance,
+                ),
+            }
+        )
+
+    @staticmethod
+    def _check_sample_size(sample_size: Optional[int]) -> Optional[int]:
+        """Validate a ContextRelevance sample size."""
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(
+                f"context_relevance_sample_size must be at least 1, got {sample_size}"
+            )
+        return sample_size
+
+    def _create_embeddings(self, cache_dir: Optional[Union[str, Path]]):
+        """
+        Embeddings handed to RAGAS, optionally backed by an on-disk cache.
+
+        Args:
+            cache_dir: Cache directory, or None to use the agent's embeddings as is
+
+        Returns:
+            Embeddings object for RAGAS metrics
+        """
+        embeddings = self.agent.rag_pipeline.retriever.embeddings
+        if cache_dir is None:
+            return embeddings
+
+        # Vectors differ per model and size, so keep them in separate namespaces
+        model = getattr(embeddings, "model", "")
+        dimensions = getattr(embeddings, "dimensions", None)
+        return CacheBackedEmbeddings.from_bytes_store(
+            embeddings,
+            LocalFileStore(str(cache_dir)),
+            namespace=f"{model}-{dimensions}-",
+            query_embedding_cache=True,
+            key_encoder="sha256",
+        )
 
     def evaluate_tool(
-        self, tool_name: str, dataset: Dataset, metrics_type: str = "comprehensive"
-    ) -> Dict[str, Any]:
+        self,
+        tool_name: str,
+        dataset: Dataset,
+        metrics_type: str = MetricsType.COMPREHENSIVE,
+        context_relevance_sample_size: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
         """
         Evaluate a specific tool using RAGAS metrics.
 
@@ -65,70 +258,166 @@ class FIAAgentEvaluator:
             tool_name: Name of the tool to evaluate
             dataset: Evaluation dataset
             metrics_type: Type of metrics to use
+            context_relevance_sample_size: Score ContextRelevance on at most this
+                many rows (defaults to the evaluator's setting); the tool's
+                ContextRelevance average is then an estimate from the sample
 
         Returns:
-            Evaluation results dictionary
+            Union[pd.DataFrame, Dict[str, Any]]: per-row score DataFrame, or
+            {"error": ...} on failure
+
+        Raises:
+            ValueError: If context_relevance_sample_size is below 1
         """
+        if context_relevance_sample_size is None:
+            context_relevance_sample_size = self.context_relevance_sample_size
+        self._check_sample_size(context_relevance_sample_size)
+
         try:
             logger.info(f"Evaluating {tool_name} with {metrics_type} metrics...")
 
             # Get agent responses for the dataset
             responses = self._get_agent_responses(dataset, tool_name)
 
-            # Create evaluation dataset with responses
+            # Create evaluation dataset with responses (failed queries are left out)
             eval_dataset = self._create_evaluation_dataset(dataset, responses)
+            errored_count = len(dataset) - len(eval_dataset)
+            if errored_count:
+                logger.warning(
+                    f"Skipping {errored_count} failed agent responses for {tool_name}"
+                )
+            if len(eval_dataset) == 0:
+                return {"error": f"All {errored_count} agent queries failed"}
 
             # Run RAGAS evaluation
-            metrics = self.metrics.get(metrics_type, self.metrics["comprehensive"])
+            metrics = self.metrics.get(
+                metrics_type, self.metrics[MetricsType.COMPREHENSIVE]
+            )
+            sampled = (
+                context_relevance_sample_size is not None
+                and self.context_relevance in metrics
+                and len(eval_dataset) > context_relevance_sample_size
+            )
+            if sampled:
+                metrics = [m for m in metrics if m is not self.context_relevance]
+
             result = evaluate(
                 dataset=eval_dataset,
                 metrics=metrics,
-                llm=self.agent.llm,
-                embeddings=self.agent.rag_pipeline.retriever.embeddings,
+                llm=self.ragas_llm,
+                embeddings=self.ragas_embeddings,
+                run_config=self.run_config,
             )
+            scores = result.to_pandas()
+
+            sampled_metrics = {}
+            if sampled:
+                # Datasets have no subcategory column, so spread the sample
+                # evenly across the tool's rows
+                indices = np.linspace(
+                    0, len(eval_dataset) - 1, context_relevance_sample_size
+                )
+                indices = np.unique(indices.round().astype(int)).tolist()
+                sample_result = evaluate(
+                    dataset=eval_dataset.select(indices),
+                    metrics=[self.context_relevance],
+                    llm=self.ragas_llm,
+                    embeddings=self.ragas_embeddings,
+                    run_config=self.run_config,
+                )
+                # Unsampled rows get NaN, which the report's means skip
+                scores = scores.join(pd.DataFrame(sample_result.scores, index=indices))
+                sampled_metrics[self.context_relevance.name] = len(indices)
 
-            # Store results
+            # Store the per-row scores once; the report and export reuse them
             self.evaluation_results[tool_name] = {
-                "metrics": result,
+                "metrics": scores,
                 "dataset_size": len(dataset),
+                "errored_count": errored_count,
                 "metrics_type": metrics_type,
+                "sampled_metrics": sampled_metrics,
             }
 
             logger.info(f"✅ {tool_name} evaluation completed")
-            return result
+            return scores
 
         except Exception as e:
             logger.error(f"Error evaluating {tool_name}: {str(e)}")
             return {"error": str(e)}
 
-    def evaluate_all_tools(self) -> Dict[str, Any]:
+    def evaluate_all_tools(
+        self,
+        max_workers: int = 1,
+        datasets: Optional[Dict[str, Dataset]] = None,
+        cached_results: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[str, Dataset, Any], None]] = None,
+    ) -> Dict[str, Any]:
         """
         Evaluate all agent tools comprehensively.
 
+        Args:
+            max_workers: Number of tools to evaluate concurrently. Evaluation
+                time is dominated by OpenAI/Pinecone round-trips, so tools can
+                overlap on threads.
+            datasets: Evaluation datasets keyed by tool name (defaults to all tools)
+            cached_results: Results computed elsewhere (e.g. an earlier run or a
+                worker process); these tools are not re-run
+            on_result: Called with (tool_name, dataset, result) as each tool finishes
+
         Returns:
             Comprehensive evaluation results
         """
         logger.info("🚀 Starting comprehensive FIA agent evaluation...")
 
         # Get all datasets
-        datasets = self.dataset_creator.create_comprehensive_dataset()
+        if datasets is None:
+            datasets = self.dataset_creator.create_comprehensive_dataset()
+        cached_results = cached_results or {}
+
+        def run_tool(tool_name: str, dataset: Dataset) -> Any:
+            metrics_type = TOOL_METRICS.get(tool_name, MetricsType.COMPREHENSIVE)
+            result = self.evaluate_tool(tool_name, dataset, metrics_type)
+            if on_result is not None:
+                on_result(tool_name, dataset, result)
+            return result
 
         results = {}
+        pending = {}
+        for tool_name, dataset in datasets.items():
+            if tool_name in cached_results:
+                logger.info(f"Using precomputed results for {tool_name}")
+                result = cached_results[tool_name]
+                results[tool_name] = result
+                if isinstance(result, dict) and "error" in result:
+                    continue
+                self.evaluation_results[tool_name] = {
+                    "metrics": result,
+                    "dataset_size": len(dataset),
+                    "metrics_type": TOOL_METRICS.get(
+                        tool_name, MetricsType.COMPREHENSIVE
+                    ),
+                }
+            else:
+                # Placeholder keeps the output in dataset order
+                results[tool_name] = None
+                pending[tool_name] = dataset
 
         # Evaluate each tool
-        tool_metrics = {
-            "regulation_search": "search_focused",
-            "regulation_comparison": "comparison_focused",
-            "penalty_lookup": "search_focused",
-            "regulation_summary": "summary_focused",
-            "general_rag": "comprehensive",
-            "out_of_scope": "search_focused",
-        }
-
-        for tool_name, dataset in datasets.items():
-            metrics_type = tool_metrics.get(tool_name, "comprehensive")
-            result = self.evaluate_tool(tool_name, dataset, metrics_type)
-            results[tool_name] = result
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    tool_name: executor.submit(run_tool, tool_name, dataset)
+                    for tool_name, dataset in pending.items()
+                }
+                for tool_name, future in futures.items():
+                    try:
+                        results[tool_name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error evaluating {tool_name}: {str(e)}")
+                        results[tool_name] = {"error": str(e)}
+        else:
+            for tool_name, dataset in pending.items():
+                results[tool_name] = run_tool(tool_name, dataset)
 
         # Generate comprehensive report
         comprehensive_report = self._generate_comprehensive_report(results)
@@ -137,6 +426,98 @@ class FIAAgentEvaluator:
         logger.info("✅ Comprehensive evaluation completed")
         return results
 
+    def evaluate_batch(
+        self,
+        datasets: Optional[Dict[str, Dataset]] = None,
+        metrics_type: str = MetricsType.COMPREHENSIVE,
+        max_workers: int = 16,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate several tools in a single RAGAS run.
+
+        Rows from every tool are scored together so RAGAS schedules all metric
+        calls on one worker pool, then the scores are split back per tool.
+
+        Args:
+            datasets: Evaluation datasets keyed by tool name (defaults to all tools)
+            metrics_type: Type of metrics applied to every row
+            max_workers: Maximum concurrent RAGAS requests
+
+        Returns:
+            Per-row score DataFrame for each tool ({"error": ...} for tools whose
+            agent queries all failed), or {"error": ...} if the run failed
+        """
+        try:
+            if datasets is None:
+                datasets = self.dataset_creator.create_comprehensive_dataset()
+
+            logger.info(
+                f"Batch evaluating {len(datasets)} tools with {metrics_type} metrics..."
+            )
+
+            eval_datasets = []
+            tool_column = []
+            errored_counts = {}
+            for tool_name, dataset in datasets.items():
+                responses = self._get_agent_responses(dataset, tool_name)
+                eval_dataset = self._create_evaluation_dataset(dataset, responses)
+                eval_datasets.append(eval_dataset)
+                tool_column.extend([tool_name] * len(eval_dataset))
+                errored_counts[tool_name] = len(dataset) - len(eval_dataset)
+
+            metrics = self.metrics.get(
+                metrics_type, self.metrics[MetricsType.COMPREHENSIVE]
+            )
+            if tool_column:
+                # Same timeout and retries as the per-tool runs
+                result = evaluate(
+                    dataset=concatenate_datasets(eval_datasets),
+                    metrics=metrics,
+                    llm=self.ragas_llm,
+                    embeddings=self.ragas_embeddings,
+                    run_config=dataclasses.replace(
+                        self.run_config, max_workers=max_workers
+                    ),
+                )
+
+                # RAGAS preserves row order, so the tool labels line up
+                df = result.to_pandas()
+                df["tool"] = tool_column
+                groups = dict(tuple(df.groupby("tool", sort=False)))
+            else:
+                groups = {}
+
+            results = {}
+            for tool_name in datasets:
+                if tool_name not in groups:
+                    # Every agent query for this tool failed, so nothing was scored
+                    results[tool_name] = {
+                        "error": f"All {errored_counts[tool_name]} agent queries failed"
+                    }
+                    self.evaluation_results[tool_name] = {
+                        "metrics": pd.DataFrame(),
+                        "dataset_size": errored_counts[tool_name],
+                        "errored_count": errored_counts[tool_name],
+                        "metrics_type": metrics_type,
+                    }
+                    continue
+
+                tool_df = groups[tool_name].drop(columns="tool").reset_index(drop=True)
+                results[tool_name] = tool_df
+                self.evaluation_results[tool_name] = {
+                    "metrics": tool_df,
+                    "dataset_size": len(tool_df) + errored_counts[tool_name],
+                    "errored_count": errored_counts[tool_name],
+                    "metrics_type": metrics_type,
+                }
+
+            logger.info("✅ Batch evaluation completed")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batch evaluation: {str(e)}")
+            return {"error": str(e)}
+
     def _get_agent_responses(
         self, dataset: Dataset, tool_name: str
     ) -> List[Dict[str, Any]]:
@@ -150,38 +531,93 @@ class FIAAgentEvaluator:
         Returns:
             List of agent responses
         """
-        responses = []
-
-        for item in dataset:
-            try:
-                # Query the agent
-                response = self.agent.query(item["question"])
-
-                # Extract relevant information
-                agent_response = {
-                    "answer": response.get("answer", ""),
-                    "sources": response.get("sources", []),
-                    "reasoning_steps": response.get("reasoning_steps", []),
-                    "tools_used": response.get("tools_used", []),
-                    "session_id": response.get("session_id", ""),
-                }
-
-                responses.append(agent_response)
+        # Read only the question column instead of decoding every row
+        questions = list(dataset["question"])
+        keys = [self._response_key(tool_name, question) for question in questions]
+
+        # Questions already answered in this run or by an earlier one are not
+        # sent to the agent again
+        responses = [
+            self._responses.get(key) or self._load_response(key) for key in keys
+        ]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if not missing:
+            return responses
+
+        # One batched graph run for the distinct remaining questions;
+        # responses come back in order
+        pending = list(dict.fromkeys(questions[i] for i in missing))
+        fresh = dict(
+            zip(
+                pending,
+                self.agent.query_batch(pending, max_concurrency=self.query_workers),
+            )
+        )
 
-            except Exception as e:
-                logger.error(f"Error getting response for question: {str(e)}")
-                responses.append(
-                    {
-                        "answer": f"Error: {str(e)}",
-                        "sources": [],
-                        "reasoning_steps": [],
-                        "tools_used": [],
-                        "session_id": "",
-                    }
+        for i in missing:
+            response = fresh[questions[i]]
+            # Extract relevant information
+            responses[i] = {
+                "answer": response.get("answer", ""),
+                "sources": response.get("sources", []),
+                "reasoning_steps": response.get("reasoning_steps", []),
+                "tools_used": response.get("tools_used", []),
+                "session_id": response.get("session_id", ""),
+            }
+            # Never persist failed or degraded queries (nodes catch their own
+            # errors and answer with a fallback); flag them so they aren't scored
+            error = None
+            if is_degraded_response(response):
+                error = (
+                    response.get("metadata", {}).get("error") or responses[i]["answer"]
                 )
+            if error is None:
+                self._responses[keys[i]] = responses[i]
+                self._save_response(keys[i], responses[i])
+            else:
+                responses[i]["error"] = error
 
         return responses
 
+    def _response_key(self, tool_name: str, question: str) -> str:
+        """Cache key for an agent response."""
+        model = getattr(self.agent, "model_name", "")
+        return hashlib.sha256(
+            f"{AGENT_VERSION}|{model}|{tool_name}|{question}".encode()
+        ).hexdigest()
+
+    def _load_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a fresh, non-degraded cached agent response, if present."""
+        if self.response_cache_dir is None:
+            return None
+        path = self.response_cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.response_ttl_seconds:
+                return None
+            response = json.loads(path.read_text(encoding="utf-8"))
+            return None if is_degraded_response(response) else response
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached response {path}: {e}")
+            return None
+
+    def _save_response(self, key: str, response: Dict[str, Any]):
+        """Persist an agent response for later runs."""
+        if self.response_cache_dir is None:
+            return
+        path = self.response_cache_dir / f"{key}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent runs never read a partial file
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps(response, ensure_ascii=False, default=str), encoding="utf-8"
+            )
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Could not cache agent response {path}: {e}")
+
     def _create_evaluation_dataset(
         self, original_dataset: Dataset, responses: List[Dict[str, Any]]
     ) -> Dataset:
@@ -193,24 +629,26 @@ class FIAAgentEvaluator:
             responses: Agent responses
 
         Returns:
-            Dataset ready for RAGAS evaluation
+            Dataset ready for RAGAS evaluation, without rows whose agent query
+            failed (judging an error message only wastes judge-LLM calls and
+            drags the averages down)
         """
-        eval_data = []
-
-        for i, item in enumerate(original_dataset):
-            response = responses[i] if i < len(responses) else {}
+        # Pad in case fewer responses than rows came back
+        responses = list(responses[: len(original_dataset)])
+        responses += [{}] * (len(original_dataset) - len(responses))
 
-            eval_item = {
-                "question": item["question"],
-                "ground_truth": item["ground_truth"],
-                "contexts": item["contexts"],
-                "answer": response.get("answer", ""),
-                "sources": response.get("sources", []),
-            }
-
-            eval_data.append(eval_item)
+        # Reuse the original Arrow columns and append the response columns
+        dataset = original_dataset.select_columns(
+            ["question", "ground_truth", "contexts"]
+        )
+        valid = [i for i, r in enumerate(responses) if "error" not in r]
+        if len(valid) < len(responses):
+            dataset = dataset.select(valid)
+            responses = [responses[i] for i in valid]
 
-        return Dataset.from_list(eval_data)
+        return dataset.add_column(
+            "answer", [r.get("answer", "") for r in responses]
+        ).add_column("sources", [r.get("sources", []) for r in responses])
 
     def _generate_comprehensive_report(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -227,29 +665,24 @@ class FIAAgentEvaluator:
         # Calculate overall performance
         total_metrics = 0
         total_score = 0
+        tools_evaluated = 0
 
         for tool_name, result in results.items():
-            if isinstance(result, dict) and "error" not in result:
-                # Extract metric scores
-                tool_scores = {}
-                if hasattr(result, "to_pandas"):
-                    df = result.to_pandas()
-                    for metric in df.columns:
-                        if metric not in ["question", "answer", "ground_truth"]:
-                            score = df[metric].mean()
-                            tool_scores[metric] = score
-                            total_score += score
-                            total_metrics += 1
-
-                report["tool_performance"][tool_name] = tool_scores
+            # Failed tools are reported as {"error": ...} and have no scores
+            scores = self._metric_means(result)
+            if scores is None:
+                continue
+
+            report["tool_performance"][tool_name] = scores
+            total_score += sum(scores.values())
+            total_metrics += len(scores)
+            tools_evaluated += 1
 
         # Calculate overall performance
         if total_metrics > 0:
             overall_score = total_score / total_metrics
             report["summary"]["overall_score"] = overall_score
-            report["summary"]["total_tools_evaluated"] = len(
-                [r for r in results.values() if "error" not in r]
-            )
+            report["summary"]["total_tools_evaluated"] = tools_evaluated
             report["summary"]["total_metrics"] = total_metrics
 
         # Generate recommendations
@@ -259,6 +692,29 @@ class FIAAgentEvaluator:
 
         return report
 
+    def _metric_means(self, result: Any) -> Optional[Dict[str, float]]:
+        """
+        Average each metric over a tool's samples, ignoring NaN scores.
+
+        Args:
+            result: Per-row score DataFrame, RAGAS EvaluationResult, or error dict
+
+        Returns:
+            Mean score per metric (metrics with no valid score are dropped),
+            or None if the result holds no scores
+        """
+        if hasattr(result, "to_pandas"):
+            result = result.to_pandas()
+        if not isinstance(result, pd.DataFrame):
+            return None
+        return (
+            result.drop(columns=["question", "answer", "ground_truth"], errors="ignore")
+            .select_dtypes("number")
+            .mean()
+            .dropna()
+            .to_dict()
+        )
+
     def _generate_recommendations(self, tool_performance: Dict[str, Any]) -> List[str]:
         """
         Generate improvement recommendations based on evaluation results.
@@ -275,82 +731,47 @@ class FIAAgentEvaluator:
             if not metrics:
                 continue
 
+            names = np.array(list(metrics.keys()))
+            scores = np.fromiter(metrics.values(), dtype=np.float64, count=len(metrics))
+
             # Check for low scores
-            for metric, score in metrics.items():
-                if score < 0.7:  # Threshold for improvement
-                    recommendations.append(
-                        f"Improve {metric} for {tool_name} (current: {score:.2f})"
-                    )
+            low = scores < 0.7  # Threshold for improvement
+            recommendations.extend(
+                f"Improve {metric} for {tool_name} (current: {score:.2f})"
+                for metric, score in zip(names[low], scores[low])
+            )
 
             # Check for high scores
-            high_scores = [score for score in metrics.values() if score > 0.9]
-            if len(high_scores) == len(metrics):
+            if (scores > 0.9).all():
                 recommendations.append(
                     f"{tool_name} is performing excellently across all metrics"
                 )
 
         return recommendations
 
-    def export_results(self, filename: str = "fia_agent_evaluation.json") -> str:
+    def export_results(
+        self,
+        filename: str = "fia_agent_evaluation.json",
+        compress: bool = False,
+        indent: bool = True,
+    ) -> str:
         """
         Export evaluation results to file.
 
         Args:
             filename: Output filename
+            compress: Write gzip-compressed JSON to ``<filename>.gz``
+            indent: Pretty-print the JSON; turn off for machine-consumed exports
 
         Returns:
             Path to exported file
         """
-        import json
-        from pathlib import Path
-
-        # Convert results to serializable format
+        # Convert results to serializable format, dispatching on the result type
         export_data = {}
         for tool_name, result in self.evaluation_results.items():
+            serializer = _EXPORT_SERIALIZERS.get(type(result), _export_fallback)
             try:
-                # Check if result is a dictionary (our custom format)
-                if isinstance(result, dict):
-                    if "metrics" in result and hasattr(result["metrics"], "to_pandas"):
-                        # RAGAS EvaluationResult object
-                        df = result["metrics"].to_pandas()
-                        export_data[tool_name] = {
-                            "metrics": df.to_dict("records"),
-                            "summary": {
-                                "total_samples": len(df),
-                                "metrics_computed": (
-                                    list(df.columns) if not df.empty else []
-                                ),
-                                "dataset_size": result.get("dataset_size", 0),
-                                "metrics_type": result.get("metrics_type", "unknown"),
-                            },
-                        }
-                    else:
-                        # Regular dictionary
-                        export_data[tool_name] = result
-                elif hasattr(result, "to_pandas"):
-                    # Direct RAGAS EvaluationResult object
-                    df = result.to_pandas()
-                    export_data[tool_name] = {
-                        "metrics": df.to_dict("records"),
-                        "summary": {
-                            "total_samples": len(df),
-                            "metrics_computed": (
-                                list(df.columns) if not df.empty else []
-                            ),
-                        },
-                    }
-                elif hasattr(result, "__dict__"):
-                    # Try to convert object attributes to dict
-                    export_data[tool_name] = {
-                        "type": str(type(result).__name__),
-                        "data": str(result),
-                    }
-                else:
-                    # Fallback to string representation
-                    export_data[tool_name] = {
-                        "type": str(type(result).__name__),
-                        "data": str(result),
-                    }
+                export_data[tool_name] = serializer(result)
             except Exception as e:
                 logger.warning(f"Could not serialize result for {tool_name}: {e}")
                 export_data[tool_name] = {
@@ -366,10 +787,25 @@ class FIAAgentEvaluator:
             "total_tools": len(self.evaluation_results),
         }
 
+        # Serialize once (orjson serializes numpy scores natively)
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            payload = orjson.dumps(export_data, option=option, default=str)
+        else:
+            payload = json.dumps(
+                export_data, indent=2 if indent else None, default=str
+            ).encode("utf-8")
+
         # Save to file
         output_path = Path(filename)
-        with open(output_path, "w") as f:
-            json.dump(export_data, f, indent=2)
+        if compress:
+            output_path = output_path.with_name(output_path.name + ".gz")
+            with gzip.open(output_path, "wb", compresslevel=3) as f:
+                f.write(payload)
+        else:
+            output_path.write_bytes(payload)
 
         logger.info(f"Results exported to {output_path}")
         return str(output_path)
@@ -5,20 +5,126 @@ This module implements an agentic system using LangGraph for multi-step reasonin
 state management, and tool usage with LangSmith tracing.
 """
 
+import hashlib
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Annotated, Any, Dict, List, Optional, TypedDict
+from pathlib import Path
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional, TypedDict
 
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 from langsmith import Client
+from pydantic import BaseModel, Field
 
+from .intent_router import IntentRouter
 from .rag_pipeline import FIARAGPipeline
+from .semantic_cache import SemanticQueryCache, is_degraded_response
 from .tools import create_fia_tools
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of a multi-tool question's tools that run at once
+TOOL_CONCURRENCY = int(os.getenv("FIA_TOOL_CONCURRENCY", "4"))
+
+# Minimum question similarity for query() to reuse a cached response
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("FIA_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+
+def _source_fingerprint() -> str:
+    """Hash of this package's sources (prompts, tools and retrieval code)."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# Changes whenever the agent's prompts, tools or retrieval code change, so
+# caches of agent output can key on it
+AGENT_VERSION = _source_fingerprint()
+
+# Static system prompts. The question and other per-call content go in the
+# human message, so every call shares an identical prefix that the provider
+# can serve from its prompt cache.
+INTENT_PROMPT = """Classify this FIA regulation question into one of these categories:
+
+1. COMPARISON - Comparing regulations between years (e.g., "compare 2024 and 2025", "differences between years")
+2. PENALTY - Looking up penalties or violations (e.g., "penalties for track limits", "violations", "sanctions")
+3. SEARCH - Finding specific regulations (e.g., "find Article 5", "search for engine rules", "what are the requirements")
+4. SUMMARY - Comprehensive analysis (e.g., "summarize safety requirements", "comprehensive analysis")
+5. GENERAL - General regulation questions (e.g., "what are the rules", "explain regulations")
+6. MULTI_TOOL - Questions requiring multiple tools (e.g., "safety requirements AND penalties", "compare AND summarize", "find regulations AND penalties")
+7. OUT_OF_SCOPE - Not about FIA regulations (e.g., "weather", "cooking", "other topics")
+
+Return only the category name (COMPARISON, PENALTY, SEARCH, SUMMARY, GENERAL, MULTI_TOOL, or OUT_OF_SCOPE)."""
+
+MULTI_TOOL_PROMPT = """Analyze this FIA regulation question and determine which tools are needed:
+
+Available tools:
+- regulation_search: Find specific regulations
+- regulation_comparison: Compare regulations between years
+- penalty_lookup: Look up penalties for violations
+- regulation_summary: Create comprehensive summaries
+- general_rag: General regulation questions
+
+Determine which tools are needed to fully answer this question. Consider:
+1. Does it ask for specific regulations? → regulation_search
+2. Does it ask for comparisons? → regulation_comparison
+3. Does it ask for penalties? → penalty_lookup
+4. Does it ask for summaries? → regulation_summary
+5. Is it a general question? → general_rag
+
+Return a JSON list of tool names, e.g., ["regulation_search", "penalty_lookup"]"""
+
+REASONING_PROMPT = """You are an expert FIA Formula 1 regulations analyst. Decide how to answer the question.
+
+Classify the question into one of these intents:
+1. COMPARISON - Comparing regulations between years (e.g., "compare 2024 and 2025", "differences between years")
+2. PENALTY - Looking up penalties or violations (e.g., "penalties for track limits", "violations", "sanctions")
+3. SEARCH - Finding specific regulations (e.g., "find Article 5", "search for engine rules", "what are the requirements")
+4. SUMMARY - Comprehensive analysis (e.g., "summarize safety requirements", "comprehensive analysis")
+5. GENERAL - General regulation questions (e.g., "what are the rules", "explain regulations")
+6. MULTI_TOOL - Questions requiring multiple tools (e.g., "safety requirements AND penalties", "compare AND summarize", "find regulations AND penalties")
+7. OUT_OF_SCOPE - Not about FIA regulations (e.g., "weather", "cooking", "other topics")
+
+Available Tools:
+- regulation_search: Search for specific regulations
+- regulation_comparison: Compare regulations between years
+- penalty_lookup: Look up penalties for violations
+- regulation_summary: Create comprehensive summaries
+- general_rag: General regulation questions
+- out_of_scope_handler: Non-regulation questions
+
+Select the single tool matching the intent, or every tool needed for a MULTI_TOOL question, and explain why you're using the selected tool(s) and what you expect to accomplish."""
+
+COMBINE_PROMPT = """You are an expert FIA Formula 1 regulations analyst. Combine the results from multiple tools into a comprehensive, well-structured answer.
+
+Instructions:
+1. Synthesize the information from all tools
+2. Create a coherent, comprehensive answer
+3. Organize the information logically
+4. Highlight key points and relationships
+5. Ensure the answer directly addresses the original question
+6. Use clear headings and structure
+
+Provide a well-organized, comprehensive answer that combines all the information effectively."""
+
+FINAL_ANSWER_PROMPT = """Based on the tool result, provide a comprehensive answer to the user's question.
+
+Provide a clear, well-structured answer that directly addresses the user's question."""
+
+QUALITY_PROMPT = """You are a quality assessor for an AI agent. Your job is to decide whether an answer is good enough or needs improvement.
+
+Evaluate the answer quality:
+- If the answer is incomplete, inaccurate, unclear, or lacks specificity, return: CONTINUE
+- If the answer is complete, accurate, clear, and specific, return: END
+
+IMPORTANT: You must respond with ONLY one word: either "CONTINUE" or "END"
+Do not provide explanations, scores, or detailed analysis."""
+
 
 class AgentState(TypedDict):
     """State for the FIA regulations agent."""
@@ -43,6 +149,27 @@ class AgentState(TypedDict):
     multi_tool_results: Annotated[
         Dict[str, str], "Results from multiple tools"
     ]  # results from multi-tool execution
+    question_vector: Optional[Any]  # question embedding, computed once per query
+
+
+class ReasonDecision(BaseModel):
+    """Structured output of the reasoning step."""
+
+    intent: Literal[
+        "COMPARISON",
+        "PENALTY",
+        "SEARCH",
+        "SUMMARY",
+        "GENERAL",
+        "MULTI_TOOL",
+        "OUT_OF_SCOPE",
+    ] = Field(description="Intent category of the question")
+    selected_tools: List[str] = Field(
+        description="Tools to run; more than one only for MULTI_TOOL questions"
+    )
+    reasoning: str = Field(
+        description="Why these tools were chosen and what they should accomplish"
+    )
 
 
 class FIAAgent:
@@ -56,6 +183,7 @@ class FIAAgent:
         model_name: str = "gpt-4-mini",
         enable_tracing: bool = True,
         langsmith_api_key: Optional[str] = None,
+        enable_cache: bool = True,
     ):
         """
         Initialize the FIA agent.
@@ -65,6 +193,8 @@ class FIAAgent:
             model_name: LLM model name
             enable_tracing: Whether to enable LangSmith tracing
             langsmith_api_key: LangSmith API key for tracing
+            enable_cache: Whether query() answers repeated or paraphrased
+                questions from an in-memory semantic cache
         """
         self.rag_pipeline = rag_pipeline
         self.model_name = model_name
@@ -72,9 +202,33 @@ class FIAAgent:
         # Initialize LLM
         self.llm = ChatOpenAI(model=model_name, temperature=0.1)
 
+        # Intent, tool selection and reasoning come back from one call
+        self.reasoner = self.llm.with_structured_output(ReasonDecision)
+
         # Create tools
         self.tools = create_fia_tools(rag_pipeline)
 
+        # Shared pool for running a multi-tool question's tools concurrently
+        # (each tool is an I/O-bound retrieval + LLM round-trip)
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=TOOL_CONCURRENCY, thread_name_prefix="fia-tool"
+        )
+
+        # Semantic response cache, keyed with the retriever's embeddings
+        embeddings = getattr(
+            getattr(rag_pipeline, "retriever", None), "embeddings", None
+        )
+        self.query_cache = (
+            SemanticQueryCache(embeddings, threshold=SEMANTIC_CACHE_THRESHOLD)
+            if enable_cache and embeddings is not None
+            else None
+        )
+
+        # Local intent classifier; the LLM only handles ambiguous questions
+        self.intent_router = (
+            IntentRouter(embeddings) if embeddings is not None else None
+        )
+
         # Set up LangSmith tracing
         if enable_tracing and langsmith_api_key:
             self._setup_langsmith_tracing(langsmith_api_key)
@@ -87,8 +241,6 @@ class FIAAgent:
     def _setup_langsmith_tracing(self, api_key: str):
         """Set up LangSmith tracing for monitoring agent behavior."""
         try:
-            import os
-
             # Set environment variables for tracing
             os.environ["LANGCHAIN_TRACING_V2"] = "true"
             os.environ["LANGSMITH_API_KEY"] = api_key
@@ -127,26 +279,21 @@ class FIAAgent:
 
         return workflow.compile()
 
-    def _classify_intent(self, question: str) -> str:
+    def _classify_intent(self, question: str, vector: Optional[Any] = None) -> str:
         """Classify the user's intent using LLM with multi-tool support."""
-        try:
-            classification_prompt = f"""Classify this FIA regulation question into one of these categories:
-
-1. COMPARISON - Comparing regulations between years (e.g., "compare 2024 and 2025", "differences between years")
-2. PENALTY - Looking up penalties or violations (e.g., "penalties for track limits", "violations", "sanctions")
-3. SEARCH - Finding specific regulations (e.g., "find Article 5", "search for engine rules", "what are the requirements")
-4. SUMMARY - Comprehensive analysis (e.g., "summarize safety requirements", "comprehensive analysis")
-5. GENERAL - General regulation questions (e.g., "what are the rules", "explain regulations")
-6. MULTI_TOOL - Questions requiring multiple tools (e.g., "safety requirements AND penalties", "compare AND summarize", "find regulations AND penalties")
-7. OUT_OF_SCOPE - Not about FIA regulations (e.g., "weather", "cooking", "other topics")
-
-Question: {question}
-
-Return only the category name (COMPARISON, PENALTY, SEARCH, SUMMARY, GENERAL, MULTI_TOOL, or OUT_OF_SCOPE)."""
+        # Confident embedding matches skip the LLM round-trip
+        if self.intent_router is not None:
+            if vector is not None:
+                intent = self.intent_router.classify_vector(vector)
+            else:
+                intent = self.intent_router.classify(question)
+            if intent is not None:
+                return intent
 
+        try:
             messages = [
-                SystemMessage(content=classification_prompt),
-                HumanMessage(content=question),
+                SystemMessage(content=INTENT_PROMPT),
+                HumanMessage(content=f"Question: {question}"),
             ]
 
             response = self.llm.invoke(messages)
@@ -186,29 +333,9 @@ Return only the category name (COMPARISON, PENALTY, SEARCH, SUMMARY, GENERAL, MU
     def _select_multi_tools(self, question: str) -> List[str]:
         """Select multiple tools for complex questions requiring orchestration."""
         try:
-            multi_tool_prompt = f"""Analyze this FIA regulation question and determine which tools are needed:
-
-Available tools:
-- regulation_search: Find specific regulations
-- regulation_comparison: Compare regulations between years
-- penalty_lookup: Look up penalties for violations
-- regulation_summary: Create comprehensive summaries
-- general_rag: General regulation questions
-
-Question: {question}
-
-Determine which tools are needed to fully answer this question. Consider:
-1. Does it ask for specific regulations? → regulation_search
-2. Does it ask for comparisons? → regulation_comparison
-3. Does it ask for penalties? → penalty_lookup
-4. Does it ask for summaries? → regulation_summary
-5. Is it a general question? → general_rag
-
-Return a JSON list of tool names, e.g., ["regulation_search", "penalty_lookup"]"""
-
             messages = [
-                SystemMessage(content=multi_tool_prompt),
-                HumanMessage(content=question),
+                SystemMessage(content=MULTI_TOOL_PROMPT),
+                HumanMessage(content=f"Question: {question}"),
             ]
 
             response = self.llm.invoke(messages)
@@ -236,57 +363,80 @@ Return a JSON list of tool names, e.g., ["regulation_search", "penalty_lookup"]"
             logger.error(f"Error in multi-tool selection: {str(e)}")
             return ["general_rag"]  # Default fallback
 
+    def _decide(self, question: str, reasoning_steps: List[str]) -> ReasonDecision:
+        """Classify intent, select tools and explain the plan in one LLM call."""
+        previous_steps = "\n".join(reasoning_steps) if reasoning_steps else "None"
+        messages = [
+            SystemMessage(content=REASONING_PROMPT),
+            HumanMessage(
+                content=f"Previous Reasoning Steps:\n{previous_steps}\n\n"
+                f"Current Question: {question}"
+            ),
+        ]
+
+        return self.reasoner.invoke(messages)
+
+    def _question_vector(self, state: AgentState) -> Optional[Any]:
+        """Question embedding from query(), or embedded once and kept in state."""
+        if self.intent_router is None:
+            return None
+        if state.get("question_vector") is None:
+            state["question_vector"] = self.intent_router.embed(
+                state["current_question"]
+            )
+        return state["question_vector"]
+
     def _reason_node(self, state: AgentState) -> AgentState:
         """Enhanced reasoning node with multi-tool support."""
         try:
             current_question = state["current_question"]
-            reasoning_steps = state.get("reasoning_steps", [])
+            reasoning_steps = list(state.get("reasoning_steps", []))
+
+            routed = None
+            vector = self._question_vector(state)
+            if vector is not None:
+                routed = self.intent_router.classify_vector(vector)
+
+            try:
+                if routed is not None and routed != "MULTI_TOOL":
+                    # Step 1: The embedding router settled a single-tool intent,
+                    # and its tool follows directly, so no LLM call is needed
+                    intent = routed
+                    tools = [self._select_tool(intent)]
+                    reasoning = None
+                else:
+                    # Step 1: Classify intent, select tools and reason in one call
+                    decision = self._decide(current_question, reasoning_steps)
+                    intent = decision.intent
+                    known_tools = {tool.name for tool in self.tools}
+                    tools = [t for t in decision.selected_tools if t in known_tools]
+                    if intent != "MULTI_TOOL":
+                        tools = tools[:1] or [self._select_tool(intent)]
+                    reasoning = decision.reasoning
+            except Exception as e:
+                # Fall back to separate classification and tool selection calls
+                logger.warning(f"Structured reasoning failed, falling back: {str(e)}")
+                intent = self._classify_intent(current_question, vector)
+                if intent == "MULTI_TOOL":
+                    tools = self._select_multi_tools(current_question)
+                else:
+                    tools = [self._select_tool(intent)]
+                reasoning = None
 
-            # Step 1: Classify intent
-            intent = self._classify_intent(current_question)
             state["reasoning_steps"].append(f"Intent Classification: {intent}")
 
-            # Step 2: Select tools based on intent
+            # Step 2: Record the selected tools
             if intent == "MULTI_TOOL":
-                tools = self._select_multi_tools(current_question)
+                tools = tools or ["general_rag"]
                 state["reasoning_steps"].append(f"Selected Multi-Tools: {tools}")
-                state["selected_tools"] = tools  # Store multiple tools
             else:
-                tool = self._select_tool(intent)
-                state["reasoning_steps"].append(f"Selected Tool: {tool}")
-                state["selected_tools"] = [tool]  # Store as single tool list
-
-            # Step 3: Create reasoning prompt
-            tools_text = ", ".join(state["selected_tools"])
-            reasoning_prompt = f"""You are an expert FIA Formula 1 regulations analyst. 
-
-Current Question: {current_question}
-Intent: {intent}
-Selected Tools: {tools_text}
-
-Previous Reasoning Steps:
-{chr(10).join(reasoning_steps) if reasoning_steps else "None"}
-
-Available Tools:
-- regulation_search: Search for specific regulations
-- regulation_comparison: Compare regulations between years
-- penalty_lookup: Look up penalties for violations
-- regulation_summary: Create comprehensive summaries
-- general_rag: General regulation questions
-- out_of_scope_handler: Non-regulation questions
-
-Based on the intent classification, explain why you're using the selected tool(s) and what you expect to accomplish."""
-
-            messages = [
-                SystemMessage(content=reasoning_prompt),
-                HumanMessage(content=current_question),
-            ]
-
-            response = self.llm.invoke(messages)
-            reasoning = response.content
+                state["reasoning_steps"].append(f"Selected Tool: {tools[0]}")
+            state["selected_tools"] = tools
 
             # Update state
-            state["reasoning_steps"].append(f"Reasoning: {reasoning}")
+            tools_text = ", ".join(state["selected_tools"])
+            if reasoning:
+                state["reasoning_steps"].append(f"Reasoning: {reasoning}")
             state["reasoning_steps"].append(f"Next Action: {tools_text}")
 
             return state
@@ -311,73 +461,43 @@ Based on the intent classification, explain why you're using the selected tool(s
             if "multi_tool_results" not in state:
                 state["multi_tool_results"] = {}
 
-            # Execute each selected tool
+            # Tools not yet executed (re-entry keeps earlier results)
+            tools = {tool.name: tool for tool in self.tools}
+            pending = []
             for tool_name in selected_tools:
                 if tool_name in state["multi_tool_results"]:
                     # Skip if already executed
                     continue
-
                 state["reasoning_steps"].append(f"Executing tool: {tool_name}")
-
-                # Find and execute the tool
-                tool_result = None
-                for tool in self.tools:
-                    if tool.name == tool_name:
-                        try:
-                            # Parse question and extract parameters based on tool type
-                            if tool_name == "regulation_comparison":
-                                # Extract article number and years from question
-                                import re
-
-                                article_match = re.search(
-                                    r"Article (\d+(?:\.\d+)?)",
-                                    current_question,
-                                    re.IGNORECASE,
-                                )
-                                year_matches = re.findall(
-                                    r"(20\d{2})", current_question
-                                )
-
-                                if article_match and len(year_matches) >= 2:
-                                    article_number = article_match.group(1)
-                                    year1, year2 = year_matches[0], year_matches[1]
-                                    tool_result = tool._run(
-                                        article_number=article_number,
-                                        year1=year1,
-                                        year2=year2,
-                                    )
-                                else:
-                                    tool_result = f"Could not parse article number and years from: {current_question}"
-
-                            elif tool_name == "penalty_lookup":
-                                # Extract violation type from question
-                                violation_type = "track limits"  # default
-                                if "MGU-K" in current_question:
-                                    violation_type = "MGU-K"
-                                elif "fuel" in current_question.lower():
-                                    violation_type = "fuel flow"
-                                elif "track" in current_question.lower():
-                                    violation_type = "track limits"
-
-                                tool_result = tool._run(violation_type=violation_type)
-
-                            else:
-                                # For other tools, use the question directly
-                                tool_result = tool._run(query=current_question)
-
-                            # Store result
-                            state["multi_tool_results"][tool_name] = tool_result
-                            state["tools_used"].append(tool_name)
-                            state["reasoning_steps"].append(
-                                f"Tool {tool_name} executed successfully"
-                            )
-                            break
-
-                        except Exception as e:
-                            error_msg = f"Error executing {tool_name}: {str(e)}"
-                            state["reasoning_steps"].append(error_msg)
-                            state["multi_tool_results"][tool_name] = error_msg
-                            continue
+                if tool_name in tools:
+                    pending.append(tool_name)
+
+            def run(tool_name: str):
+                # Failures are caught per tool so one error doesn't block the rest
+                try:
+                    return self._run_tool(tools[tool_name], current_question), None
+                except Exception as e:
+                    return None, e
+
+            # Independent tools run concurrently; map() yields results in
+            # selection order so the combined answer is deterministic
+            if len(pending) > 1:
+                outcomes = list(self._tool_executor.map(run, pending))
+            else:
+                outcomes = [run(tool_name) for tool_name in pending]
+
+            for tool_name, (tool_result, error) in zip(pending, outcomes):
+                if error is None:
+                    # Store result
+                    state["multi_tool_results"][tool_name] = tool_result
+                    state["tools_used"].append(tool_name)
+                    state["reasoning_steps"].append(
+                        f"Tool {tool_name} executed successfully"
+                    )
+                else:
+                    error_msg = f"Error executing {tool_name}: {str(error)}"
+                    state["reasoning_steps"].append(error_msg)
+                    state["multi_tool_results"][tool_name] = error_msg
 
             # Combine results if multiple tools were used
             if len(selected_tools) > 1:
@@ -402,6 +522,48 @@ Based on the intent classification, explain why you're using the selected tool(s
             state["reasoning_steps"].append(f"Error in action: {str(e)}")
             return state
 
+    def _run_tool(self, tool: Any, question: str) -> str:
+        """
+        Run one tool, parsing its parameters from the question.
+
+        Args:
+            tool: Tool to execute
+            question: The user's question
+
+        Returns:
+            Tool result
+        """
+        # Parse question and extract parameters based on tool type
+        if tool.name == "regulation_comparison":
+            # Extract article number and years from question
+            article_match = re.search(
+                r"Article (\d+(?:\.\d+)?)", question, re.IGNORECASE
+            )
+            year_matches = re.findall(r"(20\d{2})", question)
+
+            if article_match and len(year_matches) >= 2:
+                return tool._run(
+                    article_number=article_match.group(1),
+                    year1=year_matches[0],
+                    year2=year_matches[1],
+                )
+            return f"Could not parse article number and years from: {question}"
+
+        if tool.name == "penalty_lookup":
+            # Extract violation type from question
+            violation_type = "track limits"  # default
+            if "MGU-K" in question:
+                violation_type = "MGU-K"
+            elif "fuel" in question.lower():
+                violation_type = "fuel flow"
+            elif "track" in question.lower():
+                violation_type = "track limits"
+
+            return tool._run(violation_type=violation_type)
+
+        # For other tools, use the question directly
+        return tool._run(query=question)
+
     def _combine_multi_tool_results(
         self, results: Dict[str, str], question: str
     ) -> str:
@@ -415,26 +577,12 @@ Based on the intent classification, explain why you're using the selected tool(s
                 [f"**{tool_name}**:\n{result}" for tool_name, result in results.items()]
             )
 
-            combination_prompt = f"""You are an expert FIA Formula 1 regulations analyst. Combine the following results from multiple tools into a comprehensive, well-structured answer.
-
-Original Question: {question}
-
-Tool Results:
-{results_text}
-
-Instructions:
-1. Synthesize the information from all tools
-2. Create a coherent, comprehensive answer
-3. Organize the information logically
-4. Highlight key points and relationships
-5. Ensure the answer directly addresses the original question
-6. Use clear headings and structure
-
-Provide a well-organized, comprehensive answer that combines all the information effectively."""
-
             messages = [
-                SystemMessage(content=combination_prompt),
-                HumanMessage(content=question),
+                SystemMessage(content=COMBINE_PROMPT),
+                HumanMessage(
+                    content=f"Original Question: {question}\n\n"
+                    f"Tool Results:\n{results_text}"
+                ),
             ]
 
             response = self.llm.invoke(messages)
@@ -458,20 +606,18 @@ Provide a well-organized, comprehensive answer that combines all the information
 
             if tool_result:
                 # Generate final answer based on tool result
-                final_answer_prompt = f"""Based on the tool result, provide a comprehensive answer to the user's question.
-
-Question: {current_question}
-
-Tool Result: {tool_result}
-
-Provide a clear, well-structured answer that directly addresses the user's question."""
-
                 messages = [
-                    SystemMessage(content=final_answer_prompt),
-                    HumanMessage(content=current_question),
+                    SystemMessage(content=FINAL_ANSWER_PROMPT),
+                    HumanMessage(
+                        content=f"Question: {current_question}\n\n"
+                        f"Tool Result: {tool_result}"
+                    ),
                 ]
 
-                response = self.llm.invoke(messages)
+                # Tagged so stream_query() can pick these tokens out of the stream
+                response = self.llm.invoke(
+                    messages, config={"metadata": {"fia_stage": "final_answer"}}
+                )
                 final_answer = response.content
 
                 state["final_answer"] = final_answer
@@ -518,21 +664,8 @@ Provide a clear, well-structured answer that directly addresses the user's quest
                 return "end"
 
             # Check result quality using LLM
-            quality_prompt = f"""You are a quality assessor for an AI agent. Your job is to decide whether an answer is good enough or needs improvement.
-
-Question: {current_question}
-
-Answer: {tool_result}
-
-Evaluate the answer quality:
-- If the answer is incomplete, inaccurate, unclear, or lacks specificity, return: CONTINUE
-- If the answer is complete, accurate, clear, and specific, return: END
-
-IMPORTANT: You must respond with ONLY one word: either "CONTINUE" or "END"
-Do not provide explanations, scores, or detailed analysis."""
-
             messages = [
-                SystemMessage(content=quality_prompt),
+                SystemMessage(content=QUALITY_PROMPT),
                 HumanMessage(
                     content=f"Question: {current_question}\nAnswer: {tool_result}"
                 ),
@@ -582,62 +715,204 @@ Do not provide explanations, scores, or detailed analysis."""
             state["reasoning_steps"].append(f"Error in quality assessment: {str(e)}")
             return "end"  # Default to end on error
 
-    def query(self, question: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+    def _initial_state(
+        self,
+        question: str,
+        session_id: Optional[str] = None,
+        question_vector: Optional[Any] = None,
+    ) -> AgentState:
+        """Build the starting graph state for a question."""
+        return AgentState(
+            messages=[],
+            current_question=question,
+            reasoning_steps=[],
+            tools_used=[],
+            selected_tools=[],
+            final_answer=None,
+            sources=[],
+            session_id=session_id or f"session_{datetime.now().isoformat()}",
+            tool_result=None,
+            multi_tool_results={},
+            question_vector=question_vector,
+        )
+
+    def _format_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Format the final graph state as an agent response."""
+        return {
+            "answer": result.get("final_answer", "No answer generated"),
+            "reasoning_steps": result.get("reasoning_steps", []),
+            "tools_used": result.get("tools_used", []),
+            "sources": result.get("sources", []),
+            "session_id": result.get("session_id"),
+            "metadata": {
+                "model": self.model_name,
+                "timestamp": datetime.now().isoformat(),
+                "reasoning_steps_count": len(result.get("reasoning_steps", [])),
+            },
+        }
+
+    def _error_response(
+        self, error: Exception, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Format an agent response for a failed query."""
+        return {
+            "answer": f"Error processing your question: {str(error)}",
+            "reasoning_steps": [],
+            "tools_used": [],
+            "sources": [],
+            "session_id": session_id,
+            "metadata": {"error": str(error)},
+        }
+
+    def query(
+        self,
+        question: str,
+        session_id: Optional[str] = None,
+        question_vector: Optional[Any] = None,
+    ) -> Dict[str, Any]:
         """
         Query the agent with a question.
 
         Args:
             question: The question to ask
             session_id: Optional session ID for tracking
+            question_vector: Normalised question embedding a caller already
+                computed with the retriever's embeddings (skips re-embedding)
 
         Returns:
             Agent response with reasoning and sources
         """
         try:
-            # Initialize state
-            state = AgentState(
-                messages=[],
-                current_question=question,
-                reasoning_steps=[],
-                tools_used=[],
-                selected_tools=[],
-                final_answer=None,
-                sources=[],
-                session_id=session_id or f"session_{datetime.now().isoformat()}",
-                tool_result=None,
-                multi_tool_results={},
+            # Repeated or paraphrased questions skip the graph entirely
+            vector = question_vector
+            if vector is None and self.query_cache is not None:
+                vector = self.query_cache.embed(question)
+            if vector is not None and self.query_cache is not None:
+                cached = self.query_cache.lookup(vector, question)
+                if cached is not None:
+                    logger.info(f"Semantic cache hit for: '{question[:50]}...'")
+                    cached["session_id"] = (
+                        session_id or f"session_{datetime.now().isoformat()}"
+                    )
+                    cached["metadata"]["cache_hit"] = True
+                    return cached
+
+            # Run the agent graph; the intent router reuses the cache's embedding
+            result = self.agent_graph.invoke(
+                self._initial_state(question, session_id, vector)
             )
 
-            # Run the agent graph
-            result = self.agent_graph.invoke(state)
-
-            # Format response
-            response = {
-                "answer": result.get("final_answer", "No answer generated"),
-                "reasoning_steps": result.get("reasoning_steps", []),
-                "tools_used": result.get("tools_used", []),
-                "sources": result.get("sources", []),
-                "session_id": result.get("session_id"),
-                "metadata": {
-                    "model": self.model_name,
-                    "timestamp": datetime.now().isoformat(),
-                    "reasoning_steps_count": len(result.get("reasoning_steps", [])),
-                },
-            }
+            response = self._format_response(result)
+            # Nodes catch their own failures, so check the answer before caching
+            if (
+                vector is not None
+                and self.query_cache is not None
+                and not is_degraded_response(response)
+            ):
+                self.query_cache.add(question, vector, response)
 
             logger.info(f"Agent query completed for: '{question[:50]}...'")
             return response
 
         except Exception as e:
             logger.error(f"Error in agent query: {str(e)}")
-            return {
-                "answer": f"Error processing your question: {str(e)}",
-                "reasoning_steps": [],
-                "tools_used": [],
-                "sources": [],
-                "session_id": session_id,
-                "metadata": {"error": str(e)},
-            }
+            return self._error_response(e, session_id)
+
+    def query_batch(
+        self, questions: List[str], max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the agent with several independent questions in one batch.
+
+        Each question still runs the full reason/act/reflect graph; the graph's
+        batch runner executes up to ``max_concurrency`` of them at a time.
+
+        Args:
+            questions: Questions to ask
+            max_concurrency: Maximum number of questions in flight at once
+
+        Returns:
+            One agent response per question, in order (failed questions get
+            the standard error response)
+        """
+        if not questions:
+            return []
+
+        try:
+            results = self.agent_graph.batch(
+                [self._initial_state(question) for question in questions],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+        except Exception as e:
+            logger.error(f"Error in agent batch query: {str(e)}")
+            return [self._error_response(e) for _ in questions]
+
+        responses = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in agent batch query: {str(result)}")
+                responses.append(self._error_response(result))
+            else:
+                responses.append(self._format_response(result))
+
+        logger.info(f"Agent batch query completed for {len(questions)} questions")
+        return responses
+
+    def stream_query(
+        self,
+        question: str,
+        on_token: Callable[[str], None],
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query the agent, streaming final-answer tokens as they are generated.
+
+        If the agent refines its answer, each draft is streamed in turn.
+
+        Args:
+            question: The question to ask
+            on_token: Called with each final-answer token
+            session_id: Optional session ID for tracking
+
+        Returns:
+            Agent response with reasoning and sources (same shape as query)
+        """
+        try:
+            result = {}
+            for mode, event in self.agent_graph.stream(
+                self._initial_state(question, session_id),
+                stream_mode=["messages", "values"],
+            ):
+                if mode == "messages":
+                    chunk, metadata = event
+                    if metadata.get("fia_stage") == "final_answer" and chunk.content:
+                        on_token(chunk.content)
+                else:
+                    result = event
+
+            response = self._format_response(result)
+
+            logger.info(f"Agent stream query completed for: '{question[:50]}...'")
+            return response
+
+        except Exception as e:
+            logger.error(f"Error in agent stream query: {str(e)}")
+            return self._error_response(e, session_id)
+
+    def clear_cache(self):
+        """Clear the semantic response cache."""
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get semantic response cache statistics.
+
+        Returns:
+            Cache size, hits, misses and hit rate (empty if caching is disabled)
+        """
+        return self.query_cache.get_stats() if self.query_cache is not None else {}
 
     def get_available_tools(self) -> List[Dict[str, str]]:
         """Get information about available tools."""
@@ -0,0 +1,228 @@
+"""
+Embedding-based Intent Router for the FIA Agent
+
+This module classifies questions into the agent's intent categories by
+comparing the question embedding with per-intent centroids of example
+phrases, so most questions are routed without an LLM call.
+
+Features:
+- Nearest-centroid classification by cosine similarity
+- Ambiguous questions (low similarity, or a near-tie between two intents)
+  are left to the LLM classifier
+- Accepts a precomputed question embedding so callers embed only once
+- Centroids are persisted on disk, keyed by embedding model and exemplars
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "fia_rag"
+
+# Example phrasings for each intent; centroids are the mean of their embeddings
+INTENT_EXEMPLARS = MappingProxyType(
+    {
+        "COMPARISON": (
+            "Compare Article 5 between 2024 and 2025",
+            "What are the differences between the 2025 and 2026 regulations?",
+            "How did the power unit rules change from 2024 to 2025?",
+            "What changed in the technical regulations this year?",
+            "Compare the sporting regulations across years",
+        ),
+        "PENALTY": (
+            "What are the penalties for track limits violations?",
+            "What happens if a team exceeds the fuel flow limit?",
+            "What sanctions apply for an unsafe release?",
+            "What is the penalty for using too many MGU-K units?",
+            "How are drivers punished for causing a collision?",
+        ),
+        "SEARCH": (
+            "Find Article 12 on the survival cell",
+            "What are the requirements for the fuel system?",
+            "Search for the engine regulations",
+            "What does the regulation say about tyre usage?",
+            "Which article covers the minimum car weight?",
+        ),
+        "SUMMARY": (
+            "Summarize the safety requirements for F1 cars",
+            "Give me a comprehensive overview of the power unit rules",
+            "Provide a summary of the financial regulations",
+            "Summarize all rules about pit stops",
+            "Create a comprehensive analysis of the aerodynamic regulations",
+        ),
+        "GENERAL": (
+            "What are the rules of Formula 1?",
+            "Explain how the F1 regulations work",
+            "How does qualifying work?",
+            "What is the cost cap?",
+            "Tell me about the FIA regulations",
+        ),
+        "MULTI_TOOL": (
+            "What are the safety requirements and the penalties for violating them?",
+            "Compare the engine rules between 2024 and 2025 and summarize the changes",
+            "Find the fuel regulations and the penalties for breaching them",
+            "Summarize the tyre rules and list the sanctions for breaking them",
+            "What does Article 5 require and what happens if a team violates it?",
+        ),
+        "OUT_OF_SCOPE": (
+            "What is the weather today?",
+            "Give me a recipe for pasta",
+            "Who won the football match last night?",
+            "What is the capital of France?",
+            "Recommend a good movie",
+        ),
+    }
+)
+
+
+class IntentRouter:
+    """Nearest-centroid intent classifier over question embeddings."""
+
+    def __init__(
+        self,
+        embeddings,
+        min_similarity: float = 0.35,
+        min_margin: float = 0.02,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    ):
+        """
+        Initialize the intent router.
+
+        Args:
+            embeddings: LangChain embeddings object used for questions and exemplars
+            min_similarity: Minimum cosine similarity to the best centroid;
+                below it the question is treated as ambiguous
+            min_margin: Minimum lead of the best centroid over the runner-up;
+                closer calls are treated as ambiguous
+            cache_dir: Directory for the persisted centroids; None disables it
+        """
+        self.embeddings = embeddings
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.intents = tuple(INTENT_EXEMPLARS)
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _cache_path(self) -> Optional[Path]:
+        """Centroid file for this embedding model and exemplar set."""
+        if self.cache_dir is None:
+            return None
+        model = getattr(self.embeddings, "model", "")
+        dimensions = getattr(self.embeddings, "dimensions", None)
+        key = json.dumps(
+            [model, dimensions, {k: list(v) for k, v in INTENT_EXEMPLARS.items()}]
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return self.cache_dir / f"intent_centroids_{digest}.npy"
+
+    def _load_centroids(self) -> np.ndarray:
+        """Load the persisted centroids, or embed the exemplars once."""
+        with self._lock:
+            if self._centroids is not None:
+                return self._centroids
+
+            path = self._cache_path()
+            if path is not None and path.exists():
+                try:
+                    self._centroids = np.load(path)
+                    return self._centroids
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable intent centroids {path}: {e}")
+
+            # One batched embedding call for every exemplar
+            texts = [
+                text for intent in self.intents for text in INTENT_EXEMPLARS[intent]
+            ]
+            vectors = np.asarray(
+                self.embeddings.embed_documents(texts), dtype=np.float32
+            )
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+            centroids = []
+            start = 0
+            for intent in self.intents:
+                end = start + len(INTENT_EXEMPLARS[intent])
+                centroids.append(vectors[start:end].mean(axis=0))
+                start = end
+            centroids = np.stack(centroids)
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+
+            if path is not None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    np.save(path, centroids)
+                except Exception as e:
+                    logger.warning(f"Could not cache intent centroids {path}: {e}")
+
+            self._centroids = centroids
+            return centroids
+
+    def embed(self, question: str) -> Optional[np.ndarray]:
+        """
+        Embed a question for classify_vector.
+
+        Args:
+            question: The question to embed
+
+        Returns:
+            Question embedding, or None if embedding failed
+        """
+        try:
+            return np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Intent routing unavailable: {str(e)}")
+            return None
+
+    def classify(self, question: str) -> Optional[str]:
+        """
+        Classify a question by its nearest intent centroid.
+
+        Args:
+            question: The question to classify
+
+        Returns:
+            Intent category, or None if the question is ambiguous or the
+            embeddings are unavailable
+        """
+        vector = self.embed(question)
+        return self.classify_vector(vector) if vector is not None else None
+
+    def classify_vector(self, vector: np.ndarray) -> Optional[str]:
+        """
+        Classify an already embedded question by its nearest intent centroid.
+
+        Args:
+            vector: Question embedding (normalised or not)
+
+        Returns:
+            Intent category, or None if the question is ambiguous or the
+            centroids are unavailable
+        """
+        try:
+            centroids = self._load_centroids()
+        except Exception as e:
+            logger.warning(f"Intent routing unavailable: {str(e)}")
+            return None
+
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm or vector.shape[0] != centroids.shape[1]:
+            return None
+
+        similarities = centroids @ (vector / norm)
+        runner_up, best = np.argsort(similarities)[-2:]
+        if similarities[best] < self.min_similarity:
+            return None
+        if similarities[best] - similarities[runner_up] < self.min_margin:
+            return None
+        return self.intents[int(best)]
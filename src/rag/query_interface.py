@@ -39,6 +39,7 @@ class FIAQueryInterface:
         regulation_type_filter: Optional[str] = None,
         use_compression: bool = False,
         include_sources: bool = True,
+        query_embedding: Optional[List[float]] = None,
     ) -> Dict[str, Any]:
         """
         Ask a question with optional filtering and formatting.
@@ -49,6 +50,7 @@ class FIAQueryInterface:
             regulation_type_filter: Filter by regulation type
             use_compression: Whether to use compressed retrieval
             include_sources: Whether to include source information
+            query_embedding: Precomputed embedding of the question
 
         Returns:
             Formatted response with answer, sources, and metadata
@@ -59,6 +61,7 @@ class FIAQueryInterface:
             year_filter=year_filter,
             regulation_type_filter=regulation_type_filter,
             use_compression=use_compression,
+            query_embedding=query_embedding,
         )
 
         # Add to conversation history
@@ -12,7 +12,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
-from .retriever import FIAAdvancedRetriever
+from .retriever import EMBEDDING_DIMENSIONS, FIAAdvancedRetriever
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,7 @@ class FIARAGPipeline:
         openai_api_key: str,
         pinecone_api_key: str,
         model_name: str = "gpt-4-mini",
+        embedding_dimensions: int = EMBEDDING_DIMENSIONS,
     ):
         """
         Initialize the RAG pipeline.
@@ -37,6 +38,7 @@ class FIARAGPipeline:
             openai_api_key: OpenAI API key
             pinecone_api_key: Pinecone API key
             model_name: LLM model name
+            embedding_dimensions: Embedding size; must match the Pinecone index
         """
         self.index_name = index_name
 
@@ -45,6 +47,7 @@ class FIARAGPipeline:
             index_name=index_name,
             openai_api_key=openai_api_key,
             pinecone_api_key=pinecone_api_key,
+            dimensions=embedding_dimensions,
         )
 
         # Initialize LLM
@@ -94,6 +97,7 @@ Please use the ReAct methodology to provide a detailed, well-reasoned answer:"""
         year_filter: Optional[str] = None,
         regulation_type_filter: Optional[str] = None,
         use_compression: bool = False,
+        query_embedding: Optional[List[float]] = None,
     ) -> Dict[str, Any]:
         """
         Query the RAG pipeline with a question.
@@ -104,6 +108,7 @@ Please use the ReAct methodology to provide a detailed, well-reasoned answer:"""
             year_filter: Filter by year
             regulation_type_filter: Filter by regulation type
             use_compression: Whether to use compressed retrieval
+            query_embedding: Precomputed embedding of the question
 
         Returns:
             Dictionary containing answer, sources, and metadata
@@ -118,6 +123,7 @@ Please use the ReAct methodology to provide a detailed, well-reasoned answer:"""
                     k=k,
                     year_filter=year_filter,
                     regulation_type_filter=regulation_type_filter,
+                    query_embedding=query_embedding,
                 )
 
             if not retrieved_docs:
@@ -6,6 +6,7 @@ with metadata filtering for precise regulation retrieval.
 """
 
 import logging
+import os
 from typing import Any, Dict, List, Optional
 
 from langchain.retrievers import ContextualCompressionRetriever
@@ -15,6 +16,9 @@ from langchain_pinecone import PineconeVectorStore
 
 logger = logging.getLogger(__name__)
 
+# Must match the width scripts/vectorize_data.py built the Pinecone index with
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "512"))
+
 
 class FIAAdvancedRetriever:
     """
@@ -27,6 +31,7 @@ class FIAAdvancedRetriever:
         openai_api_key: str,
         pinecone_api_key: str,
         model_name: str = "text-embedding-3-small",
+        dimensions: int = EMBEDDING_DIMENSIONS,
     ):
         """
         Initialize the advanced retriever.
@@ -36,12 +41,13 @@ class FIAAdvancedRetriever:
             openai_api_key: OpenAI API key
             pinecone_api_key: Pinecone API key
             model_name: Embedding model name
+            dimensions: Embedding size; must match the Pinecone index dimension
         """
         self.index_name = index_name
 
         # Initialize embeddings
         self.embeddings = OpenAIEmbeddings(
-            openai_api_key=openai_api_key, model=model_name
+            openai_api_key=openai_api_key, model=model_name, dimensions=dimensions
         )
 
         # Initialize vector store
@@ -69,6 +75,7 @@ class FIAAdvancedRetriever:
         k: int = 5,
         year_filter: Optional[str] = None,
         regulation_type_filter: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve documents with metadata filtering and enhanced context.
@@ -78,6 +85,7 @@ class FIAAdvancedRetriever:
             k: Number of results to return
             year_filter: Filter by specific year (e.g., "2024", "2025")
             regulation_type_filter: Filter by regulation type (e.g., "sporting", "technical")
+            query_embedding: Precomputed embedding of the query (skips embedding it)
 
         Returns:
             List of retrieved documents with enhanced metadata
@@ -91,12 +99,15 @@ class FIAAdvancedRetriever:
                 filter_dict["regulation_type"] = regulation_type_filter
 
             # Perform similarity search with optional filtering
-            if filter_dict:
-                results = self.vectorstore.similarity_search_with_score(
-                    query, k=k, filter=filter_dict
+            search_kwargs = {"filter": filter_dict} if filter_dict else {}
+            if query_embedding is not None:
+                results = self.vectorstore.similarity_search_by_vector_with_score(
+                    query_embedding, k=k, **search_kwargs
                 )
             else:
-                results = self.vectorstore.similarity_search_with_score(query, k=k)
+                results = self.vectorstore.similarity_search_with_score(
+                    query, k=k, **search_kwargs
+                )
 
             # Format results with enhanced metadata
             formatted_results = []
@@ -181,6 +192,8 @@ class FIAAdvancedRetriever:
             citation_parts.append(f"Section {section}")
         if article:
             citation_parts.append(f"Article {article}")
+        if metadata.get("page_number"):
+            citation_parts.append(f"Page {int(metadata['page_number'])}")
 
         return ", ".join(citation_parts)
 
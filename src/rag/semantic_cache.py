@@ -0,0 +1,210 @@
+"""
+Semantic Response Cache for the FIA Agent
+
+This module keeps recent agent responses in memory, keyed by the embedding of
+the question, so repeated questions and close paraphrases of them are answered
+without re-running the reason/act/reflect graph.
+
+Features:
+- Cosine-similarity lookup over normalised question embeddings
+- Least-recently-used eviction once the cache is full
+- Entries expire after a TTL (default: one hour)
+- Paraphrases citing different articles, sections or years never match
+- Hit/miss counters for monitoring the hit rate
+"""
+
+import copy
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Article/section numbers and years ("Article 3.2 (2024)" -> {"3.2", "2024"})
+REFERENCE_PATTERN = re.compile(r"\d+(?:\.\d+)*")
+
+# Answers the agent graph falls back to when a node fails
+DEGRADED_ANSWER_PREFIXES = (
+    "Error processing your question",
+    "I was unable to process your question",
+    "No answer generated",
+)
+
+# Reasoning steps recorded by a node that caught its own exception
+DEGRADED_STEP_PREFIXES = ("Error in ", "Error executing ", "Error: ")
+
+
+def question_references(question: str) -> FrozenSet[str]:
+    """
+    Extract the article, section and year references of a question.
+
+    Args:
+        question: The question text
+
+    Returns:
+        Set of numeric reference tokens
+    """
+    return frozenset(REFERENCE_PATTERN.findall(question))
+
+
+def is_degraded_response(response: Dict[str, Any]) -> bool:
+    """
+    Check whether an agent response came from a failed or partial run.
+
+    Args:
+        response: Agent response as returned by FIAAgent.query
+
+    Returns:
+        True if the response must not be cached or reused
+    """
+    if response.get("metadata", {}).get("error"):
+        return True
+    answer = response.get("answer")
+    if not answer or str(answer).startswith(DEGRADED_ANSWER_PREFIXES):
+        return True
+    return any(
+        str(step).startswith(DEGRADED_STEP_PREFIXES)
+        for step in response.get("reasoning_steps", [])
+    )
+
+
+class SemanticQueryCache:
+    """In-process, embedding-keyed cache of agent responses."""
+
+    def __init__(
+        self,
+        embeddings,
+        threshold: float = 0.92,
+        max_size: int = 512,
+        ttl_seconds: float = 3600,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embeddings: LangChain embeddings object used to key questions
+            threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum number of cached responses
+            ttl_seconds: Maximum age of a cached response
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        # question -> (normalised embedding, response, timestamp, references),
+        # oldest first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> Optional[np.ndarray]:
+        """
+        Embed and L2-normalise a question.
+
+        Args:
+            question: The question to embed
+
+        Returns:
+            Normalised embedding, or None if embedding failed
+        """
+        try:
+            vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic cache disabled for this query: {str(e)}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(
+        self, vector: np.ndarray, question: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar fresh cached response.
+
+        Args:
+            vector: Normalised question embedding
+            question: The question text; when given, a cached response only
+                matches if it cites the same articles, sections and years
+
+        Returns:
+            Copy of the cached response, or None on a miss
+        """
+        with self._lock:
+            # Drop expired entries
+            cutoff = time.time() - self.ttl_seconds
+            for expired in [
+                q for q, entry in self._entries.items() if entry[2] < cutoff
+            ]:
+                del self._entries[expired]
+
+            if self._entries:
+                questions = list(self._entries)
+                matrix = np.stack([entry[0] for entry in self._entries.values()])
+                if matrix.shape[1] == vector.shape[0]:
+                    similarities = matrix @ vector
+                    references = (
+                        question_references(question) if question is not None else None
+                    )
+                    # Most similar first; stop at the first one below threshold
+                    for index in np.argsort(-similarities):
+                        if similarities[index] < self.threshold:
+                            break
+                        entry = self._entries[questions[index]]
+                        if references is not None and entry[3] != references:
+                            continue
+                        self.hits += 1
+                        self._entries.move_to_end(questions[index])
+                        return copy.deepcopy(entry[1])
+
+            self.misses += 1
+            return None
+
+    def add(self, question: str, vector: np.ndarray, response: Dict[str, Any]):
+        """
+        Cache a response, evicting the least recently used entry when full.
+
+        Args:
+            question: The question that was answered
+            vector: Normalised question embedding
+            response: Agent response to cache
+        """
+        with self._lock:
+            self._entries[question] = (
+                vector,
+                copy.deepcopy(response),
+                time.time(),
+                question_references(question),
+            )
+            self._entries.move_to_end(question)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached response and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Cache size, hit and miss counts, and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
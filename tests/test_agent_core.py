@@ -0,0 +1,188 @@
+"""
+Tests for core agent query entry points.
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from rag.semantic_cache import SemanticQueryCache
+
+
+class TestStreamQuery:
+    """Test cases for streaming agent queries."""
+
+    def test_stream_query_forwards_final_answer_tokens(self, fia_agent):
+        """Test that only final-answer tokens reach the callback."""
+        final_state = {
+            "final_answer": "Fire extinguishers",
+            "reasoning_steps": ["Intent Classification: SEARCH"],
+            "tools_used": ["regulation_search"],
+            "sources": [],
+            "session_id": "test_session",
+        }
+        events = [
+            ("messages", (Mock(content="SEARCH"), {"langgraph_node": "reason"})),
+            ("messages", (Mock(content="Fire "), {"fia_stage": "final_answer"})),
+            (
+                "messages",
+                (Mock(content="extinguishers"), {"fia_stage": "final_answer"}),
+            ),
+            ("values", final_state),
+        ]
+        tokens = []
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.stream.return_value = iter(events)
+            response = fia_agent.stream_query("Safety?", on_token=tokens.append)
+
+        assert tokens == ["Fire ", "extinguishers"]
+        assert response["answer"] == "Fire extinguishers"
+        assert response["tools_used"] == ["regulation_search"]
+        assert response["session_id"] == "test_session"
+
+    def test_stream_query_error_response(self, fia_agent):
+        """Test that streaming failures return the standard error response."""
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.stream.side_effect = Exception("Graph error")
+            response = fia_agent.stream_query("Safety?", on_token=lambda token: None)
+
+        assert "Graph error" in response["answer"]
+        assert response["metadata"]["error"] == "Graph error"
+
+
+class TestQueryBatch:
+    """Test cases for batched agent queries."""
+
+    def test_query_batch_keeps_order_and_isolates_failures(self, fia_agent):
+        """Test that one failing question doesn't affect the rest of the batch."""
+        results = [
+            {"final_answer": "Answer A", "session_id": "a"},
+            Exception("LLM timeout"),
+        ]
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.batch.return_value = results
+            responses = fia_agent.query_batch(["A?", "B?"], max_concurrency=4)
+
+        states = mock_graph.batch.call_args.args[0]
+        assert [state["current_question"] for state in states] == ["A?", "B?"]
+        assert mock_graph.batch.call_args.kwargs["config"] == {"max_concurrency": 4}
+        assert responses[0]["answer"] == "Answer A"
+        assert responses[1]["metadata"]["error"] == "LLM timeout"
+
+
+class TestSemanticCache:
+    """Test cases for the semantic response cache in query()."""
+
+    def test_paraphrased_question_is_answered_from_cache(self, fia_agent):
+        """Test that a similar question reuses the cached response."""
+        vectors = {
+            "Track limits penalty?": [1.0, 0.0],
+            "Penalty for track limits?": [0.99, 0.05],
+            "Fuel flow limit?": [0.0, 1.0],
+        }
+        embeddings = Mock()
+        embeddings.embed_query.side_effect = vectors.get
+        fia_agent.query_cache = SemanticQueryCache(embeddings, threshold=0.92)
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.invoke.return_value = {"final_answer": "Five seconds"}
+            first = fia_agent.query("Track limits penalty?")
+            second = fia_agent.query("Penalty for track limits?", session_id="s2")
+            fia_agent.query("Fuel flow limit?")
+
+        assert mock_graph.invoke.call_count == 2
+        assert second["answer"] == first["answer"] == "Five seconds"
+        assert second["session_id"] == "s2"
+        assert second["metadata"]["cache_hit"] is True
+        assert "cache_hit" not in first["metadata"]
+        assert fia_agent.get_cache_stats() == {
+            "size": 2,
+            "hits": 1,
+            "misses": 2,
+            "hit_rate": 1 / 3,
+        }
+
+    def test_failed_queries_are_not_cached(self, fia_agent):
+        """Test that errors are never served from the cache."""
+        embeddings = Mock()
+        embeddings.embed_query.return_value = [1.0, 0.0]
+        fia_agent.query_cache = SemanticQueryCache(embeddings)
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.invoke.side_effect = Exception("LLM timeout")
+            fia_agent.query("Track limits penalty?")
+            fia_agent.query("Track limits penalty?")
+
+        assert mock_graph.invoke.call_count == 2
+
+    def test_node_failures_are_not_cached(self, fia_agent):
+        """Test that answers from a node that caught its own error are not cached."""
+        embeddings = Mock()
+        embeddings.embed_query.return_value = [1.0, 0.0]
+        fia_agent.query_cache = SemanticQueryCache(embeddings)
+        fia_agent.intent_router = None
+        fia_agent.reasoner = Mock()
+        fia_agent.reasoner.invoke.return_value = Mock(
+            intent="SEARCH", selected_tools=["regulation_search"], reasoning="Search"
+        )
+        for tool in fia_agent.tools:
+            tool._run = Mock(side_effect=Exception("Pinecone unavailable"))
+        fia_agent.llm.invoke.side_effect = Exception("LLM timeout")
+
+        first = fia_agent.query("Track limits penalty?")
+        second = fia_agent.query("Track limits penalty?")
+
+        assert first["answer"].startswith("Error processing your question")
+        assert "cache_hit" not in second["metadata"]
+        assert fia_agent.get_cache_stats()["size"] == 0
+
+    def test_different_article_or_year_is_a_miss(self, fia_agent):
+        """Test that near-identical questions citing other references miss."""
+        embeddings = Mock()
+        embeddings.embed_query.return_value = [1.0, 0.0]
+        fia_agent.query_cache = SemanticQueryCache(embeddings, threshold=0.92)
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.invoke.return_value = {"final_answer": "Article 3.2 says..."}
+            fia_agent.query("What does Article 3.2 (2024) say?")
+            fia_agent.query("What does Article 3.5 (2025) say?")
+            repeat = fia_agent.query("What does article 3.2 (2024) say?")
+
+        assert mock_graph.invoke.call_count == 2
+        assert repeat["metadata"]["cache_hit"] is True
+
+    def test_expiry_keeps_the_reference_guard(self):
+        """Test that dropping expired entries doesn't bypass the reference check."""
+        cache = SemanticQueryCache(Mock(), threshold=0.92, ttl_seconds=60)
+        vector = np.array([1.0, 0.0], dtype=np.float32)
+        cache.add("What does Article 5 (2024) say?", vector, {"answer": "Five"})
+        cache.add("Explain Article 5 (2024)", vector, {"answer": "Old five"})
+        # Age the second entry past the TTL
+        expired = cache._entries["Explain Article 5 (2024)"]
+        cache._entries["Explain Article 5 (2024)"] = (
+            expired[0],
+            expired[1],
+            expired[2] - 120,
+            expired[3],
+        )
+
+        assert cache.lookup(vector, "What does Article 7 (2024) say?") is None
+        assert cache.get_stats()["size"] == 1
+        hit = cache.lookup(vector, "What does Article 5 (2024) say?")
+        assert hit["answer"] == "Five"
+
+    def test_precomputed_vector_is_not_re_embedded(self, fia_agent):
+        """Test that a caller-supplied question embedding is reused."""
+        embeddings = Mock()
+        fia_agent.query_cache = SemanticQueryCache(embeddings)
+        vector = np.array([1.0, 0.0], dtype=np.float32)
+
+        with patch.object(fia_agent, "agent_graph") as mock_graph:
+            mock_graph.invoke.return_value = {"final_answer": "Five seconds"}
+            fia_agent.query("Track limits penalty?", question_vector=vector)
+
+        embeddings.embed_query.assert_not_called()
+        state = mock_graph.invoke.call_args.args[0]
+        assert state["question_vector"] is vector
@@ -0,0 +1,64 @@
+"""
+Tests for the evaluation dataset builders.
+"""
+
+from unittest.mock import patch
+
+from evaluation.dataset import FIAEvaluationDataset
+
+
+class TestDatasetCache:
+    """Test cases for the on-disk Arrow dataset cache."""
+
+    def test_cached_datasets_match_built_datasets(self, tmp_path):
+        """Test that a warm start loads the same rows without rebuilding."""
+        built = FIAEvaluationDataset(cache_dir=tmp_path).create_comprehensive_dataset()
+
+        creator = FIAEvaluationDataset(cache_dir=tmp_path)
+        with patch.object(creator, "_build_all") as mock_build_all:
+            loaded = creator.create_comprehensive_dataset()
+
+        mock_build_all.assert_not_called()
+        assert list(loaded) == list(built)
+        for name, dataset in built.items():
+            assert loaded[name].to_list() == dataset.to_list()
+
+
+class TestLazyDatasets:
+    """Test cases for on-demand dataset construction."""
+
+    def test_only_accessed_dataset_is_built(self):
+        """Test that reading one tool's dataset doesn't build the others."""
+        creator = FIAEvaluationDataset()
+        datasets = creator.create_comprehensive_dataset()
+
+        assert len(datasets["penalty_lookup"]) == 2
+        assert list(creator._cache) == ["create_penalty_lookup_dataset"]
+        assert list(datasets) == [
+            "regulation_search",
+            "regulation_comparison",
+            "penalty_lookup",
+            "regulation_summary",
+            "general_rag",
+            "out_of_scope",
+        ]
+
+    def test_dataset_info_matches_built_datasets(self):
+        """Test that the literal-based summary matches the Arrow datasets."""
+        creator = FIAEvaluationDataset()
+
+        info = creator.get_dataset_info()
+
+        assert creator._cache == {}
+        assert info == creator.get_dataset_info(materialize=True)
+
+    def test_streaming_datasets_yield_same_rows(self):
+        """Test that streaming datasets yield the eager datasets' rows."""
+        creator = FIAEvaluationDataset()
+
+        streamed = creator.create_comprehensive_dataset(streaming=True)
+        eager = creator.create_comprehensive_dataset()
+
+        assert list(streamed) == list(eager)
+        for name, dataset in streamed.items():
+            assert list(dataset) == eager[name].to_list()
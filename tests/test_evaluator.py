@@ -0,0 +1,426 @@
+"""
+Tests for the RAGAS evaluator orchestration.
+"""
+
+import gzip
+import json
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+from datasets import Dataset
+from langchain_core.embeddings import Embeddings
+
+from evaluation.evaluator import TOOL_METRICS, FIAAgentEvaluator
+
+
+@pytest.fixture
+def evaluator():
+    """Evaluator wrapping a mock agent."""
+    return FIAAgentEvaluator(Mock())
+
+
+class TestEvaluateAllTools:
+    """Test cases for evaluating every tool dataset."""
+
+    @pytest.mark.parametrize("max_workers", [1, 6])
+    def test_results_keep_dataset_order(self, evaluator, max_workers):
+        """Test that results are keyed in dataset order regardless of workers."""
+        with patch.object(
+            evaluator, "evaluate_tool", side_effect=lambda name, ds, mt: mt
+        ):
+            results = evaluator.evaluate_all_tools(max_workers=max_workers)
+
+        tool_names = [name for name in results if name != "comprehensive_report"]
+        assert tool_names == list(TOOL_METRICS)
+        for tool_name in tool_names:
+            assert results[tool_name] == TOOL_METRICS[tool_name]
+        assert "comprehensive_report" in results
+
+    def test_worker_exception_becomes_error_result(self, evaluator):
+        """Test that a failing tool does not abort the concurrent run."""
+
+        def evaluate_tool(name, dataset, metrics_type):
+            if name == "penalty_lookup":
+                raise RuntimeError("API down")
+            return {}
+
+        with patch.object(evaluator, "evaluate_tool", side_effect=evaluate_tool):
+            results = evaluator.evaluate_all_tools(max_workers=6)
+
+        assert results["penalty_lookup"] == {"error": "API down"}
+        assert results["regulation_search"] == {}
+
+    def test_cached_results_are_not_rerun(self, evaluator):
+        """Test that cached tools are reused and fresh results are reported."""
+        cached = {"penalty_lookup": pd.DataFrame({"faithfulness": [0.8]})}
+        finished = []
+
+        with patch.object(
+            evaluator, "evaluate_tool", return_value={}
+        ) as mock_evaluate_tool:
+            results = evaluator.evaluate_all_tools(
+                max_workers=6,
+                cached_results=cached,
+                on_result=lambda name, dataset, result: finished.append(name),
+            )
+
+        evaluated = [call.args[0] for call in mock_evaluate_tool.call_args_list]
+        assert "penalty_lookup" not in evaluated
+        assert sorted(finished) == sorted(evaluated)
+        assert results["penalty_lookup"] is cached["penalty_lookup"]
+        assert list(results)[:-1] == list(TOOL_METRICS)
+
+
+class TestEvaluateBatch:
+    """Test cases for single-run batch evaluation."""
+
+    def test_scores_are_split_per_tool(self, evaluator):
+        """Test that one RAGAS run is split back into per-tool frames."""
+        row = {"question": "q", "ground_truth": "g", "contexts": ["c"]}
+        datasets = {
+            "regulation_search": Dataset.from_list([row, row]),
+            "penalty_lookup": Dataset.from_list([row]),
+        }
+        ragas_result = Mock()
+        ragas_result.to_pandas.return_value = pd.DataFrame(
+            {"faithfulness": [0.1, 0.2, 0.9]}
+        )
+
+        with (
+            patch.object(
+                evaluator,
+                "_get_agent_responses",
+                side_effect=lambda ds, name: [{"answer": "a"}] * len(ds),
+            ),
+            patch(
+                "evaluation.evaluator.evaluate", return_value=ragas_result
+            ) as mock_evaluate,
+        ):
+            results = evaluator.evaluate_batch(datasets)
+
+        assert mock_evaluate.call_count == 1
+        assert len(mock_evaluate.call_args.kwargs["dataset"]) == 3
+        assert list(results["regulation_search"]["faithfulness"]) == [0.1, 0.2]
+        assert list(results["penalty_lookup"]["faithfulness"]) == [0.9]
+        assert evaluator.evaluation_results["penalty_lookup"]["dataset_size"] == 1
+
+    def test_fully_failed_tools_are_reported(self, evaluator):
+        """Test that a tool whose queries all failed is kept, with run settings."""
+        row = {"question": "q", "ground_truth": "g", "contexts": ["c"]}
+        datasets = {
+            "regulation_search": Dataset.from_list([row]),
+            "penalty_lookup": Dataset.from_list([row, row]),
+        }
+        ragas_result = Mock()
+        ragas_result.to_pandas.return_value = pd.DataFrame({"faithfulness": [0.4]})
+
+        with (
+            patch.object(
+                evaluator,
+                "_get_agent_responses",
+                side_effect=lambda ds, name: (
+                    [{"answer": "a"}]
+                    if name == "regulation_search"
+                    else [{"error": "LLM timeout"}] * len(ds)
+                ),
+            ),
+            patch(
+                "evaluation.evaluator.evaluate", return_value=ragas_result
+            ) as mock_evaluate,
+        ):
+            results = evaluator.evaluate_batch(datasets, max_workers=4)
+
+        run_config = mock_evaluate.call_args.kwargs["run_config"]
+        assert run_config.max_workers == 4
+        assert run_config.timeout == evaluator.run_config.timeout
+        assert run_config.max_retries == evaluator.run_config.max_retries
+        assert list(results) == ["regulation_search", "penalty_lookup"]
+        assert results["penalty_lookup"] == {"error": "All 2 agent queries failed"}
+        assert evaluator.evaluation_results["penalty_lookup"]["errored_count"] == 2
+
+
+class TestEvaluateTool:
+    """Test cases for single-tool RAGAS runs."""
+
+    def test_ragas_handles_are_shared_across_tools(self, evaluator):
+        """Test that every tool is scored with the same wrapped LLM and embeddings."""
+        row = {"question": "q", "ground_truth": "g", "contexts": ["c"]}
+        dataset = Dataset.from_list([row])
+
+        with (
+            patch.object(
+                evaluator, "_get_agent_responses", return_value=[{"answer": "a"}]
+            ),
+            patch("evaluation.evaluator.evaluate") as mock_evaluate,
+        ):
+            evaluator.evaluate_tool("regulation_search", dataset, "search_focused")
+            evaluator.evaluate_tool("penalty_lookup", dataset, "search_focused")
+
+        for call in mock_evaluate.call_args_list:
+            assert call.kwargs["llm"] is evaluator.ragas_llm
+            assert call.kwargs["embeddings"] is evaluator.ragas_embeddings
+
+    def test_context_relevance_is_scored_on_a_sample(self, evaluator):
+        """Test that ContextRelevance runs on K rows and the rest are NaN."""
+        row = {"question": "q", "ground_truth": "g", "contexts": ["c"]}
+        dataset = Dataset.from_list([row] * 5)
+        full_result = Mock()
+        full_result.to_pandas.return_value = pd.DataFrame({"faithfulness": [1.0] * 5})
+        sample_result = Mock()
+        sample_result.scores = [{"nv_context_relevance": 0.5}] * 2
+
+        with (
+            patch.object(
+                evaluator, "_get_agent_responses", return_value=[{"answer": "a"}] * 5
+            ),
+            patch(
+                "evaluation.evaluator.evaluate",
+                side_effect=[full_result, sample_result],
+            ) as mock_evaluate,
+        ):
+            result = evaluator.evaluate_tool(
+                "regulation_summary",
+                dataset,
+                "summary_focused",
+                context_relevance_sample_size=2,
+            )
+
+        full_call, sample_call = mock_evaluate.call_args_list
+        assert evaluator.context_relevance not in full_call.kwargs["metrics"]
+        assert sample_call.kwargs["metrics"] == [evaluator.context_relevance]
+        assert len(sample_call.kwargs["dataset"]) == 2
+        assert result["nv_context_relevance"].notna().tolist() == [
+            True,
+            False,
+            False,
+            False,
+            True,
+        ]
+        assert evaluator.evaluation_results["regulation_summary"][
+            "sampled_metrics"
+        ] == {"nv_context_relevance": 2}
+
+    def test_invalid_sample_size_is_rejected(self, evaluator):
+        """Test that a ContextRelevance sample size below 1 raises ValueError."""
+        dataset = Dataset.from_list([{"question": "q"}])
+
+        with pytest.raises(ValueError):
+            evaluator.evaluate_tool(
+                "regulation_summary", dataset, context_relevance_sample_size=0
+            )
+        with pytest.raises(ValueError):
+            FIAAgentEvaluator(evaluator.agent, context_relevance_sample_size=-1)
+
+
+class TestGetAgentResponses:
+    """Test cases for collecting agent answers."""
+
+    def test_questions_are_sent_as_one_batch(self, evaluator):
+        """Test that a dataset is answered by one batched agent call."""
+        dataset = Dataset.from_list([{"question": q} for q in ["a", "b", "c"]])
+        evaluator.agent.query_batch.side_effect = lambda questions, **kwargs: [
+            {"answer": question.upper()} for question in questions
+        ]
+
+        responses = evaluator._get_agent_responses(dataset, "regulation_search")
+
+        evaluator.agent.query_batch.assert_called_once_with(
+            ["a", "b", "c"], max_concurrency=evaluator.query_workers
+        )
+        assert [r["answer"] for r in responses] == ["A", "B", "C"]
+        assert responses[0]["sources"] == []
+
+    def test_cached_responses_skip_the_agent(self, tmp_path):
+        """Test that only uncached, successful responses are stored and reused."""
+        evaluator = FIAAgentEvaluator(Mock(), response_cache_dir=tmp_path)
+        dataset = Dataset.from_list([{"question": q} for q in ["a", "b"]])
+        evaluator.agent.query_batch.return_value = [
+            {"answer": "A"},
+            {"answer": "Error", "metadata": {"error": "LLM timeout"}},
+        ]
+        evaluator._get_agent_responses(dataset, "regulation_search")
+
+        # A fresh evaluator reads the disk cache, not the in-run memo
+        evaluator = FIAAgentEvaluator(evaluator.agent, response_cache_dir=tmp_path)
+        evaluator.agent.query_batch.reset_mock()
+        evaluator.agent.query_batch.return_value = [{"answer": "B"}]
+        responses = evaluator._get_agent_responses(dataset, "regulation_search")
+
+        evaluator.agent.query_batch.assert_called_once_with(
+            ["b"], max_concurrency=evaluator.query_workers
+        )
+        assert [r["answer"] for r in responses] == ["A", "B"]
+
+    def test_degraded_and_stale_responses_are_re_queried(self, tmp_path):
+        """Test that node-level fallbacks and expired entries aren't reused."""
+        evaluator = FIAAgentEvaluator(Mock(), response_cache_dir=tmp_path)
+        dataset = Dataset.from_list([{"question": q} for q in ["a", "b"]])
+        evaluator.agent.query_batch.return_value = [
+            {"answer": "A"},
+            {
+                "answer": "Error processing your question: Pinecone unavailable",
+                "reasoning_steps": ["Error in reflection: Pinecone unavailable"],
+            },
+        ]
+        responses = evaluator._get_agent_responses(dataset, "regulation_search")
+
+        assert "error" in responses[1]
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        # Expired entries are re-queried like missing ones
+        evaluator = FIAAgentEvaluator(
+            evaluator.agent, response_cache_dir=tmp_path, response_ttl_seconds=-1
+        )
+        evaluator.agent.query_batch.reset_mock()
+        evaluator.agent.query_batch.return_value = [{"answer": "A"}, {"answer": "B"}]
+        evaluator._get_agent_responses(dataset, "regulation_search")
+
+        evaluator.agent.query_batch.assert_called_once_with(
+            ["a", "b"], max_concurrency=evaluator.query_workers
+        )
+
+    def test_repeated_questions_are_answered_once_per_run(self, evaluator):
+        """Test that a tool's repeated questions reuse one answer, per tool."""
+        evaluator.agent.query_batch.side_effect = lambda questions, **kwargs: [
+            {"answer": question.upper()} for question in questions
+        ]
+        search = Dataset.from_list([{"question": q} for q in ["a", "b", "a"]])
+
+        evaluator._get_agent_responses(search, "regulation_search")
+        evaluator._get_agent_responses(search, "regulation_search")
+        responses = evaluator._get_agent_responses(
+            Dataset.from_list([{"question": q} for q in ["b", "c"]]), "general_rag"
+        )
+
+        assert [
+            call.args[0] for call in evaluator.agent.query_batch.call_args_list
+        ] == [
+            ["a", "b"],
+            ["b", "c"],
+        ]
+        assert [r["answer"] for r in responses] == ["B", "C"]
+
+
+class TestCreateEvaluationDataset:
+    """Test cases for joining dataset rows with agent answers."""
+
+    def test_failed_responses_are_not_scored(self, evaluator):
+        """Test that rows whose agent query failed are left out of RAGAS."""
+        dataset = Dataset.from_list(
+            [
+                {"question": q, "ground_truth": "g", "contexts": ["c"]}
+                for q in ["q1", "q2", "q3"]
+            ]
+        )
+        responses = [
+            {"answer": "a1", "sources": []},
+            {"answer": "Error processing your question: boom", "error": "boom"},
+            {"answer": "a3", "sources": []},
+        ]
+
+        eval_dataset = evaluator._create_evaluation_dataset(dataset, responses)
+
+        assert eval_dataset["question"] == ["q1", "q3"]
+        assert eval_dataset["answer"] == ["a1", "a3"]
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeddings stub that records which texts reach the model."""
+
+    model = "test-embedding"
+    dimensions = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[0.1, 0.2] for _ in texts]
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return [0.1, 0.2]
+
+
+class TestEmbeddingCache:
+    """Test cases for the RAGAS embedding cache."""
+
+    def test_cached_texts_are_not_re_embedded(self, tmp_path):
+        """Test that a later evaluator only embeds texts it hasn't seen."""
+        agent = Mock()
+        agent.rag_pipeline.retriever.embeddings = CountingEmbeddings()
+
+        FIAAgentEvaluator(
+            agent, embedding_cache_dir=tmp_path
+        ).embeddings.embed_documents(["a", "b"])
+        evaluator = FIAAgentEvaluator(agent, embedding_cache_dir=tmp_path)
+        evaluator.embeddings.embed_documents(["a", "b", "c"])
+
+        assert agent.rag_pipeline.retriever.embeddings.calls == [["a", "b"], ["c"]]
+
+
+class TestComprehensiveReport:
+    """Test cases for the aggregated evaluation report."""
+
+    def test_report_averages_scored_tools(self, evaluator):
+        """Test that RAGAS results and cached frames are scored, errors skipped."""
+        ragas_result = Mock()
+        ragas_result.to_pandas.return_value = pd.DataFrame(
+            {"question": ["q", "q"], "faithfulness": [0.5, 1.0]}
+        )
+        results = {
+            "regulation_search": ragas_result,
+            "penalty_lookup": pd.DataFrame({"answer_relevancy": [0.25]}),
+            "general_rag": {"error": "API down"},
+        }
+
+        report = evaluator._generate_comprehensive_report(results)
+
+        assert report["tool_performance"] == {
+            "regulation_search": {"faithfulness": 0.75},
+            "penalty_lookup": {"answer_relevancy": 0.25},
+        }
+        assert report["summary"]["overall_score"] == 0.5
+        assert report["summary"]["total_tools_evaluated"] == 2
+        assert report["summary"]["total_metrics"] == 2
+
+
+class TestExportResults:
+    """Test cases for writing evaluation results to disk."""
+
+    def test_scores_are_exported_as_records(self, evaluator, tmp_path):
+        """Test that stored score frames are written as per-row records."""
+        evaluator.evaluation_results["penalty_lookup"] = {
+            "metrics": pd.DataFrame({"faithfulness": [0.5, float("nan")]}),
+            "dataset_size": 2,
+            "metrics_type": "search_focused",
+        }
+
+        path = evaluator.export_results(str(tmp_path / "results.json"))
+
+        with open(path) as f:
+            exported = json.load(f)
+        assert exported["penalty_lookup"]["metrics"][0] == {"faithfulness": 0.5}
+        assert exported["penalty_lookup"]["summary"] == {
+            "total_samples": 2,
+            "metrics_computed": ["faithfulness"],
+            "dataset_size": 2,
+            "metrics_type": "search_focused",
+        }
+        assert exported["_metadata"]["tools_evaluated"] == ["penalty_lookup"]
+
+    def test_compressed_export_is_gzipped_json(self, evaluator, tmp_path):
+        """Test that compressed exports are written next to the requested name."""
+        evaluator.evaluation_results["penalty_lookup"] = {
+            "metrics": pd.DataFrame({"faithfulness": [0.5]})
+        }
+
+        path = evaluator.export_results(
+            str(tmp_path / "results.json"), compress=True, indent=False
+        )
+
+        assert path == str(tmp_path / "results.json.gz")
+        with gzip.open(path, "rt") as f:
+            exported = json.load(f)
+        assert exported["penalty_lookup"]["metrics"] == [{"faithfulness": 0.5}]
@@ -4,6 +4,8 @@ Tests for intent classification functionality.
 
 from unittest.mock import Mock, patch
 
+from rag.intent_router import INTENT_EXEMPLARS, IntentRouter
+
 
 class TestIntentClassification:
     """Test cases for intent classification."""
@@ -118,3 +120,81 @@ class TestIntentClassification:
 
                 result = fia_agent._classify_intent("Test question")
                 assert result == intent
+
+
+class KeywordEmbeddings:
+    """Embeds exemplars as one-hot vectors of their intent."""
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.document_calls = 0
+
+    def _one_hot(self, intent):
+        vector = [0.0] * len(INTENT_EXEMPLARS)
+        vector[list(INTENT_EXEMPLARS).index(intent)] = 1.0
+        return vector
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        intent_of = {
+            text: intent
+            for intent, examples in INTENT_EXEMPLARS.items()
+            for text in examples
+        }
+        return [self._one_hot(intent_of[text]) for text in texts]
+
+    def embed_query(self, text):
+        return self.queries[text]
+
+
+class TestIntentRouter:
+    """Test cases for embedding-based intent routing."""
+
+    def test_router_picks_nearest_centroid(self, tmp_path):
+        """Test that confident questions are routed and ambiguous ones are not."""
+        penalty = [0.0] * len(INTENT_EXEMPLARS)
+        penalty[list(INTENT_EXEMPLARS).index("PENALTY")] = 1.0
+        # Halfway between COMPARISON and PENALTY
+        ambiguous = [0.7, 0.7] + [0.0] * (len(INTENT_EXEMPLARS) - 2)
+        embeddings = KeywordEmbeddings(
+            {"Track limits penalty?": penalty, "Hmm?": ambiguous}
+        )
+        router = IntentRouter(embeddings, min_similarity=0.9, cache_dir=tmp_path)
+
+        assert router.classify("Track limits penalty?") == "PENALTY"
+        assert router.classify("Hmm?") is None
+        assert router.classify_vector(penalty) == "PENALTY"
+
+        # A fresh router loads the persisted centroids instead of re-embedding
+        reloaded = IntentRouter(embeddings, cache_dir=tmp_path)
+        assert reloaded.classify("Track limits penalty?") == "PENALTY"
+        assert embeddings.document_calls == 1
+
+    def test_near_tie_is_left_to_the_llm(self, tmp_path):
+        """Test that a question almost equally close to two intents isn't routed."""
+        near_tie = [0.0] * len(INTENT_EXEMPLARS)
+        near_tie[list(INTENT_EXEMPLARS).index("PENALTY")] = 0.71
+        near_tie[list(INTENT_EXEMPLARS).index("SEARCH")] = 0.70
+        router = IntentRouter(
+            KeywordEmbeddings({}), min_similarity=0.3, cache_dir=tmp_path
+        )
+
+        assert router.classify_vector(near_tie) is None
+        router.min_margin = 0.0
+        assert router.classify_vector(near_tie) == "PENALTY"
+
+    def test_routed_question_skips_llm_calls(self, fia_agent, sample_agent_state):
+        """Test that a confidently routed intent needs no LLM or embedding call."""
+        fia_agent.intent_router = Mock()
+        fia_agent.intent_router.classify_vector.return_value = "PENALTY"
+        fia_agent.reasoner = Mock()
+        sample_agent_state["question_vector"] = [1.0, 0.0]
+
+        result_state = fia_agent._reason_node(sample_agent_state)
+
+        fia_agent.intent_router.embed.assert_not_called()
+        fia_agent.intent_router.classify_vector.assert_called_once_with([1.0, 0.0])
+        fia_agent.reasoner.invoke.assert_not_called()
+        fia_agent.llm.invoke.assert_not_called()
+        assert result_state["selected_tools"] == ["penalty_lookup"]
+        assert "Intent Classification: PENALTY" in result_state["reasoning_steps"]
@@ -2,8 +2,11 @@
 Tests for multi-tool orchestration functionality.
 """
 
+import threading
 from unittest.mock import Mock, patch
 
+from rag.agent import ReasonDecision
+
 
 class TestMultiToolOrchestration:
     """Test cases for multi-tool orchestration."""
@@ -40,7 +43,35 @@ class TestMultiToolOrchestration:
             assert "penalty_lookup" in tools
 
     def test_reason_node_multi_tool(self, fia_agent, sample_agent_state):
-        """Test reasoning node with multi-tool selection."""
+        """Test reasoning node with multi-tool selection from one LLM call."""
+        fia_agent.reasoner = Mock()
+        fia_agent.reasoner.invoke.return_value = ReasonDecision(
+            intent="MULTI_TOOL",
+            selected_tools=["regulation_search", "penalty_lookup", "unknown_tool"],
+            reasoning="Needs both the rules and the penalties",
+        )
+
+        result_state = fia_agent._reason_node(sample_agent_state)
+
+        fia_agent.reasoner.invoke.assert_called_once()
+        fia_agent.llm.invoke.assert_not_called()
+        assert "selected_tools" in result_state
+        assert result_state["selected_tools"] == [
+            "regulation_search",
+            "penalty_lookup",
+        ]
+        assert "MULTI_TOOL" in str(result_state["reasoning_steps"])
+        assert (
+            "Reasoning: Needs both the rules and the penalties"
+            in result_state["reasoning_steps"]
+        )
+
+    def test_reason_node_falls_back_to_separate_calls(
+        self, fia_agent, sample_agent_state
+    ):
+        """Test that a failed structured call falls back to classification."""
+        fia_agent.reasoner = Mock()
+        fia_agent.reasoner.invoke.side_effect = Exception("Invalid JSON")
         with (
             patch.object(fia_agent, "_classify_intent", return_value="MULTI_TOOL"),
             patch.object(
@@ -61,10 +92,11 @@ class TestMultiToolOrchestration:
 
     def test_reason_node_single_tool(self, fia_agent, sample_agent_state):
         """Test reasoning node with single tool selection."""
-        with (
-            patch.object(fia_agent, "_classify_intent", return_value="SEARCH"),
-            patch.object(fia_agent, "_select_tool", return_value="regulation_search"),
-        ):
+        fia_agent.reasoner = Mock()
+        fia_agent.reasoner.invoke.return_value = ReasonDecision(
+            intent="SEARCH", selected_tools=[], reasoning="Find the rule"
+        )
+        with patch.object(fia_agent, "_select_tool", return_value="regulation_search"):
 
             result_state = fia_agent._reason_node(sample_agent_state)
 
@@ -94,6 +126,30 @@ class TestMultiToolOrchestration:
             assert "regulation_search" in result_state["tools_used"]
             assert "penalty_lookup" in result_state["tools_used"]
 
+    def test_act_node_runs_multi_tools_concurrently(
+        self, fia_agent, sample_agent_state
+    ):
+        """Test that multi-tool questions run their tools at the same time."""
+        sample_agent_state["selected_tools"] = ["regulation_search", "penalty_lookup"]
+        # Each tool waits for the other, so sequential execution would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other(**kwargs):
+            barrier.wait()
+            return f"Result for {kwargs}"
+
+        with (
+            patch.object(fia_agent.tools[0], "_run", side_effect=wait_for_other),
+            patch.object(fia_agent.tools[1], "_run", side_effect=wait_for_other),
+        ):
+            result_state = fia_agent._act_node(sample_agent_state)
+
+        assert list(result_state["multi_tool_results"]) == [
+            "regulation_search",
+            "penalty_lookup",
+        ]
+        assert result_state["tools_used"] == ["regulation_search", "penalty_lookup"]
+
     def test_act_node_single_tool_execution(self, fia_agent, sample_agent_state):
         """Test action node with single tool."""
         sample_agent_state["selected_tools"] = ["regulation_search"]